@@ -0,0 +1,47 @@
+"""
+Async database access for the async request path.
+
+Mirrors app.database with an aiosqlite AsyncEngine, so handlers await SQLite
+instead of tying up a threadpool worker per request. The storage profile
+settings apply here too.
+"""
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import ASYNC_DATABASE_URL, STORAGE_PROFILE
+from app.database import create_engines
+from app.metrics import register_pool_metrics
+
+# Create engines
+async_engine, async_read_engine = create_engines(ASYNC_DATABASE_URL, STORAGE_PROFILE, create_async_engine)
+register_pool_metrics({"async_writer": async_engine.sync_engine, "async_reader": async_read_engine.sync_engine})
+
+# Create session factories. Objects stay loaded after commit so handlers can
+# return them without another round trip.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    """
+    Dependency function to get an async database session for queries only.
+    """
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+async def dispose_async_engines():
+    """
+    Close all pooled async connections.
+    """
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
@@ -0,0 +1,257 @@
+"""
+Async request handlers, enabled with ASYNC_DB=True.
+
+These handlers serve the same paths and contracts as the sync handlers in
+app.main, but await SQLite through an aiosqlite AsyncEngine. Model inference
+runs on a dedicated thread pool and Argon2 on the password hashing pool, so a
+single uvicorn worker can keep thousands of idle or slow connections open
+without running out of threadpool workers. The router is included ahead of the sync
+routes, so it takes precedence; endpoints it does not cover fall through to
+the sync handlers.
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.async_database import get_async_db, get_async_read_db, AsyncReadSessionLocal
+from app.auth import (
+    hash_password, verify_and_update_password, get_password_hasher, create_access_token, get_current_user_id
+)
+from app.config import ASYNC_EXECUTOR_WORKERS, SCORING_MODE, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from app.models import User, Business, Review
+from app.pagination import (
+    keyset_select, fetch_page_async, wants_ndjson, ndjson_response_async, NEXT_CURSOR_HEADER
+)
+from app.schemas import (
+    UserCreate, UserLogin, UserResponse, LoginResponse,
+    BusinessResponse, ReviewCreate, ReviewResponse, ReviewStatusResponse, ReviewSearchResult
+)
+from app.scoring_worker import get_scoring_pool
+from app.search import search_select, search_page
+from app.response_cache import get_response_cache, render_json, business_resource, BUSINESS_LIST
+from app.metrics import observe_stage
+from app.utils import analyze_review_sentiment, pending_sentiment_result, add_review
+
+# Kept out of the OpenAPI schema, where the sync handlers already describe these paths
+router = APIRouter(include_in_schema=False)
+
+_blocking_executor = ThreadPoolExecutor(max_workers=ASYNC_EXECUTOR_WORKERS, thread_name_prefix="async-blocking")
+
+
+async def run_blocking(func, *args):
+    """
+    Run a blocking function on the dedicated executor and await its result.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, func, *args)
+
+
+async def _get_or_404(db: AsyncSession, model, object_id: int, detail: str):
+    obj = await db.get(model, object_id)
+    if not obj:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=detail
+        )
+    return obj
+
+
+# User Registration
+@router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
+async def register_user_async(
+    user_data: UserCreate,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
+):
+    # Check if username exists
+    if await read_db.scalar(select(User.id).where(User.username == user_data.username)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already registered"
+        )
+
+    # Check if email exists
+    if await read_db.scalar(select(User.id).where(User.email == user_data.email)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
+
+    # Hand the reader connection back before the long hash, so logins cannot hold them all
+    await read_db.close()
+
+    # Create new user
+    hashed_pwd = await get_password_hasher().run_async(hash_password, user_data.password)
+    new_user = User(
+        username=user_data.username,
+        email=user_data.email,
+        hashed_password=hashed_pwd
+    )
+
+    db.add(new_user)
+    await db.commit()
+
+    return new_user
+
+
+# User Login
+@router.post("/login", response_model=LoginResponse)
+async def login_user_async(
+    credentials: UserLogin,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
+):
+    # Find user
+    user = await read_db.scalar(select(User).where(User.username == credentials.username))
+    # Hand the reader connection back before the long hash; closing detaches the
+    # user without expiring it, so its loaded fields stay readable
+    await read_db.close()
+
+    verified, new_hash = False, None
+    if user:
+        verified, new_hash = await get_password_hasher().run_async(
+            verify_and_update_password, credentials.password, user.hashed_password
+        )
+    if not verified:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid username or password"
+        )
+
+    # Rehash passwords hashed with outdated Argon2 parameters, unless changed meanwhile
+    if new_hash:
+        await db.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+        )
+        await db.commit()
+
+    access_token, expires_in = create_access_token(user.id)
+    return {
+        "message": "Login successful",
+        "user": user,
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": expires_in
+    }
+
+
+# Get all businesses, one page at a time or streamed as NDJSON
+@router.get("/businesses", response_model=List[BusinessResponse])
+async def list_all_businesses_async(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    stmt = keyset_select(Business, cursor)
+    if wants_ndjson(request):
+        return ndjson_response_async(stmt, BusinessResponse, AsyncReadSessionLocal)
+
+    # Pages are answered from the response cache until a business changes
+    cache = get_response_cache()
+    key = (BUSINESS_LIST, cursor, limit)
+    cached, version = cache.lookup(request, key, BUSINESS_LIST)
+    if cached:
+        return cached
+
+    businesses, next_cursor = await fetch_page_async(db, stmt, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return cache.store(request, key, BUSINESS_LIST, version, render_json(BusinessResponse, businesses), headers)
+
+
+# Get specific business
+@router.get("/businesses/{business_id}", response_model=BusinessResponse)
+async def get_business_async(business_id: int, request: Request, db: AsyncSession = Depends(get_async_read_db)):
+    # Unchanged businesses are answered from the response cache, or with a 304
+    cache = get_response_cache()
+    key = business_resource(business_id)
+    cached, version = cache.lookup(request, key, key)
+    if cached:
+        return cached
+
+    business = await _get_or_404(db, Business, business_id, "Business not found")
+    return cache.store(request, key, key, version, render_json(BusinessResponse, business))
+
+
+# Post a review
+@router.post("/businesses/{business_id}/reviews", response_model=ReviewResponse, status_code=status.HTTP_201_CREATED)
+async def create_review_async(
+    business_id: int,
+    review_data: ReviewCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_async_read_db)
+):
+    # The author is vouched for by the access token
+    with observe_stage("business_lookup"):
+        await _get_or_404(read_db, Business, business_id, "Business not found")
+
+    # Analyze sentiment using DS Service, or leave it to the scoring workers
+    if SCORING_MODE == "async":
+        sentiment_result = pending_sentiment_result()
+    else:
+        sentiment_result = await run_blocking(analyze_review_sentiment, review_data.content)
+
+    # Reuse the sync write path on the async session's connection
+    new_review = await db.run_sync(
+        lambda sync_db: add_review(business_id, user_id, review_data.content, sentiment_result, sync_db)
+    )
+    with observe_stage("commit"):
+        await db.commit()
+
+    if SCORING_MODE == "async":
+        get_scoring_pool().notify()
+
+    return new_review
+
+
+# Get reviews for a business, one page at a time or streamed as NDJSON
+@router.get("/businesses/{business_id}/reviews", response_model=List[ReviewResponse])
+async def get_business_reviews_async(
+    business_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    await _get_or_404(db, Business, business_id, "Business not found")
+
+    stmt = keyset_select(Review, cursor, Review.business_id == business_id)
+    if wants_ndjson(request):
+        return ndjson_response_async(stmt, ReviewResponse, AsyncReadSessionLocal)
+
+    reviews, next_cursor = await fetch_page_async(db, stmt, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reviews
+
+
+# Search review content (declared before /reviews/{review_id})
+@router.get("/reviews/search", response_model=List[ReviewSearchResult])
+async def search_reviews_async(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    business_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    stmt = search_select(q, business_id, cursor)
+    reviews, next_cursor = search_page((await db.execute(stmt.limit(limit + 1))).all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reviews
+
+
+# Get a review and its scoring status
+@router.get("/reviews/{review_id}", response_model=ReviewStatusResponse)
+async def get_review_async(review_id: int, db: AsyncSession = Depends(get_async_read_db)):
+    return await _get_or_404(db, Review, review_id, "Review not found")
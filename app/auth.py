@@ -1,7 +1,54 @@
+"""
+Password hashing and access tokens.
+
+Argon2 is deliberately slow, so register and login do not hash on the request
+thread. They submit the work to a PasswordHasherPool: a process pool (Argon2
+then runs outside the GIL of the web worker) behind a fixed number of slots.
+A request that finds every slot taken gets a 503 with Retry-After instead of
+queueing behind the burst, which keeps the request threads free for other
+endpoints. If a worker process dies (Argon2 allocates ARGON2_MEMORY_COST_KB per
+hash, so an OOM kill is a real possibility) the pool is replaced and the hash
+retried once.
+
+A successful login returns a signed access token (a JWT, HS256 with
+SECRET_KEY). Authenticated endpoints check the signature and expiry only, so
+they neither look the user up nor hash anything. Logging out revokes the
+token's id until it would have expired anyway; the revocation list is kept in
+process memory.
+"""
+
+import asyncio
+import base64
+import hashlib
+import heapq
+import hmac
+import json
+import multiprocessing
+import secrets
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+
+from fastapi import Depends, HTTPException, status
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from passlib.context import CryptContext
 
-# Argon2 password hashing context
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+from app.config import (
+    ARGON2_TIME_COST, ARGON2_MEMORY_COST_KB, ARGON2_PARALLELISM,
+    PASSWORD_HASH_WORKERS, PASSWORD_HASH_QUEUE_LIMIT, PASSWORD_HASH_RETRY_AFTER_SECONDS,
+    SECRET_KEY, ALGORITHM, ACCESS_TOKEN_EXPIRE_MINUTES
+)
+
+# Argon2 password hashing context; hashes made with other parameters need an update
+pwd_context = CryptContext(
+    schemes=["argon2"],
+    deprecated="auto",
+    argon2__rounds=ARGON2_TIME_COST,
+    argon2__memory_cost=ARGON2_MEMORY_COST_KB,
+    argon2__parallelism=ARGON2_PARALLELISM
+)
 
 
 def hash_password(password: str) -> str:
@@ -29,3 +76,290 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         True if password matches, False otherwise
     """
     return pwd_context.verify(plain_password, hashed_password)
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password and rehash it if its hash uses outdated Argon2 parameters.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Hashed password to compare against
+
+    Returns:
+        (True if password matches, new hash to store or None)
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+class PasswordHasherPool:
+    """
+    Bounded executor for password hashing.
+
+    Args:
+        workers: Worker processes; 0 hashes inline on the calling thread
+        queue_limit: Maximum hashes running or waiting at once
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS, queue_limit: int = PASSWORD_HASH_QUEUE_LIMIT):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._slots = threading.BoundedSemaphore(queue_limit)
+        self._executor_lock = threading.Lock()
+        self._executor = self._new_executor() if workers > 0 else None
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        # Spawned, not forked: the web worker already runs threads
+        return ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+        )
+
+    def _replace_executor(self, broken: ProcessPoolExecutor):
+        """
+        Start a new process pool in place of a broken one. Requests that saw the
+        same pool break at the same time replace it only once.
+        """
+        with self._executor_lock:
+            if self._executor is broken:
+                print("⚠ A password hashing process died; starting a new pool")
+                broken.shutdown(wait=False, cancel_futures=True)
+                self._executor = self._new_executor()
+
+    def _unavailable(self, detail: str) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=detail,
+            headers={"Retry-After": str(PASSWORD_HASH_RETRY_AFTER_SECONDS)}
+        )
+
+    def submit(self, func, *args) -> Future:
+        """
+        Start func(*args) if a slot is free, replacing the process pool first if
+        it is broken.
+
+        Raises:
+            HTTPException: 503 if queue_limit hashes are already running or waiting
+        """
+        if not self._slots.acquire(blocking=False):
+            raise self._unavailable("Too many sign-in requests, please retry shortly")
+        try:
+            executor = self._executor
+            if executor is not None:
+                try:
+                    future = executor.submit(func, *args)
+                except BrokenProcessPool:
+                    self._replace_executor(executor)
+                    future = self._executor.submit(func, *args)
+            else:
+                future = Future()
+                try:
+                    future.set_result(func(*args))
+                except Exception as e:
+                    future.set_exception(e)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def run(self, func, *args):
+        """
+        Run func(*args) on the pool and wait for the result. If a worker process
+        dies meanwhile, it is retried once on a new pool.
+
+        Raises:
+            HTTPException: 503 if the pool is full, or broke again on the retry
+        """
+        try:
+            return self.submit(func, *args).result()
+        except BrokenProcessPool:
+            pass
+        try:
+            return self.submit(func, *args).result()
+        except BrokenProcessPool:
+            raise self._unavailable("Password hashing is unavailable, please retry shortly")
+
+    async def run_async(self, func, *args):
+        """
+        Run func(*args) on the pool and await the result without blocking the
+        event loop. Retried like run().
+        """
+        try:
+            return await asyncio.wrap_future(self.submit(func, *args))
+        except BrokenProcessPool:
+            pass
+        try:
+            return await asyncio.wrap_future(self.submit(func, *args))
+        except BrokenProcessPool:
+            raise self._unavailable("Password hashing is unavailable, please retry shortly")
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance - created on first use
+_password_hasher = None
+_password_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasherPool:
+    """
+    Returns a singleton PasswordHasherPool.
+    """
+    global _password_hasher
+    if _password_hasher is None:
+        with _password_hasher_lock:
+            if _password_hasher is None:
+                _password_hasher = PasswordHasherPool()
+    return _password_hasher
+
+
+def shutdown_password_hasher():
+    """
+    Stop the worker processes of the pool, if it was started.
+    """
+    global _password_hasher
+    with _password_hasher_lock:
+        if _password_hasher is not None:
+            _password_hasher.shutdown()
+            _password_hasher = None
+
+
+# Signature digests of the supported token algorithms
+_TOKEN_DIGESTS = {"HS256": hashlib.sha256}
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(signing_input: str) -> str:
+    digest = hmac.new(SECRET_KEY.encode("utf-8"), signing_input.encode("ascii"), _TOKEN_DIGESTS[ALGORITHM])
+    return _b64encode(digest.digest())
+
+
+_TOKEN_HEADER = _b64encode(json.dumps({"alg": ALGORITHM, "typ": "JWT"}, separators=(",", ":")).encode("utf-8"))
+
+
+class RevokedTokens:
+    """
+    Ids of logged-out tokens, each kept only until the token expires.
+    """
+
+    def __init__(self):
+        self._expiries = {}
+        self._by_expiry = []
+        self._lock = threading.Lock()
+
+    def revoke(self, token_id: str, expires_at: float):
+        with self._lock:
+            self._purge(time.time())
+            if token_id not in self._expiries:
+                self._expiries[token_id] = expires_at
+                heapq.heappush(self._by_expiry, (expires_at, token_id))
+
+    def _purge(self, now: float):
+        # Expired tokens are rejected anyway, so their ids can be forgotten
+        while self._by_expiry and self._by_expiry[0][0] <= now:
+            _, token_id = heapq.heappop(self._by_expiry)
+            del self._expiries[token_id]
+
+    def __contains__(self, token_id: str) -> bool:
+        return token_id in self._expiries
+
+    def __len__(self):
+        return len(self._expiries)
+
+
+# Global instance - shared by every request in this process
+_revoked_tokens = RevokedTokens()
+
+
+def get_revoked_tokens() -> RevokedTokens:
+    return _revoked_tokens
+
+
+def create_access_token(user_id: int) -> Tuple[str, int]:
+    """
+    Issue a signed access token for a user.
+
+    Args:
+        user_id: ID of the authenticated user
+
+    Returns:
+        (token, seconds until it expires)
+    """
+    now = int(time.time())
+    expires_in = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+    claims = {"sub": str(user_id), "iat": now, "exp": now + expires_in, "jti": secrets.token_urlsafe(16)}
+    signing_input = f"{_TOKEN_HEADER}.{_b64encode(json.dumps(claims, separators=(',', ':')).encode('utf-8'))}"
+    return f"{signing_input}.{_sign(signing_input)}", expires_in
+
+
+def _credentials_error(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=detail,
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Check a token's signature, expiry and revocation, without touching the database.
+
+    Returns:
+        The token's claims
+
+    Raises:
+        HTTPException: 401 if the token is malformed, forged, expired or revoked
+    """
+    try:
+        header, payload, signature = token.split(".")
+        if not hmac.compare_digest(signature, _sign(f"{header}.{payload}")):
+            raise ValueError("bad signature")
+        if json.loads(_b64decode(header)).get("alg") != ALGORITHM:
+            raise ValueError("unexpected algorithm")
+        claims = json.loads(_b64decode(payload))
+        expires_at = float(claims["exp"])
+        int(claims["sub"])
+    except (ValueError, KeyError, TypeError, AttributeError, UnicodeError):
+        raise _credentials_error("Invalid access token")
+
+    if expires_at <= time.time():
+        raise _credentials_error("Access token expired")
+    if claims.get("jti") in get_revoked_tokens():
+        raise _credentials_error("Access token revoked")
+    return claims
+
+
+_bearer = HTTPBearer(auto_error=False)
+
+
+async def get_token_claims(credentials: Optional[HTTPAuthorizationCredentials] = Depends(_bearer)) -> dict:
+    """
+    Dependency: the claims of the request's bearer token.
+    """
+    if credentials is None:
+        raise _credentials_error("Not authenticated")
+    return decode_access_token(credentials.credentials)
+
+
+async def get_current_user_id(claims: dict = Depends(get_token_claims)) -> int:
+    """
+    Dependency: the ID of the user the request's bearer token was issued to.
+    """
+    return int(claims["sub"])
+
+
+def revoke_access_token(claims: dict):
+    """
+    Reject the token with these claims from now until it expires.
+    """
+    get_revoked_tokens().revoke(claims["jti"], float(claims["exp"]))
@@ -0,0 +1,168 @@
+"""
+Micro-batching scheduler for sentiment inference.
+
+Concurrent review requests each need one DistilBERT forward pass. Running them one
+by one leaves the CPU idle between calls, so this module collects requests for up to
+SENTIMENT_BATCH_SIZE items or SENTIMENT_BATCH_MAX_WAIT_MS milliseconds, runs them as
+one padded batch through the analyzer, and hands each caller its own result.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+from app.config import SENTIMENT_BATCH_SIZE, SENTIMENT_BATCH_MAX_WAIT_MS
+from app.metrics import CallbackGauge, Histogram, observe_stage
+from app.sentiment_analyzer import get_sentiment_analyzer
+
+BATCH_SIZE = Histogram(
+    "vibecheck_inference_batch_size",
+    "Texts per micro-batch run through the analyzer",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+
+
+class SentimentBatcher:
+    """
+    Collects concurrent sentiment requests and runs them through the analyzer in batches.
+
+    A single background thread owns the analyzer. Callers enqueue a text and block on a
+    Future until the batch containing it has been scored.
+    """
+
+    def __init__(self, analyzer=None, max_batch_size: int = SENTIMENT_BATCH_SIZE,
+                 max_wait_ms: float = SENTIMENT_BATCH_MAX_WAIT_MS):
+        """
+        Args:
+            analyzer: Object with an analyze_sentiment(list) method. Defaults to the
+                      shared SentimentAnalyzer, loaded by the worker thread.
+            max_batch_size: Maximum number of texts per batch
+            max_wait_ms: Maximum time to wait for a batch to fill up
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        self.analyzer = analyzer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches_run = 0
+        self.items_scored = 0
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="sentiment-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """
+        Queue a single text for scoring.
+
+        Returns:
+            Future resolving to a {'label', 'score'} dictionary
+        """
+        future = Future()
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SentimentBatcher is closed")
+            self._queue.append((text, future))
+            self._condition.notify()
+        return future
+
+    def analyze(self, text: str, timeout: float = None) -> dict:
+        """
+        Score a single text, blocking until its batch has run.
+        """
+        return self.submit(text).result(timeout)
+
+    def analyze_many(self, texts: list, timeout: float = None) -> list:
+        """
+        Score several texts. They share batches with any other callers in flight.
+        """
+        futures = [self.submit(text) for text in texts]
+        return [future.result(timeout) for future in futures]
+
+    def queue_depth(self) -> int:
+        """
+        Number of texts waiting for a batch.
+        """
+        return len(self._queue)
+
+    def close(self):
+        """
+        Stop the worker thread once the queued texts have been scored.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+
+    def _next_batch(self) -> list:
+        with self._condition:
+            while not self._queue and not self._closed:
+                self._condition.wait()
+            if not self._queue:
+                return []
+
+            # The first request opens the batch window
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.max_batch_size and not self._closed:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+
+            size = min(len(self._queue), self.max_batch_size)
+            return [self._queue.popleft() for _ in range(size)]
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+
+            texts = [text for text, _ in batch]
+            try:
+                if self.analyzer is None:
+                    self.analyzer = get_sentiment_analyzer()
+                with observe_stage("batch_inference"):
+                    results = self.analyzer.analyze_sentiment(texts)
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            self.batches_run += 1
+            self.items_scored += len(batch)
+            BATCH_SIZE.observe(len(batch))
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
+
+
+# Global instance - started on first use
+_sentiment_batcher = None
+_sentiment_batcher_lock = threading.Lock()
+
+
+def get_sentiment_batcher():
+    """
+    Returns a singleton instance of SentimentBatcher.
+    """
+    global _sentiment_batcher
+    if _sentiment_batcher is None:
+        with _sentiment_batcher_lock:
+            if _sentiment_batcher is None:
+                _sentiment_batcher = SentimentBatcher()
+    return _sentiment_batcher
+
+
+def _queue_depth_samples():
+    if _sentiment_batcher is not None:
+        yield (), _sentiment_batcher.queue_depth()
+
+
+CallbackGauge(
+    "vibecheck_inference_queue_depth",
+    "Texts waiting for the next micro-batch",
+    (),
+    _queue_depth_samples
+)
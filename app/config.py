@@ -5,14 +5,142 @@ from pathlib import Path
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Database settings
-DATABASE_URL = f"sqlite:///{BASE_DIR}/vibecheck.db"
+DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite:///{BASE_DIR}/vibecheck.db")
+
+# Request path: "False" serves requests with sync handlers and SessionLocal,
+# "True" with async handlers on an aiosqlite AsyncEngine
+ASYNC_DB = os.getenv("ASYNC_DB", "False") == "True"
+ASYNC_DATABASE_URL = DATABASE_URL.replace("sqlite://", "sqlite+aiosqlite://", 1)
+# Threads for blocking work (model inference) on the async path
+ASYNC_EXECUTOR_WORKERS = int(os.getenv("ASYNC_EXECUTOR_WORKERS", "32"))
+
+# Storage profile: "default" (one engine, SQLite defaults) or "tuned"
+# (WAL, pragmas, dedicated writer connection and pooled read-only engine)
+STORAGE_PROFILE = os.getenv("STORAGE_PROFILE", "default")
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+READ_POOL_SIZE = int(os.getenv("READ_POOL_SIZE", "8"))
 
 # Security settings
 SECRET_KEY = os.getenv("SECRET_KEY", "3702906fde4e9ab1932b6b59e9f00518")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Argon2 parameters for new hashes. Existing hashes made with other parameters
+# still verify and are rehashed on the user's next successful login.
+ARGON2_TIME_COST = int(os.getenv("ARGON2_TIME_COST", "3"))
+ARGON2_MEMORY_COST_KB = int(os.getenv("ARGON2_MEMORY_COST_KB", "65536"))
+ARGON2_PARALLELISM = int(os.getenv("ARGON2_PARALLELISM", "4"))
+# Password hashing runs on its own process pool so a burst of logins cannot tie up
+# the request threads; 0 workers hashes inline on the request thread instead.
+# Beyond the queue limit, register and login answer 503 until a slot frees up. Each
+# queued hash parks a request thread (anyio's threadpool has 40), so by default the limit
+# stays below READ_POOL_SIZE and 32, leaving threads and reader connections for other
+# endpoints however many CPUs the machine has.
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", str(os.cpu_count() or 2)))
+PASSWORD_HASH_QUEUE_LIMIT = int(os.getenv(
+    "PASSWORD_HASH_QUEUE_LIMIT", str(max(min(4 * max(PASSWORD_HASH_WORKERS, 1), READ_POOL_SIZE - 1, 32), 1))
+))
+PASSWORD_HASH_RETRY_AFTER_SECONDS = int(os.getenv("PASSWORD_HASH_RETRY_AFTER_SECONDS", "1"))
+
 # Application settings
 APP_NAME = "VibeCheck Business"
 APP_VERSION = "1.0.0"
 DEBUG = os.getenv("DEBUG", "True") == "True"
+
+# Review settings
+MIN_REVIEW_LENGTH = 10
+BULK_REVIEW_MAX_ITEMS = int(os.getenv("BULK_REVIEW_MAX_ITEMS", "5000"))
+
+# Keyword extraction: "frequency" (most frequent words) or "tfidf" (frequency weighted
+# by inverse document frequency across all stored reviews). The document frequencies
+# are only maintained in tfidf mode; after switching to it, fill them with:
+# python backfill_document_frequencies.py
+KEYWORD_MODE = os.getenv("KEYWORD_MODE", "frequency")
+# In-process cache of document frequencies. Writes by this process evict the words they
+# change when they commit; writes by other processes show up once an entry is older than the TTL.
+KEYWORD_DF_CACHE_SIZE = int(os.getenv("KEYWORD_DF_CACHE_SIZE", "100000"))
+KEYWORD_DF_CACHE_TTL_SECONDS = float(os.getenv("KEYWORD_DF_CACHE_TTL_SECONDS", "60"))
+# Top keywords endpoint
+DEFAULT_TOP_KEYWORDS = int(os.getenv("DEFAULT_TOP_KEYWORDS", "10"))
+MAX_TOP_KEYWORDS = int(os.getenv("MAX_TOP_KEYWORDS", "100"))
+# Trend endpoint: range used when none is given, and the longest range allowed
+DEFAULT_TREND_DAYS = int(os.getenv("DEFAULT_TREND_DAYS", "90"))
+MAX_TREND_DAYS = int(os.getenv("MAX_TREND_DAYS", "1096"))
+# Leaderboards rank by a Bayesian average: every business counts as having
+# LEADERBOARD_PRIOR_REVIEWS extra reviews scoring LEADERBOARD_PRIOR_MEAN, so a few
+# high scores cannot outrank a long record. After changing either, rebuild the
+# stored scores with: python check_vibe_aggregates.py --fix
+LEADERBOARD_PRIOR_MEAN = float(os.getenv("LEADERBOARD_PRIOR_MEAN", "50"))
+LEADERBOARD_PRIOR_REVIEWS = float(os.getenv("LEADERBOARD_PRIOR_REVIEWS", "10"))
+DEFAULT_LEADERBOARD_SIZE = int(os.getenv("DEFAULT_LEADERBOARD_SIZE", "10"))
+MAX_LEADERBOARD_SIZE = int(os.getenv("MAX_LEADERBOARD_SIZE", "100"))
+
+# Listing settings
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "1000"))
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+
+# Business read cache: rendered GET /businesses responses with strong ETags, answered
+# with 304 for a matching If-None-Match. Review writes in this process invalidate the
+# affected entries when they commit; writes by other processes (scripts, other web
+# workers) are picked up once an entry is older than the TTL.
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE_ENABLED", "True") == "True"
+RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "4096"))
+RESPONSE_CACHE_TTL_SECONDS = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "5"))
+
+# Sentiment inference settings
+SENTIMENT_MODEL = os.getenv("SENTIMENT_MODEL", "distilbert/distilbert-base-uncased-finetuned-sst-2-english")
+SENTIMENT_BATCHING = os.getenv("SENTIMENT_BATCHING", "True") == "True"
+SENTIMENT_BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", "16"))
+SENTIMENT_BATCH_MAX_WAIT_MS = float(os.getenv("SENTIMENT_BATCH_MAX_WAIT_MS", "10"))
+
+# Load the model and run a warmup inference in the background right after startup;
+# /readyz reports not ready until it is done. "False" loads it on the first review.
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "True") == "True"
+# A failed warmup is retried after MODEL_WARMUP_RETRY_SECONDS, doubling each time. After
+# MODEL_WARMUP_ATTEMPTS failures /healthz fails too, so the orchestrator restarts the worker.
+MODEL_WARMUP_ATTEMPTS = int(os.getenv("MODEL_WARMUP_ATTEMPTS", "5"))
+MODEL_WARMUP_RETRY_SECONDS = float(os.getenv("MODEL_WARMUP_RETRY_SECONDS", "5"))
+
+# Inference backend: "pytorch" (fp32 pipeline), "quantized" (dynamic int8 PyTorch),
+# "onnx" (ONNX Runtime export) or "stub"
+SENTIMENT_BACKEND = os.getenv("SENTIMENT_BACKEND", "pytorch")
+# Exported and quantized model artifacts, produced by download_model.py
+MODEL_ARTIFACT_DIR = Path(os.getenv("MODEL_ARTIFACT_DIR", str(BASE_DIR / "model_artifacts")))
+
+# Where inference runs: "local" loads the model in every web worker, "sidecar" sends
+# texts to the shared inference server (python inference_server.py) over a Unix socket,
+# falling back to local inference while the sidecar is unreachable
+INFERENCE_MODE = os.getenv("INFERENCE_MODE", "local")
+INFERENCE_SOCKET = os.getenv("INFERENCE_SOCKET", str(BASE_DIR / "inference.sock"))
+INFERENCE_TIMEOUT_SECONDS = float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "30"))
+# After a failed connection, use local inference for this long before retrying the sidecar
+INFERENCE_RETRY_SECONDS = float(os.getenv("INFERENCE_RETRY_SECONDS", "5"))
+
+# Test mode: replace the DistilBERT pipeline with a deterministic stub classifier
+# (same as SENTIMENT_BACKEND=stub)
+SENTIMENT_STUB = os.getenv("SENTIMENT_STUB", "False") == "True"
+SENTIMENT_STUB_LATENCY_MS = float(os.getenv("SENTIMENT_STUB_LATENCY_MS", "0"))
+SENTIMENT_STUB_PER_ITEM_MS = float(os.getenv("SENTIMENT_STUB_PER_ITEM_MS", "0"))
+
+# Sentiment result cache (in-process LRU in front of a persistent table)
+SENTIMENT_CACHE_ENABLED = os.getenv("SENTIMENT_CACHE_ENABLED", "True") == "True"
+SENTIMENT_CACHE_SIZE = int(os.getenv("SENTIMENT_CACHE_SIZE", "10000"))
+SENTIMENT_CACHE_PERSISTENT = os.getenv("SENTIMENT_CACHE_PERSISTENT", "True") == "True"
+
+# Review scoring mode: "sync" scores inside the request, "async" stores the review
+# as PENDING and leaves scoring to the background worker pool
+SCORING_MODE = os.getenv("SCORING_MODE", "sync")
+SCORING_WORKERS = int(os.getenv("SCORING_WORKERS", "2"))
+SCORING_BATCH_SIZE = int(os.getenv("SCORING_BATCH_SIZE", "32"))
+SCORING_POLL_INTERVAL_SECONDS = float(os.getenv("SCORING_POLL_INTERVAL_SECONDS", "1.0"))
+# Claims older than this are assumed to belong to a crashed worker and are retried
+SCORING_LEASE_SECONDS = int(os.getenv("SCORING_LEASE_SECONDS", "120"))
+# A review still unscored after this many claims is marked FAILED and leaves the queue
+SCORING_MAX_ATTEMPTS = int(os.getenv("SCORING_MAX_ATTEMPTS", "5"))
+
+# Prometheus-format metrics at GET /metrics: per-route request latency, per-stage
+# latency of the review path, inference batch sizes, queue depth and cache hit rates
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True") == "True"
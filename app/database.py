@@ -1,13 +1,74 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
-from app.config import DATABASE_URL
+from app.config import (
+    DATABASE_URL, STORAGE_PROFILE, SQLITE_MMAP_SIZE, SQLITE_CACHE_SIZE_KB,
+    SQLITE_BUSY_TIMEOUT_MS, READ_POOL_SIZE
+)
+from app.metrics import register_pool_metrics
 from app.models import Base, Business
 
-# Create engine
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
 
-# Create session factory
+def _apply_tuned_pragmas(dbapi_connection, connection_record):
+    """
+    Connection-time pragmas for the tuned storage profile.
+    WAL lets readers run alongside the writer instead of blocking on it.
+    """
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB}")
+    cursor.execute(f"PRAGMA busy_timeout={SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.close()
+
+
+def _apply_read_only_pragmas(dbapi_connection, connection_record):
+    _apply_tuned_pragmas(dbapi_connection, connection_record)
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+
+def create_engines(database_url: str = DATABASE_URL, profile: str = STORAGE_PROFILE, engine_factory=create_engine):
+    """
+    Create the writer and reader engines for a storage profile.
+    
+    Args:
+        database_url: SQLAlchemy database URL
+        profile: "default" for a single engine with SQLite defaults, or "tuned"
+                 for WAL and pragmas, one dedicated writer connection that
+                 serializes writes, and a pooled read-only engine
+        engine_factory: create_engine, or create_async_engine for the async path
+        
+    Returns:
+        Tuple of (writer engine, reader engine). They are the same engine in
+        the default profile.
+    """
+    connect_args = {"check_same_thread": False}
+    
+    if profile == "default":
+        engine = engine_factory(database_url, connect_args=connect_args)
+        return engine, engine
+    
+    if profile != "tuned":
+        raise ValueError(f"Unknown storage profile: {profile}")
+    
+    connect_args["timeout"] = SQLITE_BUSY_TIMEOUT_MS / 1000
+    writer = engine_factory(database_url, connect_args=connect_args, pool_size=1, max_overflow=0)
+    reader = engine_factory(database_url, connect_args=connect_args, pool_size=READ_POOL_SIZE, max_overflow=0)
+    # Async engines fire pool events on their underlying sync engine
+    event.listen(getattr(writer, "sync_engine", writer), "connect", _apply_tuned_pragmas)
+    event.listen(getattr(reader, "sync_engine", reader), "connect", _apply_read_only_pragmas)
+    return writer, reader
+
+
+# Create engines
+engine, read_engine = create_engines()
+register_pool_metrics({"writer": engine, "reader": read_engine})
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
 
 
 def get_db():
@@ -21,6 +82,18 @@ def get_db():
         db.close()
 
 
+def get_read_db():
+    """
+    Dependency function to get a database session for queries only.
+    In the tuned storage profile it never waits on the writer connection.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db():
     """
     Initialize database by creating all tables and populating with sample businesses if empty.
@@ -0,0 +1,187 @@
+"""
+Inference Backends for the Sentiment Analyzer
+
+Each backend is a callable with the same interface as a Hugging Face
+text-classification pipeline: it takes a string or a list of strings (plus
+optional batch_size and truncation arguments) and returns one
+{'label', 'score'} dictionary per text. SentimentAnalyzer picks one through
+SENTIMENT_BACKEND in app/config.py.
+
+Heavy libraries (transformers, torch, onnxruntime) are imported only when a
+backend that needs them is created.
+"""
+
+import time
+from pathlib import Path
+
+from app.config import MODEL_ARTIFACT_DIR, SENTIMENT_MODEL, SENTIMENT_STUB_LATENCY_MS, SENTIMENT_STUB_PER_ITEM_MS
+
+BACKENDS = ("pytorch", "quantized", "onnx", "stub")
+
+
+def quantized_artifact_dir(artifact_dir: Path = MODEL_ARTIFACT_DIR) -> Path:
+    return Path(artifact_dir) / "quantized"
+
+
+def onnx_artifact_dir(artifact_dir: Path = MODEL_ARTIFACT_DIR) -> Path:
+    return Path(artifact_dir) / "onnx"
+
+
+class StubClassifier:
+    """
+    A deterministic stand-in for the Hugging Face pipeline, used in test mode.
+
+    Labels are derived from a small list of positive and negative words so the same
+    text always gets the same result. An optional simulated latency (a fixed cost per
+    call plus a cost per item) makes it possible to measure batching gains without
+    loading the real model.
+    """
+
+    POSITIVE_WORDS = {"great", "good", "love", "amazing", "excellent", "friendly", "best", "fantastic"}
+    NEGATIVE_WORDS = {"bad", "terrible", "awful", "rude", "worst", "slow", "disappointed", "dirty"}
+
+    def __init__(self, latency_ms: float = 0.0, per_item_ms: float = 0.0):
+        self.latency_ms = latency_ms
+        self.per_item_ms = per_item_ms
+
+    def _classify(self, text):
+        words = text.lower().split()
+        positive = sum(1 for word in words if word.strip(".,!?") in self.POSITIVE_WORDS)
+        negative = sum(1 for word in words if word.strip(".,!?") in self.NEGATIVE_WORDS)
+        label = "NEGATIVE" if negative > positive else "POSITIVE"
+        # Spread scores over 0.5-1.0 deterministically from the text length
+        score = 0.5 + (len(text) % 50) / 100
+        return {"label": label, "score": score}
+
+    def __call__(self, texts, **kwargs):
+        batch = [texts] if isinstance(texts, str) else texts
+        delay_ms = self.latency_ms + self.per_item_ms * len(batch)
+        if delay_ms > 0:
+            time.sleep(delay_ms / 1000)
+        return [self._classify(text) for text in batch]
+
+
+class PyTorchBackend:
+    """
+    The fp32 PyTorch text-classification pipeline.
+    """
+
+    def __init__(self, model_name: str = SENTIMENT_MODEL):
+        from transformers import pipeline
+
+        # This will automatically download the configured model for sentiment analysis
+        # (distilbert-base-uncased-finetuned-sst-2-english by default) if not already present.
+        self.pipeline = pipeline("sentiment-analysis", model=model_name)
+
+    def __call__(self, texts, **kwargs):
+        return self.pipeline(texts, **kwargs)
+
+
+class QuantizedPyTorchBackend:
+    """
+    The same pipeline with its Linear layers dynamically quantized to int8.
+
+    Loads the artifact saved by `download_model.py --backend quantized` when present,
+    otherwise quantizes the fp32 model at startup.
+    """
+
+    def __init__(self, model_name: str = SENTIMENT_MODEL, artifact_dir: Path = None):
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+        artifact_dir = Path(artifact_dir or quantized_artifact_dir())
+        model_path = artifact_dir / "model.pt"
+        if model_path.exists():
+            model = torch.load(model_path, weights_only=False)
+            tokenizer = AutoTokenizer.from_pretrained(artifact_dir)
+        else:
+            print(f"No quantized artifact at {model_path}, quantizing {model_name} now...")
+            model = quantize_model(AutoModelForSequenceClassification.from_pretrained(model_name))
+            tokenizer = AutoTokenizer.from_pretrained(model_name)
+
+        self.pipeline = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer)
+
+    def __call__(self, texts, **kwargs):
+        return self.pipeline(texts, **kwargs)
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime session over the model exported by `download_model.py --backend onnx`.
+    Requires the optional onnxruntime package.
+    """
+
+    def __init__(self, artifact_dir: Path = None):
+        try:
+            import onnxruntime as ort
+        except ImportError:
+            raise RuntimeError("The onnx backend needs onnxruntime: pip install onnxruntime")
+        from transformers import AutoConfig, AutoTokenizer
+
+        artifact_dir = Path(artifact_dir or onnx_artifact_dir())
+        model_path = artifact_dir / "model.onnx"
+        if not model_path.exists():
+            raise RuntimeError(f"No ONNX model at {model_path}. Run: python download_model.py --backend onnx")
+
+        self.tokenizer = AutoTokenizer.from_pretrained(artifact_dir)
+        self.labels = AutoConfig.from_pretrained(artifact_dir).id2label
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(str(model_path), options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def __call__(self, texts, batch_size: int = None, truncation: bool = True, **kwargs):
+        import numpy as np
+
+        batch = [texts] if isinstance(texts, str) else list(texts)
+        batch_size = batch_size or len(batch)
+        results = []
+
+        for start in range(0, len(batch), batch_size):
+            # Pad each batch only to its own longest text
+            encoded = self.tokenizer(
+                batch[start:start + batch_size], padding=True, truncation=truncation, return_tensors="np"
+            )
+            inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+            logits = self.session.run(["logits"], inputs)[0]
+
+            # Softmax, shifted for numerical stability
+            exp = np.exp(logits - logits.max(axis=1, keepdims=True))
+            probabilities = exp / exp.sum(axis=1, keepdims=True)
+            for row in probabilities:
+                index = int(row.argmax())
+                results.append({"label": self.labels[index], "score": float(row[index])})
+
+        return results
+
+
+def quantize_model(model):
+    """
+    Dynamically quantize the Linear layers of a PyTorch model to int8.
+    """
+    import torch
+
+    model.eval()
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def create_backend(name: str):
+    """
+    Create an inference backend by name.
+
+    Args:
+        name: One of BACKENDS
+
+    Returns:
+        A pipeline-compatible callable
+    """
+    if name == "pytorch":
+        return PyTorchBackend()
+    if name == "quantized":
+        return QuantizedPyTorchBackend()
+    if name == "onnx":
+        return OnnxBackend()
+    if name == "stub":
+        return StubClassifier(SENTIMENT_STUB_LATENCY_MS, SENTIMENT_STUB_PER_ITEM_MS)
+    raise ValueError(f"Unknown sentiment backend: {name}. Expected one of {', '.join(BACKENDS)}")
@@ -0,0 +1,311 @@
+"""
+Shared inference sidecar.
+
+Every uvicorn worker that runs inference in-process loads its own copy of the
+model and batches only its own requests. In sidecar mode a single inference
+server (started with `python inference_server.py`) owns the model and a
+SentimentBatcher, and the web workers send it texts over a Unix domain socket,
+so requests from all workers share one model and one batch queue.
+
+Wire protocol. Every message is a frame:
+
+    header  !BI   message type, body length in bytes
+    body          depends on the type
+
+    SCORE     client -> server   !I count, then per text: !I length, UTF-8 bytes
+    RESULTS   server -> client   !I count, then per result: !B length, label bytes, !d score
+    MODEL_ID  both directions    empty request; the reply body is the UTF-8 model id
+    ERROR     server -> client   UTF-8 error message
+
+A connection carries one request at a time. Clients keep a small pool of
+connections and check the server's model id before first use, so results
+produced by a differently configured model never reach the sentiment cache.
+"""
+
+import os
+import queue
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import List, Optional
+
+from app.config import INFERENCE_SOCKET, INFERENCE_TIMEOUT_SECONDS, INFERENCE_RETRY_SECONDS
+from app.sentiment_analyzer import get_model_id
+
+MSG_SCORE = 1
+MSG_RESULTS = 2
+MSG_MODEL_ID = 3
+MSG_ERROR = 4
+
+_HEADER = struct.Struct("!BI")
+_COUNT = struct.Struct("!I")
+_TEXT_LENGTH = struct.Struct("!I")
+_LABEL_LENGTH = struct.Struct("!B")
+_SCORE = struct.Struct("!d")
+
+# Guards against reading a corrupt length prefix as a huge allocation
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+class SidecarUnavailable(Exception):
+    """
+    The inference sidecar could not be reached or is serving a different model.
+    """
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    buffer = bytearray()
+    while len(buffer) < size:
+        chunk = sock.recv(size - len(buffer))
+        if not chunk:
+            raise ConnectionError("Inference sidecar connection closed")
+        buffer += chunk
+    return bytes(buffer)
+
+
+def send_frame(sock: socket.socket, message_type: int, body: bytes = b""):
+    sock.sendall(_HEADER.pack(message_type, len(body)) + body)
+
+
+def recv_frame(sock: socket.socket):
+    """
+    Read one frame.
+
+    Returns:
+        (message type, body)
+    """
+    message_type, length = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+    if length > MAX_FRAME_BYTES:
+        raise ConnectionError(f"Inference frame of {length} bytes exceeds the limit")
+    return message_type, _recv_exactly(sock, length)
+
+
+def encode_texts(texts: List[str]) -> bytes:
+    parts = [_COUNT.pack(len(texts))]
+    for text in texts:
+        data = text.encode("utf-8")
+        parts.append(_TEXT_LENGTH.pack(len(data)))
+        parts.append(data)
+    return b"".join(parts)
+
+
+def decode_texts(body: bytes) -> List[str]:
+    (count,) = _COUNT.unpack_from(body, 0)
+    offset = _COUNT.size
+    texts = []
+    for _ in range(count):
+        (length,) = _TEXT_LENGTH.unpack_from(body, offset)
+        offset += _TEXT_LENGTH.size
+        texts.append(body[offset:offset + length].decode("utf-8"))
+        offset += length
+    return texts
+
+
+def encode_results(results: List[dict]) -> bytes:
+    parts = [_COUNT.pack(len(results))]
+    for result in results:
+        label = result["label"].encode("utf-8")
+        parts.append(_LABEL_LENGTH.pack(len(label)))
+        parts.append(label)
+        parts.append(_SCORE.pack(float(result["score"])))
+    return b"".join(parts)
+
+
+def decode_results(body: bytes) -> List[dict]:
+    (count,) = _COUNT.unpack_from(body, 0)
+    offset = _COUNT.size
+    results = []
+    for _ in range(count):
+        (length,) = _LABEL_LENGTH.unpack_from(body, offset)
+        offset += _LABEL_LENGTH.size
+        label = body[offset:offset + length].decode("utf-8")
+        offset += length
+        (score,) = _SCORE.unpack_from(body, offset)
+        offset += _SCORE.size
+        results.append({"label": label, "score": score})
+    return results
+
+
+class _SidecarRequestHandler(socketserver.BaseRequestHandler):
+    """
+    Serves one client connection until it closes.
+    """
+
+    def handle(self):
+        server = self.server
+        while True:
+            try:
+                message_type, body = recv_frame(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            if message_type == MSG_MODEL_ID:
+                send_frame(self.request, MSG_MODEL_ID, server.model_id.encode("utf-8"))
+                continue
+            if message_type != MSG_SCORE:
+                send_frame(self.request, MSG_ERROR, f"Unknown message type {message_type}".encode("utf-8"))
+                return
+
+            try:
+                # Submit everything first so the texts join batches with other clients
+                futures = [server.batcher.submit(text) for text in decode_texts(body)]
+                results = [future.result() for future in futures]
+                send_frame(self.request, MSG_RESULTS, encode_results(results))
+            except (ConnectionError, OSError):
+                return
+            except Exception as e:
+                send_frame(self.request, MSG_ERROR, str(e).encode("utf-8"))
+
+
+class InferenceServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server that scores texts for all web workers through one batcher.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, batcher, model_id: str):
+        """
+        Args:
+            socket_path: Filesystem path of the Unix socket
+            batcher: SentimentBatcher shared by all connections
+            model_id: Identifier reported to clients, see get_model_id
+        """
+        self.batcher = batcher
+        self.model_id = model_id
+        # A socket file left behind by a crashed server would block the bind
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        super().__init__(socket_path, _SidecarRequestHandler)
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+
+
+class SidecarClient:
+    """
+    Thread-safe client for the inference sidecar with a pool of connections.
+    """
+
+    def __init__(self, socket_path: str = INFERENCE_SOCKET, model_id: str = None,
+                 timeout: float = INFERENCE_TIMEOUT_SECONDS, retry_seconds: float = INFERENCE_RETRY_SECONDS):
+        """
+        Args:
+            socket_path: Filesystem path of the sidecar's Unix socket
+            model_id: Model id the sidecar must report, defaults to get_model_id()
+            timeout: Socket timeout for one request
+            retry_seconds: How long to stay in fallback after the sidecar fails
+        """
+        self.socket_path = socket_path
+        self.model_id = model_id or get_model_id()
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self.requests = 0
+        self.fallbacks = 0
+        self._connections = queue.LifoQueue()
+        self._down_until = 0.0
+
+    def analyze_many(self, texts: List[str]) -> Optional[List[dict]]:
+        """
+        Score texts on the sidecar.
+
+        Returns:
+            One {'label', 'score'} dictionary per text, or None if the sidecar is
+            unavailable and the caller should fall back to local inference
+
+        Raises:
+            RuntimeError: If the sidecar reached the model but scoring failed
+        """
+        if time.monotonic() < self._down_until:
+            self.fallbacks += 1
+            return None
+
+        try:
+            message_type, body = self._request(MSG_SCORE, encode_texts(texts))
+        except (SidecarUnavailable, ConnectionError, OSError) as e:
+            self._down_until = time.monotonic() + self.retry_seconds
+            self.fallbacks += 1
+            print(f"Inference sidecar unavailable ({str(e)}), using local inference "
+                  f"for {self.retry_seconds:g}s")
+            return None
+
+        self.requests += 1
+        if message_type == MSG_ERROR:
+            raise RuntimeError(f"Inference sidecar error: {body.decode('utf-8')}")
+        return decode_results(body)
+
+    def close(self):
+        """
+        Close the pooled connections.
+        """
+        while True:
+            try:
+                self._connections.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def _request(self, message_type: int, body: bytes):
+        # A pooled connection may have been closed by a sidecar restart, so retry
+        # once on a fresh connection before giving up
+        while True:
+            try:
+                sock, reused = self._connections.get_nowait(), True
+            except queue.Empty:
+                sock, reused = self._connect(), False
+            try:
+                send_frame(sock, message_type, body)
+                response = recv_frame(sock)
+            except TimeoutError:
+                # The sidecar is alive but slow, sending the texts again would not help
+                sock.close()
+                raise
+            except (ConnectionError, OSError):
+                sock.close()
+                if reused:
+                    continue
+                raise
+            except BaseException:
+                sock.close()
+                raise
+            self._connections.put(sock)
+            return response
+
+    def _connect(self) -> socket.socket:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+            send_frame(sock, MSG_MODEL_ID)
+            _, body = recv_frame(sock)
+        except BaseException:
+            sock.close()
+            raise
+
+        served_model_id = body.decode("utf-8")
+        if served_model_id != self.model_id:
+            sock.close()
+            raise SidecarUnavailable(
+                f"sidecar serves model '{served_model_id}', this worker expects '{self.model_id}'"
+            )
+        return sock
+
+
+# Global instance - created on first use
+_sidecar_client = None
+_sidecar_client_lock = threading.Lock()
+
+
+def get_sidecar_client():
+    """
+    Returns a singleton SidecarClient for the configured socket.
+    """
+    global _sidecar_client
+    if _sidecar_client is None:
+        with _sidecar_client_lock:
+            if _sidecar_client is None:
+                _sidecar_client = SidecarClient()
+    return _sidecar_client
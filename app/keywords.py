@@ -0,0 +1,303 @@
+"""
+Keyword extraction engine.
+
+Keywords are the most frequent non-stop-words of a review (longer than three
+characters), joined with ", ". The stop-word set and the regex are built once
+at import, and the top-k words of a long review are picked with a heap instead
+of sorting every word. extract_keywords_batch handles a list of reviews in one
+call and extracts repeated texts only once.
+
+The optional "tfidf" mode weights each word's count by its inverse document
+frequency over all stored reviews. Words that appear in most reviews (e.g.
+"service", "place") then drop behind words that are distinctive for the
+review. Document frequencies live in the keyword_document_frequencies table;
+review inserts and deletes apply their changes to it with one upsert in the
+same transaction, like the business keyword counts, and extraction reads them
+through a bounded in-process cache. The default "frequency" mode keeps the
+original output and does not touch the table.
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List
+
+from sqlalchemy import delete, event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.config import KEYWORD_MODE, KEYWORD_DF_CACHE_SIZE, KEYWORD_DF_CACHE_TTL_SECONDS
+from app.database import read_engine
+from app.models import KeywordDocumentFrequency, DOCUMENT_TOTAL
+
+KEYWORD_MODES = ("frequency", "tfidf")
+
+NO_KEYWORDS = "general feedback"
+# Stored instead of keywords when sentiment analysis failed
+ANALYSIS_ERROR_KEYWORDS = "error in analysis"
+
+# Common words to ignore (stop words)
+STOP_WORDS = frozenset({
+    'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your',
+    'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she',
+    'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their',
+    'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that',
+    'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+    'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an',
+    'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of',
+    'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through',
+    'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down',
+    'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then',
+    'once', 'very', 'can', 'will', 'just', 'should', 'now'
+})
+
+_SPECIAL_CHARACTERS = re.compile(r'[^\w\s]')
+
+# Below this many distinct words a stable sort beats heapq.nlargest
+_HEAP_MIN_WORDS = 512
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase a review, strip special characters and drop stop words and
+    words of three characters or fewer.
+    """
+    text = _SPECIAL_CHARACTERS.sub('', text.lower())
+    return [word for word in text.split() if len(word) > 3 and word not in STOP_WORDS]
+
+
+def top_k(scores: dict, k: int, key) -> List[str]:
+    """
+    The k highest scoring words. Ties keep first-seen order, like the original
+    stable sort, whether a heap or a sort is used.
+    """
+    if len(scores) >= _HEAP_MIN_WORDS:
+        return heapq.nlargest(k, scores, key=key)
+    return sorted(scores, key=key, reverse=True)[:k]
+
+
+def _format(words: Iterable[str]) -> str:
+    return ", ".join(words) or NO_KEYWORDS
+
+
+def split_keywords(keywords: str) -> List[str]:
+    """
+    Split a stored Review.keywords string back into keywords. Placeholders and
+    pending reviews yield no keywords.
+    """
+    if not keywords or keywords in (NO_KEYWORDS, ANALYSIS_ERROR_KEYWORDS):
+        return []
+    return keywords.split(", ")
+
+
+# Words per IN (...) query, below SQLite's bound parameter limit
+_QUERY_CHUNK = 500
+
+
+class DocumentFrequencies:
+    """
+    Size-bounded LRU of stored document frequencies, read through from the database.
+    """
+
+    def __init__(self, max_entries: int = KEYWORD_DF_CACHE_SIZE, ttl_seconds: float = KEYWORD_DF_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, words: Iterable[str]) -> Dict[str, int]:
+        """
+        Document frequencies of words, plus the number of documents under DOCUMENT_TOTAL.
+        Words that are not cached are read in one query per chunk.
+        """
+        words = set(words)
+        words.add(DOCUMENT_TOTAL)
+        now = time.monotonic()
+        found = {}
+        with self._lock:
+            for word in words:
+                entry = self._entries.get(word)
+                if entry and entry[1] > now:
+                    self._entries.move_to_end(word)
+                    found[word] = entry[0]
+
+        missing = list(words.difference(found))
+        if missing:
+            loaded = dict.fromkeys(missing, 0)
+            with read_engine.connect() as conn:
+                for offset in range(0, len(missing), _QUERY_CHUNK):
+                    loaded.update(conn.execute(
+                        select(KeywordDocumentFrequency.word, KeywordDocumentFrequency.docs)
+                        .where(KeywordDocumentFrequency.word.in_(missing[offset:offset + _QUERY_CHUNK]))
+                    ).all())
+            found.update(loaded)
+            expires_at = now + self.ttl_seconds
+            with self._lock:
+                for word, docs in loaded.items():
+                    self._entries[word] = (docs, expires_at)
+                    self._entries.move_to_end(word)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return found
+
+    def invalidate(self, words: Iterable[str]):
+        """
+        Drop cached words, so their next lookup reads the database.
+        """
+        with self._lock:
+            for word in words:
+                self._entries.pop(word, None)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# Global instance - shared by every caller in this process
+_document_frequencies = DocumentFrequencies()
+
+
+def get_document_frequencies() -> DocumentFrequencies:
+    return _document_frequencies
+
+
+def idf(documents: int, docs: int) -> float:
+    """
+    Smoothed inverse document frequency; never zero, so frequent words still rank.
+    """
+    return math.log((1 + documents) / (1 + docs)) + 1
+
+
+# Session.info key collecting the words whose document frequency the current transaction changes
+_CHANGED_WORDS = "changed_document_frequency_words"
+
+
+def add_document_frequency_deltas(deltas: Counter, text: str, sign: int = 1):
+    """
+    Count one review text towards a pending document frequency update.
+    Does nothing outside tfidf mode, where the frequencies are not used.
+
+    Args:
+        deltas: Counter of word -> change, updated in place
+        text: The review content
+        sign: 1 when the review is added, -1 when it is deleted (or the number
+              of identical reviews added, for bulk loads)
+    """
+    if KEYWORD_MODE != "tfidf":
+        return
+    deltas[DOCUMENT_TOTAL] += sign
+    for word in set(tokenize(text)):
+        deltas[word] += sign
+
+
+def update_document_frequencies(deltas: Counter, db: Session):
+    """
+    Apply document frequency changes with one upsert, without committing.
+    Words no review contains any more are removed, and this process's cache
+    drops the changed words when the transaction commits.
+
+    Args:
+        deltas: Counter of word -> change
+        db: Database session (or connection, for bulk loads)
+    """
+    rows = [{"word": word, "docs": delta} for word, delta in deltas.items() if delta]
+    if not rows:
+        return
+
+    stmt = sqlite_insert(KeywordDocumentFrequency)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["word"],
+            set_={"docs": KeywordDocumentFrequency.docs + stmt.excluded["docs"]}
+        ),
+        rows
+    )
+
+    shrunk = [row["word"] for row in rows if row["docs"] < 0]
+    for offset in range(0, len(shrunk), _QUERY_CHUNK):
+        db.execute(
+            delete(KeywordDocumentFrequency)
+            .where(KeywordDocumentFrequency.word.in_(shrunk[offset:offset + _QUERY_CHUNK]),
+                   KeywordDocumentFrequency.docs <= 0)
+            .execution_options(synchronize_session=False)
+        )
+    db.info.setdefault(_CHANGED_WORDS, set()).update(row["word"] for row in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_words(session):
+    words = session.info.pop(_CHANGED_WORDS, None)
+    if words:
+        get_document_frequencies().invalidate(words)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_words(session):
+    session.info.pop(_CHANGED_WORDS, None)
+
+
+def _top_frequent(tokens: List[str], max_keywords: int) -> List[str]:
+    counts = Counter(tokens)
+    return top_k(counts, max_keywords, counts.__getitem__)
+
+
+def _top_tfidf(tokens: List[str], max_keywords: int, documents: int, docs: Dict[str, int]) -> List[str]:
+    counts = Counter(tokens)
+    return top_k(counts, max_keywords, lambda word: counts[word] * idf(documents, docs[word]))
+
+
+def extract_keywords(text: str, max_keywords: int = 5, mode: str = KEYWORD_MODE) -> str:
+    """
+    Extract the keywords of one review.
+
+    Args:
+        text: The review text
+        max_keywords: Maximum number of keywords to extract
+        mode: "frequency" or "tfidf"
+
+    Returns:
+        Comma-separated string of keywords
+    """
+    return extract_keywords_batch([text], max_keywords, mode)[0]
+
+
+def extract_keywords_batch(texts: List[str], max_keywords: int = 5, mode: str = KEYWORD_MODE,
+                           stored: bool = False) -> List[str]:
+    """
+    Extract the keywords of many reviews.
+
+    Args:
+        texts: The review texts
+        max_keywords: Maximum number of keywords per review
+        mode: "frequency" or "tfidf". In tfidf mode the texts are scored
+              against the stored document frequencies.
+        stored: Whether the texts belong to reviews that are already stored,
+                and so counted in the document frequencies (pending reviews).
+                Otherwise they are counted for this call only, so a review
+                gets the same keywords whether it is scored before or after
+                it is stored.
+
+    Returns:
+        One comma-separated string of keywords per review, in order
+    """
+    if mode == "frequency":
+        # Templated and duplicate reviews are extracted once
+        extracted = {}
+        for text in texts:
+            if text not in extracted:
+                extracted[text] = _format(_top_frequent(tokenize(text), max_keywords))
+        return [extracted[text] for text in texts]
+    if mode == "tfidf":
+        token_lists = [tokenize(text) for text in texts]
+        batch = Counter()
+        for tokens in token_lists:
+            batch.update(set(tokens))
+        docs = Counter(get_document_frequencies().lookup(batch))
+        documents = docs.pop(DOCUMENT_TOTAL)
+        if not stored:
+            docs.update(batch)
+            documents += len(texts)
+        return [_format(_top_tfidf(tokens, max_keywords, documents, docs)) for tokens in token_lists]
+    raise ValueError(f"Unknown keyword mode: {mode}. Expected one of {', '.join(KEYWORD_MODES)}")
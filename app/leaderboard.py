@@ -0,0 +1,59 @@
+"""
+Category leaderboards.
+
+Businesses are ranked by a Bayesian average of their review scores rather than
+the plain mean: every business counts as having LEADERBOARD_PRIOR_REVIEWS extra
+reviews that score LEADERBOARD_PRIOR_MEAN. A business with a single 99 sits
+close to the prior, while thousands of reviews averaging 92 keep their score.
+The prior is a fixed setting rather than the mean of all reviews, so one review
+write only changes the score of its own business.
+
+The weighted score is stored on the business and updated together with its
+running aggregates. Leaderboards read it through the (category, weighted_score
+DESC) index, a range scan that stops after `limit` rows, and are cached in the
+response cache until a business of the category changes.
+"""
+
+from typing import List
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_REVIEWS
+from app.models import Business
+
+
+def weighted_vibe_score(score_sum, scored_reviews):
+    """
+    Bayesian average of a business's review scores.
+
+    Works on plain numbers and on SQL expressions, so UPDATEs can compute it
+    from the new aggregates in the same statement. The caller handles
+    businesses without scored reviews, whose weighted score is NULL.
+
+    Args:
+        score_sum: Sum of the review vibe scores
+        scored_reviews: Number of reviews that have a vibe score
+    """
+    return (LEADERBOARD_PRIOR_REVIEWS * LEADERBOARD_PRIOR_MEAN + score_sum) / (LEADERBOARD_PRIOR_REVIEWS + scored_reviews)
+
+
+def top_businesses(db: Session, category: str, limit: int) -> List[Business]:
+    """
+    Highest ranked businesses of a category. Businesses without scored reviews
+    are left out, and ties go to the older business.
+
+    Args:
+        db: Database session
+        category: Exact category name
+        limit: Maximum number of businesses
+
+    Returns:
+        Businesses in rank order
+    """
+    return db.execute(
+        select(Business)
+        .where(Business.category == category, Business.weighted_score.is_not(None))
+        .order_by(Business.weighted_score.desc(), Business.id)
+        .limit(limit)
+    ).scalars().all()
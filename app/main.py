@@ -1,24 +1,77 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import update
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
+from collections import Counter
+from datetime import date, datetime, timedelta
 
-from app.database import get_db, init_db
-from app.models import User, Business, Review
+from app.database import get_db, get_read_db, init_db
+from app.models import User, Business, Review, BusinessKeywordCount
 from app.schemas import (
     UserCreate, UserLogin, UserResponse, LoginResponse,
-    BusinessResponse, ReviewCreate, ReviewResponse, MessageResponse
+    BusinessResponse, ReviewCreate, ReviewResponse, ReviewStatusResponse, MessageResponse,
+    KeywordCountResponse, ReviewSearchResult, TrendPoint, LeaderboardEntry,
+    BulkReviewCreate, BulkBusinessReviewCreate, BulkReviewResponse
+)
+from app.auth import (
+    hash_password, verify_and_update_password, get_password_hasher, shutdown_password_hasher,
+    create_access_token, revoke_access_token, get_token_claims, get_current_user_id
+)
+from app.config import (
+    SCORING_MODE, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, ASYNC_DB, METRICS_ENABLED,
+    DEFAULT_TOP_KEYWORDS, MAX_TOP_KEYWORDS, DEFAULT_TREND_DAYS, MAX_TREND_DAYS,
+    DEFAULT_LEADERBOARD_SIZE, MAX_LEADERBOARD_SIZE
+)
+from app.pagination import keyset_select, fetch_page, wants_ndjson, ndjson_response, NEXT_CURSOR_HEADER
+from app.search import search_select, search_page
+from app.response_cache import get_response_cache, render_json, business_resource, leaderboard_resource, BUSINESS_LIST
+from app.scoring_worker import get_scoring_pool
+from app.trends import add_daily_vibe_deltas, update_daily_vibe, business_trend
+from app.keywords import add_document_frequency_deltas, update_document_frequencies
+from app.leaderboard import top_businesses
+from app.readiness import get_model_warmup, liveness, readiness
+from app.metrics import MetricsMiddleware, observe_stage, render_metrics, PROMETHEUS_MEDIA_TYPE
+from app.utils import (
+    analyze_review_sentiment, pending_sentiment_result, add_review, apply_review_score_change,
+    create_reviews_bulk, add_keyword_deltas, update_keyword_counts
 )
-from app.auth import hash_password, verify_password
-from app.utils import analyze_review_sentiment, update_business_vibe_score
 
 # Initialize FastAPI app
 app = FastAPI(title="VibeCheck Business API", version="1.0.0")
 
+# Per-route request latency for /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+# Async handlers are registered first so they take precedence over the sync ones
+if ASYNC_DB:
+    from app.async_routes import router as async_router
+    app.include_router(async_router)
+
 
 # Initialize database on startup
 @app.on_event("startup")
 def startup_event():
     init_db()
+    
+    # Load and warm up the model in the background; /readyz reports when it is done
+    get_model_warmup().start()
+    
+    # Resume scoring any reviews left pending by a previous run
+    if SCORING_MODE == "async":
+        get_scoring_pool().start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    if SCORING_MODE == "async":
+        get_scoring_pool().stop()
+    
+    shutdown_password_hasher()
+    
+    if ASYNC_DB:
+        from app.async_database import dispose_async_engines
+        await dispose_async_engines()
 
 
 # Root endpoint
@@ -27,11 +80,40 @@ def read_root():
     return {"message": "Welcome to VibeCheck Business API"}
 
 
+# Liveness probe: the process is up and serving requests, and has not given up on the model
+@app.get("/healthz")
+async def healthz(response: Response):
+    report = liveness()
+    if not report.pop("alive"):
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
+# Readiness probe: the model is warmed up and the database answers
+@app.get("/readyz")
+def readyz(response: Response):
+    report = readiness()
+    if not report["ready"]:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return report
+
+
+# Latency, throughput, batch and cache metrics in the Prometheus text format
+if METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(content=render_metrics(), media_type=PROMETHEUS_MEDIA_TYPE)
+
+
 # User Registration
 @app.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
+def register_user(
+    user_data: UserCreate,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
     # Check if username exists
-    existing_user = db.query(User).filter(User.username == user_data.username).first()
+    existing_user = read_db.query(User).filter(User.username == user_data.username).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -39,15 +121,18 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
         )
     
     # Check if email exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = read_db.query(User).filter(User.email == user_data.email).first()
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
+    # Hand the reader connection back before the long hash, so logins cannot hold them all
+    read_db.close()
+
     # Create new user
-    hashed_pwd = hash_password(user_data.password)
+    hashed_pwd = get_password_hasher().run(hash_password, user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -63,9 +148,13 @@ def register_user(user_data: UserCreate, db: Session = Depends(get_db)):
 
 # User Login
 @app.post("/login", response_model=LoginResponse)
-def login_user(credentials: UserLogin, db: Session = Depends(get_db)):
+def login_user(
+    credentials: UserLogin,
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
     # Find user
-    user = db.query(User).filter(User.username == credentials.username).first()
+    user = read_db.query(User).filter(User.username == credentials.username).first()
     
     if not user:
         raise HTTPException(
@@ -73,29 +162,80 @@ def login_user(credentials: UserLogin, db: Session = Depends(get_db)):
             detail="Invalid username or password"
         )
     
+    # Hand the reader connection back before the long hash; closing detaches the
+    # user without expiring it, so its loaded fields stay readable
+    read_db.close()
+
     # Verify password
-    if not verify_password(credentials.password, user.hashed_password):
+    verified, new_hash = get_password_hasher().run(
+        verify_and_update_password, credentials.password, user.hashed_password
+    )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid username or password"
         )
     
+    # Rehash passwords hashed with outdated Argon2 parameters, unless changed meanwhile
+    if new_hash:
+        db.execute(
+            update(User)
+            .where(User.id == user.id, User.hashed_password == user.hashed_password)
+            .values(hashed_password=new_hash)
+        )
+        db.commit()
+    
+    access_token, expires_in = create_access_token(user.id)
     return {
         "message": "Login successful",
-        "user": user
+        "user": user,
+        "access_token": access_token,
+        "token_type": "bearer",
+        "expires_in": expires_in
     }
 
 
-# Get all businesses
+# User Logout: the access token is rejected from now on
+@app.post("/logout", response_model=MessageResponse)
+def logout_user(claims: dict = Depends(get_token_claims)):
+    revoke_access_token(claims)
+    return {"message": "Logout successful"}
+
+
+# Get all businesses, one page at a time or streamed as NDJSON
 @app.get("/businesses", response_model=List[BusinessResponse])
-def list_all_businesses(db: Session = Depends(get_db)):
-    businesses = db.query(Business).all()
-    return businesses
+def list_all_businesses(
+    request: Request,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    stmt = keyset_select(Business, cursor)
+    if wants_ndjson(request):
+        return ndjson_response(stmt, BusinessResponse)
+    
+    # Pages are answered from the response cache until a business changes
+    cache = get_response_cache()
+    key = (BUSINESS_LIST, cursor, limit)
+    cached, version = cache.lookup(request, key, BUSINESS_LIST)
+    if cached:
+        return cached
+    
+    businesses, next_cursor = fetch_page(db, stmt, limit)
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return cache.store(request, key, BUSINESS_LIST, version, render_json(BusinessResponse, businesses), headers)
 
 
 # Get specific business
 @app.get("/businesses/{business_id}", response_model=BusinessResponse)
-def get_business(business_id: int, db: Session = Depends(get_db)):
+def get_business(business_id: int, request: Request, db: Session = Depends(get_read_db)):
+    # Unchanged businesses are answered from the response cache, or with a 304
+    cache = get_response_cache()
+    key = business_resource(business_id)
+    cached, version = cache.lookup(request, key, key)
+    if cached:
+        return cached
+    
     business = db.query(Business).filter(Business.id == business_id).first()
     
     if not business:
@@ -104,7 +244,7 @@ def get_business(business_id: int, db: Session = Depends(get_db)):
             detail="Business not found"
         )
     
-    return business
+    return cache.store(request, key, key, version, render_json(BusinessResponse, business))
 
 
 # Post a review
@@ -112,51 +252,167 @@ def get_business(business_id: int, db: Session = Depends(get_db)):
 def create_review(
     business_id: int,
     review_data: ReviewCreate,
-    user_id: int,
-    db: Session = Depends(get_db)
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
 ):
-    # Verify business exists
-    business = db.query(Business).filter(Business.id == business_id).first()
+    # Verify business exists (the author is vouched for by the access token)
+    with observe_stage("business_lookup"):
+        business = read_db.query(Business).filter(Business.id == business_id).first()
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Business not found"
         )
     
-    # Verify user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    # Analyze sentiment using DS Service, or leave it to the scoring workers
+    if SCORING_MODE == "async":
+        sentiment_result = pending_sentiment_result()
+    else:
+        sentiment_result = analyze_review_sentiment(review_data.content)
+    
+    # Create review and update the business vibe score in one transaction
+    new_review = add_review(business_id, user_id, review_data.content, sentiment_result, db)
+    with observe_stage("commit"):
+        db.commit()
+    db.refresh(new_review)
+    
+    if SCORING_MODE == "async":
+        get_scoring_pool().notify()
+    
+    return new_review
+
+
+def _bulk_response(results: list) -> dict:
+    created = sum(1 for result in results if result["success"])
+    if created and SCORING_MODE == "async":
+        get_scoring_pool().notify()
+    return {
+        "created": created,
+        "failed": len(results) - created,
+        "results": results
+    }
+
+
+# Post many reviews for one business
+@app.post("/businesses/{business_id}/reviews:bulk", response_model=BulkReviewResponse)
+def create_business_reviews_bulk(
+    business_id: int,
+    bulk_data: BulkReviewCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
+    # Verify business exists
+    business = read_db.query(Business).filter(Business.id == business_id).first()
+    if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found"
+            detail="Business not found"
         )
     
-    # Analyze sentiment using DS Service
-    sentiment_result = analyze_review_sentiment(review_data.content)
-    
-    # Create review
-    new_review = Review(
-        user_id=user_id,
-        business_id=business_id,
-        content=review_data.content,
-        vibe_score=sentiment_result.get("vibe_score"),
-        sentiment=sentiment_result.get("sentiment"),
-        keywords=sentiment_result.get("keywords")
-    )
+    items = [
+        {"business_id": business_id, "user_id": user_id, "content": item.content}
+        for item in bulk_data.reviews
+    ]
+    return _bulk_response(create_reviews_bulk(items, db, read_db))
+
+
+# Post many reviews across businesses
+@app.post("/reviews:bulk", response_model=BulkReviewResponse)
+def create_reviews_bulk_all(
+    bulk_data: BulkBusinessReviewCreate,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
+):
+    items = [dict(item.model_dump(), user_id=user_id) for item in bulk_data.reviews]
+    return _bulk_response(create_reviews_bulk(items, db, read_db))
+
+
+# Get reviews for a business, one page at a time or streamed as NDJSON
+@app.get("/businesses/{business_id}/reviews", response_model=List[ReviewResponse])
+def get_business_reviews(
+    business_id: int,
+    request: Request,
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    # Verify business exists
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found"
+        )
     
-    db.add(new_review)
-    db.commit()
-    db.refresh(new_review)
+    stmt = keyset_select(Review, cursor, Review.business_id == business_id)
+    if wants_ndjson(request):
+        return ndjson_response(stmt, ReviewResponse)
     
-    # Update business vibe score
-    update_business_vibe_score(business_id, db)
+    reviews, next_cursor = fetch_page(db, stmt, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return reviews
+
+
+# Get the most mentioned keywords of a business
+@app.get("/businesses/{business_id}/keywords", response_model=List[KeywordCountResponse])
+def get_business_keywords(
+    business_id: int,
+    top: int = Query(DEFAULT_TOP_KEYWORDS, ge=1, le=MAX_TOP_KEYWORDS),
+    db: Session = Depends(get_read_db)
+):
+    # Verify business exists
+    business = db.query(Business).filter(Business.id == business_id).first()
+    if not business:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Business not found"
+        )
     
-    return new_review
+    return (
+        db.query(BusinessKeywordCount)
+        .filter(BusinessKeywordCount.business_id == business_id)
+        .order_by(BusinessKeywordCount.count.desc(), BusinessKeywordCount.keyword)
+        .limit(top)
+        .all()
+    )
 
 
-# Get reviews for a business
-@app.get("/businesses/{business_id}/reviews", response_model=List[ReviewResponse])
-def get_business_reviews(business_id: int, db: Session = Depends(get_db)):
+# Get the vibe of a business over time from its daily rollups
+@app.get("/businesses/{business_id}/trend", response_model=List[TrendPoint])
+def get_business_trend(
+    business_id: int,
+    request: Request,
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    granularity: str = Query("day", pattern="^(day|week|month)$"),
+    db: Session = Depends(get_read_db)
+):
+    to_date = to_date or datetime.utcnow().date()
+    from_date = from_date or to_date - timedelta(days=DEFAULT_TREND_DAYS - 1)
+    if from_date > to_date:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'from' must not be after 'to'"
+        )
+    if (to_date - from_date).days >= MAX_TREND_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Trend range must not exceed {MAX_TREND_DAYS} days"
+        )
+    
+    # Trends change with the business aggregates, so they share its cache version
+    cache = get_response_cache()
+    resource = business_resource(business_id)
+    key = ("trend", business_id, from_date, to_date, granularity)
+    cached, version = cache.lookup(request, key, resource)
+    if cached:
+        return cached
+    
     # Verify business exists
     business = db.query(Business).filter(Business.id == business_id).first()
     if not business:
@@ -165,5 +421,94 @@ def get_business_reviews(business_id: int, db: Session = Depends(get_db)):
             detail="Business not found"
         )
     
-    reviews = db.query(Review).filter(Review.business_id == business_id).all()
+    trend = business_trend(db, business_id, from_date, to_date, granularity)
+    return cache.store(request, key, resource, version, render_json(TrendPoint, trend))
+
+
+# Get the highest ranked businesses of a category
+@app.get("/leaderboard", response_model=List[LeaderboardEntry])
+def get_leaderboard(
+    request: Request,
+    category: str = Query(..., min_length=1),
+    limit: int = Query(DEFAULT_LEADERBOARD_SIZE, ge=1, le=MAX_LEADERBOARD_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    # Leaderboards are answered from the response cache until a business of the category changes
+    cache = get_response_cache()
+    resource = leaderboard_resource(category)
+    key = ("leaderboard", category, limit)
+    cached, version = cache.lookup(request, key, resource)
+    if cached:
+        return cached
+    
+    entries = [
+        {**BusinessResponse.model_validate(business).model_dump(), "rank": rank}
+        for rank, business in enumerate(top_businesses(db, category, limit), start=1)
+    ]
+    return cache.store(request, key, resource, version, render_json(LeaderboardEntry, entries))
+
+
+# Search review content, most relevant first
+# (declared before /reviews/{review_id} so "search" is not taken for an id)
+@app.get("/reviews/search", response_model=List[ReviewSearchResult])
+def search_reviews(
+    response: Response,
+    q: str = Query(..., min_length=1),
+    business_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: Session = Depends(get_read_db)
+):
+    stmt = search_select(q, business_id, cursor)
+    reviews, next_cursor = search_page(db.execute(stmt.limit(limit + 1)).all(), limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return reviews
+
+
+# Get a review and its scoring status
+@app.get("/reviews/{review_id}", response_model=ReviewStatusResponse)
+def get_review(review_id: int, db: Session = Depends(get_read_db)):
+    review = db.query(Review).filter(Review.id == review_id).first()
+    if not review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found"
+        )
+    
+    return review
+
+
+# Delete a review
+@app.delete("/reviews/{review_id}", status_code=status.HTTP_204_NO_CONTENT)
+def delete_review(
+    review_id: int,
+    user_id: int = Depends(get_current_user_id),
+    db: Session = Depends(get_db)
+):
+    review = db.query(Review).filter(Review.id == review_id).first()
+    if not review:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Review not found"
+        )
+    
+    if review.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the author can delete this review"
+        )
+    
+    apply_review_score_change(review.business_id, db, old_score=review.vibe_score, review_delta=-1)
+    keyword_deltas = Counter()
+    add_keyword_deltas(keyword_deltas, review.business_id, review.keywords, sign=-1)
+    update_keyword_counts(keyword_deltas, db)
+    document_deltas = Counter()
+    add_document_frequency_deltas(document_deltas, review.content, sign=-1)
+    update_document_frequencies(document_deltas, db)
+    daily_deltas = {}
+    add_daily_vibe_deltas(daily_deltas, review.business_id, review.created_at, review.vibe_score,
+                          review.sentiment, sign=-1)
+    update_daily_vibe(daily_deltas, db)
+    db.delete(review)
+    db.commit()
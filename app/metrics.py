@@ -0,0 +1,292 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Histograms are updated on the request path, so they are kept cheap: an
+observation is a bisect over the bucket bounds plus two additions under the
+metric's lock, a couple of microseconds in total. Counters and gauges for
+state that already lives elsewhere (cache lookup counts, queue lengths,
+connection pools) are callbacks evaluated only when /metrics is scraped.
+
+Modules declare their own metrics next to the code they measure; everything
+registered here is rendered by render_metrics().
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, Iterable, Sequence, Tuple
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from a cache hit to a cold model load
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _register(metric):
+    with _registry_lock:
+        _registry.append(metric)
+    return metric
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in zip(names, values)) + "}"
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets, optionally per label values.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def observe(self, value: float, *labelvalues):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                # Per-bucket counts (the last one is +Inf) and the running sum
+                series = self._series[labelvalues] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, *labelvalues):
+        """
+        Observe the wall time of a with-block, also when it raises.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labelvalues)
+
+    def samples(self) -> Iterable[str]:
+        with self._lock:
+            series = [(labelvalues, list(counts), total) for labelvalues, (counts, total) in self._series.items()]
+        names = self.labelnames + ("le",)
+        for labelvalues, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(names, labelvalues + (_format_value(bound),))
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labelnames, labelvalues)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class CallbackGauge:
+    """
+    Gauge read from a callback at scrape time.
+
+    Args:
+        callback: Returns (label values, value) pairs
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 callback: Callable[[], Iterable[Tuple[tuple, float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.callback = callback
+        _register(self)
+
+    def samples(self) -> Iterable[str]:
+        for labelvalues, value in self.callback():
+            yield f"{self.name}{_format_labels(self.labelnames, labelvalues)} {_format_value(value)}"
+
+
+class CallbackCounter(CallbackGauge):
+    """
+    Counter read from a callback at scrape time, for totals that only grow
+    until the process restarts. Names end in _total.
+    """
+
+    kind = "counter"
+
+
+def render_metrics() -> str:
+    """
+    Every registered metric in the Prometheus text exposition format.
+    """
+    with _registry_lock:
+        metrics = list(_registry)
+    lines = []
+    for metric in metrics:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        try:
+            lines.extend(metric.samples())
+        except Exception as e:
+            # One broken callback must not take the whole scrape down
+            lines.append(f"# {metric.name} unavailable: {str(e)}")
+    return "\n".join(lines) + "\n"
+
+
+# Request and stage latency
+REQUEST_LATENCY = Histogram(
+    "vibecheck_http_request_duration_seconds",
+    "HTTP request latency by route template, method and status code",
+    ("method", "route", "status")
+)
+STAGE_LATENCY = Histogram(
+    "vibecheck_stage_duration_seconds",
+    "Latency of the stages of the review write and read paths",
+    ("stage",)
+)
+
+
+def observe_stage(stage: str):
+    """
+    Context manager timing one stage, e.g. `with observe_stage("commit"): db.commit()`.
+    """
+    return STAGE_LATENCY.time(stage)
+
+
+def timed_stage(stage: str):
+    """
+    Decorator timing every call of a function as one stage.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                STAGE_LATENCY.observe(time.perf_counter() - start, stage)
+        return wrapper
+    return decorator
+
+
+# Connection pools by engine label, reported at scrape time
+_pools: Dict[str, object] = {}
+
+
+def register_pool_metrics(engines: Dict[str, object]):
+    """
+    Report the connection pools of these engines. An engine used under several
+    labels (the default storage profile shares one) is reported once.
+    """
+    for label, engine in engines.items():
+        if engine not in _pools.values():
+            _pools[label] = engine
+
+
+def _pool_samples():
+    for label, engine in list(_pools.items()):
+        pool = engine.pool
+        for state, method in (("size", "size"), ("checked_out", "checkedout"),
+                              ("idle", "checkedin"), ("overflow", "overflow")):
+            if hasattr(pool, method):
+                # QueuePool counts overflow from its size down, so it is negative while under it
+                yield (label, state), max(getattr(pool, method)(), 0)
+
+
+CallbackGauge(
+    "vibecheck_db_pool_connections",
+    "Database connection pool usage by engine and state",
+    ("engine", "state"),
+    _pool_samples
+)
+
+
+# Cache counters by cache name, reported at scrape time
+_caches: Dict[str, Callable[[], dict]] = {}
+
+
+def register_cache_metrics(cache: str, stats: Callable[[], dict]):
+    """
+    Report a cache's counters.
+
+    Args:
+        cache: Cache name used as the label
+        stats: Returns {"lookups": {result: count}, "hit_ratio": ratio}, or None
+               while the cache has not been created
+    """
+    _caches[cache] = stats
+
+
+def _cache_stats():
+    for cache, stats in list(_caches.items()):
+        current = stats()
+        if current is not None:
+            yield cache, current
+
+
+CallbackCounter(
+    "vibecheck_cache_lookups_total",
+    "Cache lookups since startup by cache and result",
+    ("cache", "result"),
+    lambda: (((cache, result), count) for cache, stats in _cache_stats() for result, count in stats["lookups"].items())
+)
+CallbackGauge(
+    "vibecheck_cache_hit_ratio",
+    "Share of cache lookups answered from the cache",
+    ("cache",),
+    lambda: (((cache,), stats["hit_ratio"]) for cache, stats in _cache_stats())
+)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the latency of every HTTP request under its route
+    template (e.g. /businesses/{business_id}), so ids do not explode the series.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code)
+            )
@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Date, DateTime, Index, DDL, event, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
 Base = declarative_base()
 
+# Sentiment of a review that is waiting for the background scoring workers
+PENDING_SENTIMENT = "PENDING"
+# Sentiment of a review the scoring workers gave up on after SCORING_MAX_ATTEMPTS
+FAILED_SENTIMENT = "FAILED"
+
+# keyword_document_frequencies row holding the number of reviews; never a keyword,
+# since special characters are stripped from review words
+DOCUMENT_TOTAL = "*"
+
 
 class User(Base):
     __tablename__ = "users"
@@ -28,10 +37,22 @@ class Business(Base):
     location = Column(String(255), nullable=False)
     aggregated_vibe_score = Column(Float, default=0.0)
     total_reviews = Column(Integer, default=0)
+    # Running aggregates so review writes update the score in O(1)
+    vibe_score_sum = Column(Float, nullable=False, default=0.0, server_default="0")
+    scored_reviews = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bayesian average of the review scores that leaderboards rank by; NULL until a review is scored
+    weighted_score = Column(Float, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationship
     reviews = relationship("Review", back_populates="business")
+    
+    __table_args__ = (
+        # Keyset pagination of the business listing
+        Index("ix_businesses_created_at_id", "created_at", "id"),
+        # Category leaderboards, read in order without a sort
+        Index("ix_businesses_category_weighted_score", "category", weighted_score.desc()),
+    )
 
 
 class Review(Base):
@@ -45,7 +66,95 @@ class Review(Base):
     sentiment = Column(String(50), nullable=True)
     keywords = Column(String(500), nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    # Set while a scoring worker holds a pending review
+    claimed_at = Column(DateTime, nullable=True)
+    # Number of times a scoring worker has claimed the review
+    scoring_attempts = Column(Integer, nullable=False, default=0, server_default="0")
     
     # Relationships
     user = relationship("User", back_populates="reviews")
     business = relationship("Business", back_populates="reviews")
+    
+    __table_args__ = (
+        # Per-business listing (keyset on created_at, id) and aggregate recomputes
+        Index("ix_reviews_business_created_at_id", "business_id", "created_at", "id"),
+        # Per-user review history
+        Index("ix_reviews_user_created_at", "user_id", "created_at"),
+        # Small partial index that acts as the pending scoring queue
+        Index("ix_reviews_pending", "id", sqlite_where=text(f"sentiment = '{PENDING_SENTIMENT}'")),
+    )
+    
+    @property
+    def scoring_status(self) -> str:
+        if self.sentiment == PENDING_SENTIMENT:
+            return "pending"
+        return "failed" if self.sentiment == FAILED_SENTIMENT else "scored"
+
+
+# Full-text index over review content: an external-content FTS5 table that stores
+# only the index and reads the text from reviews. Triggers keep it in step with
+# every write path, including bulk inserts and deletes.
+REVIEWS_FTS_TABLE = "reviews_fts"
+REVIEWS_FTS_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {REVIEWS_FTS_TABLE} USING fts5("
+    f"content, content='reviews', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+    f"INSERT INTO {REVIEWS_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+    f"INSERT INTO {REVIEWS_FTS_TABLE}({REVIEWS_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); END",
+    f"CREATE TRIGGER IF NOT EXISTS reviews_fts_update AFTER UPDATE OF content ON reviews BEGIN "
+    f"INSERT INTO {REVIEWS_FTS_TABLE}({REVIEWS_FTS_TABLE}, rowid, content) VALUES ('delete', old.id, old.content); "
+    f"INSERT INTO {REVIEWS_FTS_TABLE}(rowid, content) VALUES (new.id, new.content); END",
+)
+
+for _statement in REVIEWS_FTS_DDL:
+    event.listen(Review.__table__, "after_create", DDL(_statement))
+event.listen(Review.__table__, "before_drop", DDL(f"DROP TABLE IF EXISTS {REVIEWS_FTS_TABLE}"))
+
+
+class SentimentCacheEntry(Base):
+    __tablename__ = "sentiment_cache"
+    
+    # SHA-256 of the normalized review text, scoped to the model that scored it
+    text_hash = Column(String(64), primary_key=True)
+    model_id = Column(String(200), primary_key=True)
+    label = Column(String(50), nullable=False)
+    score = Column(Float, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class BusinessKeywordCount(Base):
+    __tablename__ = "business_keyword_counts"
+    
+    # Number of reviews of the business that have this keyword, kept in step with review writes
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True)
+    keyword = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        # Top keywords of a business, read in order without a sort
+        Index("ix_business_keyword_counts_business_count", "business_id", count.desc(), "keyword"),
+    )
+
+
+class KeywordDocumentFrequency(Base):
+    __tablename__ = "keyword_document_frequencies"
+    
+    # Number of reviews whose text contains the word, kept in step with review
+    # writes in tfidf keyword mode; the DOCUMENT_TOTAL row counts the reviews
+    word = Column(String(100), primary_key=True)
+    docs = Column(Integer, nullable=False, default=0)
+
+
+class BusinessDailyVibe(Base):
+    __tablename__ = "business_daily_vibe"
+    
+    # Per-business, per-day rollup of the reviews created that day (UTC), kept in
+    # step with review writes; the primary key serves trend range scans
+    business_id = Column(Integer, ForeignKey("businesses.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    review_count = Column(Integer, nullable=False, default=0)
+    scored_reviews = Column(Integer, nullable=False, default=0)
+    vibe_score_sum = Column(Float, nullable=False, default=0.0)
+    positive_reviews = Column(Integer, nullable=False, default=0)
+    negative_reviews = Column(Integer, nullable=False, default=0)
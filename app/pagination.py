@@ -0,0 +1,137 @@
+"""
+Keyset pagination and NDJSON streaming for list endpoints.
+
+Listings are ordered by (created_at, id). A page ends with an opaque cursor
+holding the last row's key, and the next page starts strictly after it, so
+each page is an index range scan no matter how deep the client has paged.
+Clients that send `Accept: application/x-ndjson` instead get every remaining
+row streamed one JSON object per line, fetched from a server-side cursor in
+chunks so memory stays flat.
+"""
+
+import base64
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from sqlalchemy import Select, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import STREAM_CHUNK_SIZE
+from app.database import ReadSessionLocal
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Encode the key of the last row of a page as an opaque cursor.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor.
+    
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        created_at, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def keyset_select(model, cursor: Optional[str], *criteria) -> Select:
+    """
+    Select the rows of a model's table that come after the cursor, in key order.
+    
+    Args:
+        model: ORM model with created_at and id columns
+        cursor: Cursor from a previous page, or None to start from the beginning
+        criteria: Extra WHERE criteria, e.g. a business filter
+    """
+    stmt = select(model.__table__).where(*criteria)
+    after = decode_cursor(cursor)
+    if after:
+        stmt = stmt.where(tuple_(model.created_at, model.id) > tuple_(*after))
+    return stmt.order_by(model.created_at, model.id)
+
+
+def fetch_page(db: Session, stmt: Select, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Fetch one page of a keyset_select statement.
+    
+    Returns:
+        The rows and the cursor of the next page (None on the last page)
+    """
+    rows = db.execute(stmt.limit(limit + 1)).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+async def fetch_page_async(db: AsyncSession, stmt: Select, limit: int) -> Tuple[list, Optional[str]]:
+    """
+    Async version of fetch_page.
+    """
+    rows = (await db.execute(stmt.limit(limit + 1))).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
+
+
+def wants_ndjson(request: Request) -> bool:
+    """
+    Whether the client asked for a streamed NDJSON response.
+    """
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def ndjson_response(stmt: Select, schema: type[BaseModel]) -> StreamingResponse:
+    """
+    Stream every row of a statement as NDJSON.
+    
+    The stream uses its own session, since it outlives the request handler.
+    """
+    def generate():
+        db = ReadSessionLocal()
+        try:
+            result = db.execute(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE))
+            for rows in result.partitions():
+                yield "".join(schema.model_validate(row).model_dump_json() + "\n" for row in rows)
+        finally:
+            db.close()
+    
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
+
+
+def ndjson_response_async(stmt: Select, schema: type[BaseModel], session_factory) -> StreamingResponse:
+    """
+    Async version of ndjson_response, streaming from an async server-side cursor.
+    
+    Args:
+        session_factory: async_sessionmaker to open the stream's own session
+    """
+    async def generate():
+        async with session_factory() as db:
+            result = await db.stream(stmt.execution_options(yield_per=STREAM_CHUNK_SIZE))
+            async for rows in result.partitions():
+                yield "".join(schema.model_validate(row).model_dump_json() + "\n" for row in rows)
+    
+    return StreamingResponse(generate(), media_type=NDJSON_MEDIA_TYPE)
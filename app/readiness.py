@@ -0,0 +1,180 @@
+"""
+Startup warmup and readiness.
+
+Loading DistilBERT takes seconds, and the first forward pass is slower than the
+rest. Instead of paying for both on the first review after a deploy, startup
+hands them to a background thread: it purges stale sentiment cache entries,
+loads the model, runs a warmup inference through the same path reviews use
+(sidecar, batcher or analyzer), and logs the time to ready.
+
+/healthz only says the process is serving requests. /readyz also requires the
+warmup to have finished and the database to answer, so an orchestrator keeps
+traffic away from a worker that would stall on its first review.
+
+A failed warmup is retried with exponential backoff. Once it has failed
+MODEL_WARMUP_ATTEMPTS times it gives up and /healthz fails as well, so the
+worker is restarted instead of staying up without ever receiving traffic.
+"""
+
+import threading
+import time
+
+from app.config import (
+    INFERENCE_MODE, MODEL_WARMUP, MODEL_WARMUP_ATTEMPTS, MODEL_WARMUP_RETRY_SECONDS, SENTIMENT_CACHE_ENABLED
+)
+from app.database import read_engine
+from app.sentiment_analyzer import get_model_id, get_sentiment_analyzer
+from app.sentiment_cache import get_sentiment_cache
+from app.utils import classify_texts
+
+WARMUP_TEXT = "The staff were friendly and the coffee was great."
+
+# Taken when the app is imported, the closest we get to process start
+_imported_at = time.monotonic()
+
+
+class ModelWarmup:
+    """
+    Background model load and warmup inference, started once at startup.
+    """
+
+    def __init__(self, enabled: bool = MODEL_WARMUP, attempts: int = MODEL_WARMUP_ATTEMPTS,
+                 retry_seconds: float = MODEL_WARMUP_RETRY_SECONDS):
+        self.enabled = enabled
+        self.attempts = attempts
+        self.retry_seconds = retry_seconds
+        self.failures = 0
+        self.error = None
+        self.timings = {}
+        self._done = threading.Event()
+        self._thread = None
+
+    @property
+    def state(self) -> str:
+        """
+        "lazy" (warmup disabled), "loading" (including retries), "ready" or
+        "failed" (gave up after the last attempt).
+        """
+        if not self.enabled:
+            return "lazy"
+        if not self._done.is_set():
+            return "loading"
+        return "failed" if self.error else "ready"
+
+    def start(self):
+        if not self.enabled or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="model-warmup", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Block until the warmup has finished. Returns False on timeout.
+        """
+        return self._done.wait(timeout)
+
+    def _run(self):
+        try:
+            delay = self.retry_seconds
+            while not self._attempt():
+                if self.failures >= self.attempts:
+                    print(f"✗ Giving up on the model warmup after {self.failures} attempts.")
+                    return
+                print(f"  Retrying the model warmup in {delay:g}s...")
+                time.sleep(delay)
+                delay *= 2
+        finally:
+            self._done.set()
+
+    def _attempt(self) -> bool:
+        """
+        Load and warm up the model once. Returns False if it failed.
+        """
+        start = time.monotonic()
+        try:
+            # Drop cached sentiment results from previously configured models
+            if SENTIMENT_CACHE_ENABLED:
+                purged = get_sentiment_cache().purge_other_models()
+                if purged:
+                    print(f"Purged {purged} sentiment cache entries from other models.")
+
+            # The sidecar owns the model in sidecar mode; only load it here otherwise
+            if INFERENCE_MODE != "sidecar":
+                get_sentiment_analyzer()
+            loaded = time.monotonic()
+            self.timings["model_load_seconds"] = round(loaded - start, 3)
+
+            # First passes allocate buffers; run both the single and the batched path
+            classify_texts([WARMUP_TEXT])
+            classify_texts([WARMUP_TEXT, WARMUP_TEXT])
+            self.timings["warmup_seconds"] = round(time.monotonic() - loaded, 3)
+            self.timings["time_to_ready_seconds"] = round(time.monotonic() - _imported_at, 3)
+            print(f"✓ Ready {self.timings['time_to_ready_seconds']:.2f}s after startup "
+                  f"({get_model_id()}: load {self.timings['model_load_seconds']:.2f}s, "
+                  f"warmup {self.timings['warmup_seconds']:.2f}s)")
+            self.error = None
+            return True
+        except Exception as e:
+            self.failures += 1
+            self.error = str(e)
+            print(f"✗ Model warmup failed (attempt {self.failures} of {self.attempts}): {str(e)}")
+            return False
+
+
+# Global instance - created on first use
+_model_warmup = None
+_model_warmup_lock = threading.Lock()
+
+
+def get_model_warmup() -> ModelWarmup:
+    """
+    Returns a singleton ModelWarmup.
+    """
+    global _model_warmup
+    if _model_warmup is None:
+        with _model_warmup_lock:
+            if _model_warmup is None:
+                _model_warmup = ModelWarmup()
+    return _model_warmup
+
+
+def database_reachable() -> bool:
+    """
+    Whether a read connection can run a trivial query.
+    """
+    try:
+        with read_engine.connect() as conn:
+            conn.exec_driver_sql("SELECT 1")
+        return True
+    except Exception:
+        return False
+
+
+def readiness() -> dict:
+    """
+    Readiness report for /readyz; "ready" is True when traffic can be routed here.
+    """
+    warmup = get_model_warmup()
+    database = database_reachable()
+    report = {
+        "ready": database and warmup.state in ("ready", "lazy"),
+        "database": "ok" if database else "unreachable",
+        "model": warmup.state,
+        "uptime_seconds": round(time.monotonic() - _imported_at, 3),
+        **warmup.timings
+    }
+    if warmup.error:
+        report["error"] = warmup.error
+        report["warmup_failures"] = warmup.failures
+    return report
+
+
+def liveness() -> dict:
+    """
+    Liveness report for /healthz; "alive" is False once the warmup has given up,
+    since this worker would otherwise never become ready.
+    """
+    warmup = get_model_warmup()
+    if warmup.state == "failed":
+        return {"alive": False, "status": "failed", "error": warmup.error}
+    return {"alive": True, "status": "ok"}
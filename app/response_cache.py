@@ -0,0 +1,240 @@
+"""
+Response cache for business reads.
+
+GET /businesses and GET /businesses/{id} only change when a business row does,
+which in practice means when a review write updates its aggregates. Rendered
+responses are cached per request key together with the version of the resource
+they were built from. Every business, every category leaderboard and the
+business list as a whole have a version counter, bumped when a session that
+changed them commits. A cached
+response whose version is current is served without touching the database,
+and a client whose If-None-Match carries the response's strong ETag gets a 304.
+
+Versions live in process memory, so writes by other processes only show up
+once an entry is older than RESPONSE_CACHE_TTL_SECONDS.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from itertools import chain
+from typing import Hashable, Iterable, NamedTuple, Optional, Tuple
+
+from fastapi import Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from app.config import RESPONSE_CACHE_ENABLED, RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL_SECONDS
+from app.metrics import register_cache_metrics
+from app.models import Business
+
+BUSINESS_LIST = "businesses"
+
+# Session.info keys collecting the ids and categories of businesses changed in the current transaction
+_CHANGED_BUSINESSES = "changed_business_ids"
+_CHANGED_CATEGORIES = "changed_categories"
+
+
+def business_resource(business_id: int) -> str:
+    return f"business:{business_id}"
+
+
+def leaderboard_resource(category: str) -> str:
+    return f"leaderboard:{category}"
+
+
+def render_json(schema: type[BaseModel], value) -> bytes:
+    """
+    Serialize an ORM object or row (or a list of them) the way response_model would.
+    """
+    if isinstance(value, list):
+        return b"[" + b",".join(render_json(schema, item) for item in value) + b"]"
+    return schema.model_validate(value).model_dump_json().encode("utf-8")
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header matches an ETag (weak comparison, as RFC 9110 asks).
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+class CachedResponse(NamedTuple):
+    resource: str
+    version: int
+    expires_at: float
+    body: bytes
+    etag: str
+    headers: dict
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU of rendered responses, invalidated through resource versions.
+    """
+
+    def __init__(self, max_entries: int = RESPONSE_CACHE_SIZE, ttl_seconds: float = RESPONSE_CACHE_TTL_SECONDS,
+                 enabled: bool = RESPONSE_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        self._entries = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, resources: Iterable[str]):
+        """
+        Bump the versions of resources, so responses built from them are rebuilt.
+        """
+        with self._lock:
+            for resource in resources:
+                self._versions[resource] = self._versions.get(resource, 0) + 1
+
+    def lookup(self, request: Request, key: Hashable, resource: str) -> Tuple[Optional[Response], int]:
+        """
+        Answer a request from the cache if its entry is current.
+
+        Args:
+            request: The incoming request, for If-None-Match
+            key: Cache key of the response (path and query)
+            resource: Resource whose version the response depends on
+
+        Returns:
+            The response (or None on a miss) and the resource version to pass
+            to store, read before the caller queries the database
+        """
+        if not self.enabled:
+            return None, 0
+
+        with self._lock:
+            version = self._versions.get(resource, 0)
+            entry = self._entries.get(key)
+            if entry and entry.version == version and entry.expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+            else:
+                entry = None
+                self.misses += 1
+
+        if entry is None:
+            return None, version
+        return self._respond(request, entry), version
+
+    def store(self, request: Request, key: Hashable, resource: str, version: int, body: bytes,
+              headers: Optional[dict] = None) -> Response:
+        """
+        Cache a freshly rendered response and answer the request with it.
+
+        Args:
+            version: Resource version returned by lookup before the response was built
+            body: Rendered JSON body
+            headers: Extra response headers to cache with the body
+        """
+        entry = CachedResponse(
+            resource=resource,
+            version=version,
+            expires_at=time.monotonic() + self.ttl_seconds,
+            body=body,
+            etag=f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+            headers=headers or {}
+        )
+        if self.enabled:
+            with self._lock:
+                self._entries[key] = entry
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return self._respond(request, entry)
+
+    def _respond(self, request: Request, entry: CachedResponse) -> Response:
+        # Clients may keep the body but must revalidate it on every use
+        headers = {"ETag": entry.etag, "Cache-Control": "no-cache", **entry.headers}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            with self._lock:
+                self.not_modified += 1
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    def stats(self) -> dict:
+        """
+        Hit, miss and 304 counters since startup.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "not_modified": self.not_modified,
+                "entries": len(self._entries)
+            }
+
+
+# Global instance - shared by every request in this process
+_response_cache = ResponseCache()
+
+
+def get_response_cache() -> ResponseCache:
+    return _response_cache
+
+
+def _cache_metrics():
+    stats = _response_cache.stats()
+    lookups = stats["hits"] + stats["misses"]
+    return {
+        "lookups": {"hit": stats["hits"], "miss": stats["misses"]},
+        "hit_ratio": round(stats["hits"] / lookups, 4) if lookups else 0.0
+    }
+
+
+register_cache_metrics("response", _cache_metrics)
+
+
+def mark_businesses_changed(db: Session, business_ids: Iterable[int]):
+    """
+    Record that the current transaction changes these businesses. Their cached
+    responses are invalidated when it commits and kept if it rolls back.
+    """
+    db.info.setdefault(_CHANGED_BUSINESSES, set()).update(business_ids)
+
+
+def mark_categories_changed(db: Session, categories: Iterable[str]):
+    """
+    Record that the current transaction changes the ranking of these categories.
+    Their cached leaderboards are invalidated when it commits.
+    """
+    db.info.setdefault(_CHANGED_CATEGORIES, set()).update(categories)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_businesses(session, flush_context):
+    # Businesses added, edited or deleted through the ORM rather than bulk UPDATEs
+    changed = [obj for obj in chain(session.new, session.dirty, session.deleted) if isinstance(obj, Business)]
+    if changed:
+        mark_businesses_changed(session, [business.id for business in changed])
+        # A business moved to another category also leaves the old leaderboard
+        mark_categories_changed(session, chain.from_iterable(
+            inspect(business).attrs.category.history.sum() for business in changed
+        ))
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_businesses(session):
+    business_ids = session.info.pop(_CHANGED_BUSINESSES, None)
+    categories = session.info.pop(_CHANGED_CATEGORIES, None)
+    if business_ids:
+        get_response_cache().invalidate(chain([BUSINESS_LIST], map(business_resource, business_ids)))
+    if categories:
+        get_response_cache().invalidate(map(leaderboard_resource, categories))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_businesses(session):
+    session.info.pop(_CHANGED_BUSINESSES, None)
+    session.info.pop(_CHANGED_CATEGORIES, None)
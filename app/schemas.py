@@ -1,6 +1,7 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime
+from app.config import MIN_REVIEW_LENGTH, BULK_REVIEW_MAX_ITEMS
 
 
 # User Schemas
@@ -32,6 +33,7 @@ class BusinessResponse(BaseModel):
     category: str
     location: str
     aggregated_vibe_score: float
+    weighted_score: Optional[float] = None
     total_reviews: int
     created_at: datetime
     
@@ -39,9 +41,13 @@ class BusinessResponse(BaseModel):
         from_attributes = True
 
 
+class LeaderboardEntry(BusinessResponse):
+    rank: int
+
+
 # Review Schemas
 class ReviewCreate(BaseModel):
-    content: str = Field(..., min_length=10)
+    content: str = Field(..., min_length=MIN_REVIEW_LENGTH)
 
 
 class ReviewResponse(BaseModel):
@@ -58,6 +64,68 @@ class ReviewResponse(BaseModel):
         from_attributes = True
 
 
+class ReviewStatusResponse(ReviewResponse):
+    scoring_status: str
+
+
+class ReviewSearchResult(ReviewResponse):
+    # Matching text with the search terms wrapped in <mark> tags
+    snippet: str
+    # BM25 rank, lower is more relevant
+    rank: float
+
+
+class KeywordCountResponse(BaseModel):
+    keyword: str
+    count: int
+    
+    class Config:
+        from_attributes = True
+
+
+class TrendPoint(BaseModel):
+    # First day of the day, week (Monday) or month
+    period_start: date
+    review_count: int
+    scored_reviews: int
+    positive_reviews: int
+    negative_reviews: int
+    # Average vibe score of the period's scored reviews
+    vibe_score: Optional[float] = None
+
+
+# Bulk Review Schemas
+# Content length is checked per item so one short review does not reject the batch.
+# Every review is authored by the user of the request's access token.
+class BulkReviewItem(BaseModel):
+    content: str
+
+
+class BulkBusinessReviewItem(BulkReviewItem):
+    business_id: int
+
+
+class BulkReviewCreate(BaseModel):
+    reviews: List[BulkReviewItem] = Field(..., min_length=1, max_length=BULK_REVIEW_MAX_ITEMS)
+
+
+class BulkBusinessReviewCreate(BaseModel):
+    reviews: List[BulkBusinessReviewItem] = Field(..., min_length=1, max_length=BULK_REVIEW_MAX_ITEMS)
+
+
+class BulkReviewResult(BaseModel):
+    index: int
+    success: bool
+    review: Optional[ReviewResponse] = None
+    error: Optional[str] = None
+
+
+class BulkReviewResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkReviewResult]
+
+
 # Response Messages
 class MessageResponse(BaseModel):
     message: str
@@ -66,3 +134,6 @@ class MessageResponse(BaseModel):
 class LoginResponse(BaseModel):
     message: str
     user: UserResponse
+    access_token: str
+    token_type: str = "bearer"
+    expires_in: int
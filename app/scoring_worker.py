@@ -0,0 +1,283 @@
+"""
+Background scoring workers for async review scoring.
+
+In async scoring mode reviews are stored with sentiment PENDING and no vibe score,
+so posting a review does not wait for the model. A pool of worker threads claims
+pending reviews in batches, scores them with one batched analyzer call, and updates
+the reviews and their business aggregates.
+
+The pending queue lives in the reviews table itself, so work left behind by a crash
+or restart is picked up again once its claim lease expires. If the batched analysis
+fails (model load error, sidecar failure, out of memory, a text the model cannot
+handle), the reviews are analyzed one at a time, so one bad text does not hold back
+the rest of its batch. Reviews that still fail are left pending the same way.
+
+Every claim counts as an attempt. A review that fails its SCORING_MAX_ATTEMPTS-th
+attempt, or is claimed again after it (its worker died), is marked FAILED and
+leaves the queue. Setting its sentiment back to PENDING and its scoring_attempts
+to 0 queues it again.
+"""
+
+import threading
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import Row, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import (
+    SCORING_WORKERS, SCORING_BATCH_SIZE, SCORING_POLL_INTERVAL_SECONDS, SCORING_LEASE_SECONDS,
+    SCORING_MAX_ATTEMPTS
+)
+from app.database import SessionLocal
+from app.models import Review, PENDING_SENTIMENT, FAILED_SENTIMENT
+from app.trends import add_daily_vibe_deltas, update_daily_vibe
+from app.utils import (
+    analyze_reviews_sentiment, apply_review_score_change, add_keyword_deltas, update_keyword_counts
+)
+
+
+def claim_pending_reviews(db: Session, batch_size: int, lease_seconds: int) -> List[Row]:
+    """
+    Claim up to batch_size pending reviews that no live worker is holding, counting
+    an attempt for each.
+
+    Args:
+        db: Database session
+        batch_size: Maximum number of reviews to claim
+        lease_seconds: Age after which another worker's claim is considered abandoned
+
+    Returns:
+        Rows of (id, business_id, content, created_at, claimed_at, scoring_attempts) for the
+        claimed reviews, oldest first
+    """
+    claimed_at = datetime.utcnow()
+    claimable = [
+        Review.sentiment == PENDING_SENTIMENT,
+        or_(
+            Review.claimed_at.is_(None),
+            Review.claimed_at < claimed_at - timedelta(seconds=lease_seconds)
+        )
+    ]
+
+    review_ids = db.scalars(
+        select(Review.id).where(*claimable).order_by(Review.id).limit(batch_size)
+    ).all()
+    if not review_ids:
+        return []
+
+    # Another worker may claim the same rows in between, so only keep what we won
+    db.execute(
+        update(Review)
+        .where(Review.id.in_(review_ids), *claimable)
+        .values(claimed_at=claimed_at, scoring_attempts=Review.scoring_attempts + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+
+    claimed = db.execute(
+        select(Review.id, Review.business_id, Review.content, Review.created_at, Review.claimed_at,
+               Review.scoring_attempts)
+        .where(Review.id.in_(review_ids), Review.claimed_at == claimed_at)
+        .order_by(Review.id)
+    ).all()
+
+    # End the transaction so the writer connection is not held during inference
+    db.commit()
+    return claimed
+
+
+def analyze_claimed_reviews(reviews: List[Row]) -> List[Optional[dict]]:
+    """
+    Analyze claimed reviews with one batched call, falling back to one call per
+    review if the batch fails.
+
+    Args:
+        reviews: Claimed review rows
+
+    Returns:
+        Sentiment results in review order; None for a review whose analysis failed
+    """
+    try:
+        return analyze_reviews_sentiment([review.content for review in reviews], stored=True, fallback=False)
+    except Exception as e:
+        if len(reviews) == 1:
+            print(f"Error scoring review {reviews[0].id} (attempt {reviews[0].scoring_attempts}): {str(e)}")
+            return [None]
+        print(f"Error scoring a batch of {len(reviews)} reviews, scoring them one at a time: {str(e)}")
+
+    sentiment_results = []
+    for review in reviews:
+        try:
+            sentiment_results.append(analyze_reviews_sentiment([review.content], stored=True, fallback=False)[0])
+        except Exception as e:
+            print(f"Error scoring review {review.id} (attempt {review.scoring_attempts}): {str(e)}")
+            sentiment_results.append(None)
+    return sentiment_results
+
+
+def score_pending_reviews(db: Session, batch_size: int = SCORING_BATCH_SIZE,
+                          lease_seconds: int = SCORING_LEASE_SECONDS,
+                          max_attempts: int = SCORING_MAX_ATTEMPTS) -> int:
+    """
+    Claim and score one batch of pending reviews.
+
+    Reviews whose analysis fails are not given placeholder scores: they stay pending
+    under their claim until the lease expires and they are retried, or are marked
+    FAILED once they have used max_attempts.
+
+    Args:
+        db: Database session
+        batch_size: Maximum number of reviews to score
+        lease_seconds: Claim lease, see claim_pending_reviews
+        max_attempts: Claims a review gets before it is marked FAILED
+
+    Returns:
+        Number of reviews scored
+    """
+    reviews = claim_pending_reviews(db, batch_size, lease_seconds)
+    if not reviews:
+        return 0
+
+    # Claimed once more after its last attempt, so that attempt died with its worker
+    failed = [review for review in reviews if review.scoring_attempts > max_attempts]
+    reviews = [review for review in reviews if review.scoring_attempts <= max_attempts]
+    sentiment_results = analyze_claimed_reviews(reviews) if reviews else []
+
+    scored = 0
+    keyword_deltas = Counter()
+    daily_deltas = {}
+    for review, sentiment_result in zip(reviews, sentiment_results):
+        if sentiment_result is None:
+            if review.scoring_attempts >= max_attempts:
+                failed.append(review)
+            continue
+
+        # Skip reviews deleted or re-claimed after an expired lease while we were scoring
+        result = db.execute(
+            update(Review)
+            .where(
+                Review.id == review.id,
+                Review.sentiment == PENDING_SENTIMENT,
+                Review.claimed_at == review.claimed_at
+            )
+            .values(
+                vibe_score=sentiment_result.get("vibe_score"),
+                sentiment=sentiment_result.get("sentiment"),
+                keywords=sentiment_result.get("keywords"),
+                claimed_at=None
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            apply_review_score_change(review.business_id, db, new_score=sentiment_result.get("vibe_score"))
+            add_keyword_deltas(keyword_deltas, review.business_id, sentiment_result.get("keywords"))
+            # The review was counted on its day when it was stored as pending
+            add_daily_vibe_deltas(daily_deltas, review.business_id, review.created_at,
+                                  sentiment_result.get("vibe_score"), sentiment_result.get("sentiment"),
+                                  count_review=False)
+            scored += 1
+
+    for review in failed:
+        # The review keeps its unscored place in the aggregates, as while it was pending
+        result = db.execute(
+            update(Review)
+            .where(
+                Review.id == review.id,
+                Review.sentiment == PENDING_SENTIMENT,
+                Review.claimed_at == review.claimed_at
+            )
+            .values(sentiment=FAILED_SENTIMENT, claimed_at=None)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount:
+            print(f"Gave up scoring review {review.id} after {max_attempts} attempt(s), marked it {FAILED_SENTIMENT}")
+
+    update_keyword_counts(keyword_deltas, db)
+    update_daily_vibe(daily_deltas, db)
+    db.commit()
+    return scored
+
+
+class ScoringWorkerPool:
+    """
+    Thread pool that keeps draining the pending review queue.
+    """
+
+    def __init__(self, workers: int = SCORING_WORKERS, batch_size: int = SCORING_BATCH_SIZE,
+                 poll_interval: float = SCORING_POLL_INTERVAL_SECONDS,
+                 lease_seconds: int = SCORING_LEASE_SECONDS, max_attempts: int = SCORING_MAX_ATTEMPTS,
+                 session_factory=SessionLocal):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.session_factory = session_factory
+        self.reviews_scored = 0
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        """
+        Start the worker threads. Pending reviews already in the database are
+        picked up straight away.
+        """
+        if self._threads:
+            return
+        self._stopping.clear()
+        for index in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f"scoring-worker-{index}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        print(f"Started {self.workers} review scoring worker(s).")
+
+    def stop(self):
+        """
+        Stop the worker threads after their current batch.
+        """
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def notify(self):
+        """
+        Wake the workers because new pending reviews were written.
+        """
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            db = self.session_factory()
+            try:
+                scored = score_pending_reviews(db, self.batch_size, self.lease_seconds, self.max_attempts)
+                self.reviews_scored += scored
+            except Exception as e:
+                print(f"Error in review scoring worker, claimed reviews are retried after the lease: {str(e)}")
+                db.rollback()
+                scored = 0
+            finally:
+                db.close()
+
+            # Keep going while there is a backlog, otherwise sleep until notified
+            if not scored:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+
+
+# Global instance - created on first use
+_scoring_pool = None
+
+
+def get_scoring_pool():
+    """
+    Returns a singleton ScoringWorkerPool.
+    """
+    global _scoring_pool
+    if _scoring_pool is None:
+        _scoring_pool = ScoringWorkerPool()
+    return _scoring_pool
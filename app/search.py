@@ -0,0 +1,112 @@
+"""
+Full-text search over review content.
+
+Reviews are indexed in the reviews_fts FTS5 table (see REVIEWS_FTS_DDL in
+app.models). Matches are ranked by BM25, come with a highlighted snippet, and
+are paged with a keyset cursor on (rank, id). A page therefore starts
+strictly after the previous one instead of re-ranking and skipping rows.
+"""
+
+import base64
+import re
+from typing import List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, column, func, literal_column, select, table, tuple_
+
+from app.models import Review, REVIEWS_FTS_TABLE
+
+SNIPPET_START = "<mark>"
+SNIPPET_END = "</mark>"
+SNIPPET_ELLIPSIS = "…"
+SNIPPET_TOKENS = 16
+
+_WORD = re.compile(r"\w+")
+
+_fts = table(REVIEWS_FTS_TABLE, column("rowid"))
+_fts_match = literal_column(REVIEWS_FTS_TABLE)
+# BM25 score of the match; lower is more relevant
+_fts_rank = literal_column(f"{REVIEWS_FTS_TABLE}.rank")
+
+
+def build_match_query(q: str) -> str:
+    """
+    Turn free text into an FTS5 query that matches reviews containing every word.
+
+    Each word is quoted, so FTS5 operators and stray quotes in user input are
+    searched for literally instead of failing to parse.
+
+    Raises:
+        HTTPException: 400 if the text contains no words
+    """
+    words = _WORD.findall(q)
+    if not words:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word"
+        )
+    return " ".join(f'"{word}"' for word in words)
+
+
+def encode_search_cursor(rank: float, row_id: int) -> str:
+    """
+    Encode the rank and id of the last match of a page as an opaque cursor.
+    """
+    raw = f"{rank!r}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[Tuple[float, int]]:
+    """
+    Decode a cursor produced by encode_search_cursor.
+
+    Raises:
+        HTTPException: 400 if the cursor is malformed
+    """
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        rank, row_id = raw.rsplit("|", 1)
+        return float(rank), int(row_id)
+    except (ValueError, UnicodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def search_select(q: str, business_id: Optional[int] = None, cursor: Optional[str] = None) -> Select:
+    """
+    Select the reviews matching q, most relevant first, after the cursor.
+
+    Args:
+        q: Free-text search query
+        business_id: Only search the reviews of this business
+        cursor: Cursor from a previous page, or None for the first page
+    """
+    reviews = Review.__table__
+    snippet = func.snippet(_fts_match, 0, SNIPPET_START, SNIPPET_END, SNIPPET_ELLIPSIS, SNIPPET_TOKENS)
+
+    stmt = (
+        select(reviews, snippet.label("snippet"), _fts_rank.label("rank"))
+        .select_from(_fts.join(reviews, reviews.c.id == _fts.c.rowid))
+        .where(_fts_match.op("MATCH")(build_match_query(q)))
+    )
+    if business_id is not None:
+        stmt = stmt.where(reviews.c.business_id == business_id)
+
+    after = decode_search_cursor(cursor)
+    if after:
+        stmt = stmt.where(tuple_(_fts_rank, reviews.c.id) > tuple_(*after))
+    return stmt.order_by(_fts_rank, reviews.c.id)
+
+
+def search_page(rows: List, limit: int) -> Tuple[List, Optional[str]]:
+    """
+    Split limit + 1 fetched matches into a page and the next page's cursor.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_search_cursor(rows[-1].rank, rows[-1].id)
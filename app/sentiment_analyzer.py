@@ -4,9 +4,15 @@ Created by Data Science Team
 
 This module uses Hugging Face's transformers library to perform 
 sentiment analysis on text using a pre-trained DistilBERT model.
+The model runs on the inference backend selected by SENTIMENT_BACKEND
+(see app/inference_backends.py).
 """
 
-from transformers import pipeline
+import threading
+
+from app.config import SENTIMENT_BACKEND, SENTIMENT_BATCH_SIZE, SENTIMENT_MODEL, SENTIMENT_STUB
+# StubClassifier is re-exported here for existing callers
+from app.inference_backends import StubClassifier, create_backend
 
 
 class SentimentAnalyzer:
@@ -18,15 +24,24 @@ class SentimentAnalyzer:
     if one is not specified or already cached.
     """
 
-    def __init__(self):
+    def __init__(self, classifier=None, backend: str = None):
         """
         Initializes the SentimentAnalyzer by setting up the sentiment analysis pipeline.
         The pipeline automatically loads a suitable model for sentiment analysis.
+
+        Args:
+            classifier: Optional callable to use instead of creating a backend
+            backend: Inference backend name, defaults to SENTIMENT_BACKEND
+                     ("stub" when SENTIMENT_STUB is enabled)
         """
-        print("Initializing Sentiment Analysis pipeline...")
-        # This will automatically download a default model for sentiment analysis
-        # (e.g., distilbert-base-uncased-finetuned-sst-2-english) if not already present.
-        self.classifier = pipeline("sentiment-analysis")
+        if classifier is not None:
+            self.backend = "custom"
+            self.classifier = classifier
+            return
+
+        self.backend = backend or active_backend()
+        print(f"Initializing Sentiment Analysis pipeline ({self.backend} backend)...")
+        self.classifier = create_backend(self.backend)
         print("Sentiment Analysis pipeline initialized.")
 
     def analyze_sentiment(self, texts):
@@ -57,22 +72,50 @@ class SentimentAnalyzer:
             # If a single string is provided, wrap it in a list for consistent processing
             return self.classifier(texts)
         elif isinstance(texts, list):
-            # If a list of strings is provided, process all of them
-            return self.classifier(texts)
+            # If a list of strings is provided, run them through in padded batches
+            if not texts:
+                return []
+            batch_size = min(len(texts), SENTIMENT_BATCH_SIZE)
+            return self.classifier(texts, batch_size=batch_size, truncation=True)
         else:
             raise TypeError("Input 'texts' must be a string or a list of strings.")
 
 
-# Global instance - initialized once when module is imported
+def active_backend() -> str:
+    """
+    Name of the configured inference backend.
+    """
+    return "stub" if SENTIMENT_STUB else SENTIMENT_BACKEND
+
+
+def get_model_id() -> str:
+    """
+    Identifier of the model that produces sentiment results, without loading it.
+    Results cached under one identifier are never reused under another, so
+    each backend gets its own identifier.
+    """
+    backend = active_backend()
+    if backend == "stub":
+        return "stub"
+    if backend == "pytorch":
+        return SENTIMENT_MODEL
+    return f"{SENTIMENT_MODEL}+{backend}"
+
+
+# Global instance - created on first use (usually by the startup warmup)
 _sentiment_analyzer = None
+_sentiment_analyzer_lock = threading.Lock()
 
 
 def get_sentiment_analyzer():
     """
     Returns a singleton instance of SentimentAnalyzer.
-    This ensures the model is only loaded once.
+    This ensures the model is only loaded once, even when the warmup thread
+    and the first requests ask for it at the same time.
     """
     global _sentiment_analyzer
     if _sentiment_analyzer is None:
-        _sentiment_analyzer = SentimentAnalyzer()
+        with _sentiment_analyzer_lock:
+            if _sentiment_analyzer is None:
+                _sentiment_analyzer = SentimentAnalyzer()
     return _sentiment_analyzer
@@ -0,0 +1,254 @@
+"""
+Sentiment result cache.
+
+Templated reviews, spam and client retries send the same text through the model
+again and again. Results are cached under a hash of the normalized text plus the
+model identifier, first in a bounded in-process LRU and then in the persistent
+`sentiment_cache` table, which survives restarts and is shared by all workers.
+Because the model identifier is part of the key, switching models never serves
+results from the old one.
+"""
+
+import hashlib
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import List, Optional
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from app.config import SENTIMENT_CACHE_SIZE, SENTIMENT_CACHE_PERSISTENT
+from app.database import engine, read_engine
+from app.metrics import register_cache_metrics
+from app.models import SentimentCacheEntry
+from app.sentiment_analyzer import get_model_id
+
+# Only real classifier labels are cached, never the NEUTRAL fallback
+CACHEABLE_LABELS = {"POSITIVE", "NEGATIVE"}
+
+# Stay well below SQLite's bound parameter limit
+_LOOKUP_CHUNK_SIZE = 500
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize review text so trivially different copies share a cache entry.
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return _WHITESPACE.sub(" ", text).strip().casefold()
+
+
+def text_hash(text: str) -> str:
+    """
+    SHA-256 hex digest of the normalized text.
+    """
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-tier cache of raw classifier results ({'label', 'score'} dictionaries).
+    """
+
+    def __init__(self, model_id: str, max_size: int = SENTIMENT_CACHE_SIZE,
+                 persistent: bool = SENTIMENT_CACHE_PERSISTENT, bind=engine, read_bind=read_engine):
+        """
+        Args:
+            model_id: Identifier of the model whose results are cached
+            max_size: Maximum number of entries in the in-process LRU
+            persistent: Whether to read and write the sentiment_cache table
+            bind: Engine used to write the sentiment_cache table
+            read_bind: Engine used to read it
+        """
+        self.model_id = model_id
+        self.max_size = max_size
+        self.persistent = persistent
+        self.bind = bind
+        self.read_bind = read_bind
+        self.memory_hits = 0
+        self.persistent_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text: str) -> Optional[dict]:
+        """
+        Look up the cached result for a text.
+
+        Returns:
+            The cached {'label', 'score'} dictionary, or None on a miss
+        """
+        return self.get_many([text])[0]
+
+    def get_many(self, texts: List[str]) -> List[Optional[dict]]:
+        """
+        Look up cached results for several texts.
+
+        Returns:
+            One result or None per text, in order
+        """
+        keys = [text_hash(text) for text in texts]
+        results = [None] * len(texts)
+        missing = {}
+
+        with self._lock:
+            for index, key in enumerate(keys):
+                result = self._entries.get(key)
+                if result is not None:
+                    self._entries.move_to_end(key)
+                    results[index] = result
+                    self.memory_hits += 1
+                else:
+                    missing.setdefault(key, []).append(index)
+
+        if missing and self.persistent:
+            found = self._load(list(missing))
+            with self._lock:
+                for key, result in found.items():
+                    self._remember(key, result)
+                    for index in missing.pop(key):
+                        results[index] = result
+                        self.persistent_hits += 1
+
+        with self._lock:
+            self.misses += sum(len(indexes) for indexes in missing.values())
+        return results
+
+    def put(self, text: str, result: dict):
+        """
+        Store the classifier result for a text.
+        """
+        self.put_many([text], [result])
+
+    def put_many(self, texts: List[str], results: List[dict]):
+        """
+        Store classifier results for several texts. Fallback results are skipped.
+        """
+        entries = {
+            text_hash(text): {"label": result["label"], "score": float(result["score"])}
+            for text, result in zip(texts, results)
+            if result and result.get("label") in CACHEABLE_LABELS
+        }
+        if not entries:
+            return
+
+        with self._lock:
+            for key, result in entries.items():
+                self._remember(key, result)
+
+        if self.persistent:
+            self._store(entries)
+
+    def stats(self) -> dict:
+        """
+        Hit and miss counters since startup.
+        """
+        hits = self.memory_hits + self.persistent_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "persistent_hits": self.persistent_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": len(self._entries),
+        }
+
+    def clear(self):
+        """
+        Drop the in-process entries and reset the counters.
+        """
+        with self._lock:
+            self._entries.clear()
+            self.memory_hits = self.persistent_hits = self.misses = 0
+
+    def purge_other_models(self) -> int:
+        """
+        Delete persistent entries produced by any model other than the current one.
+
+        Returns:
+            Number of rows deleted
+        """
+        if not self.persistent:
+            return 0
+        with self.bind.begin() as conn:
+            result = conn.execute(
+                delete(SentimentCacheEntry).where(SentimentCacheEntry.model_id != self.model_id)
+            )
+        return result.rowcount
+
+    def _remember(self, key: str, result: dict):
+        # Caller holds the lock
+        self._entries[key] = result
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> dict:
+        found = {}
+        try:
+            with self.read_bind.connect() as conn:
+                for start in range(0, len(keys), _LOOKUP_CHUNK_SIZE):
+                    rows = conn.execute(
+                        select(
+                            SentimentCacheEntry.text_hash,
+                            SentimentCacheEntry.label,
+                            SentimentCacheEntry.score
+                        ).where(
+                            SentimentCacheEntry.model_id == self.model_id,
+                            SentimentCacheEntry.text_hash.in_(keys[start:start + _LOOKUP_CHUNK_SIZE])
+                        )
+                    )
+                    for key, label, score in rows:
+                        found[key] = {"label": label, "score": score}
+        except Exception as e:
+            print(f"Error reading sentiment cache: {str(e)}")
+        return found
+
+    def _store(self, entries: dict):
+        rows = [
+            {"text_hash": key, "model_id": self.model_id, "label": result["label"], "score": result["score"]}
+            for key, result in entries.items()
+        ]
+        try:
+            with self.bind.begin() as conn:
+                conn.execute(sqlite_insert(SentimentCacheEntry).on_conflict_do_nothing(), rows)
+        except Exception as e:
+            print(f"Error writing sentiment cache: {str(e)}")
+
+
+# Global instance - created on first use
+_sentiment_cache = None
+_sentiment_cache_lock = threading.Lock()
+
+
+def get_sentiment_cache():
+    """
+    Returns a singleton SentimentCache for the configured model.
+    """
+    global _sentiment_cache
+    if _sentiment_cache is None:
+        with _sentiment_cache_lock:
+            if _sentiment_cache is None:
+                _sentiment_cache = SentimentCache(get_model_id())
+    return _sentiment_cache
+
+
+def _cache_metrics():
+    if _sentiment_cache is None:
+        return None
+    stats = _sentiment_cache.stats()
+    return {
+        "lookups": {
+            "memory_hit": stats["memory_hits"],
+            "persistent_hit": stats["persistent_hits"],
+            "miss": stats["misses"]
+        },
+        "hit_ratio": stats["hit_ratio"]
+    }
+
+
+register_cache_metrics("sentiment", _cache_metrics)
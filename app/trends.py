@@ -0,0 +1,183 @@
+"""
+Daily vibe rollups and trends.
+
+business_daily_vibe keeps one row per business and day with the number of
+reviews created that day (UTC), how many of them are scored, the sum of their
+vibe scores and their positive and negative counts. Review writes apply their
+changes to it in the same transaction, like the business aggregates and
+keyword counts.
+
+A trend reads the daily rows of one business in a date range, a primary key
+range scan of at most one row per day, and rolls them up into days, weeks
+(starting on Monday) or months. The cost does not depend on how many reviews
+the business has.
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import groupby
+from typing import Iterable, List, Optional
+
+from sqlalchemy import case, delete, func, insert, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from app.models import BusinessDailyVibe, Review
+
+GRANULARITIES = ("day", "week", "month")
+
+_COUNTERS = ("review_count", "scored_reviews", "vibe_score_sum", "positive_reviews", "negative_reviews")
+
+
+def add_daily_vibe_deltas(
+    deltas: dict,
+    business_id: int,
+    created_at: datetime,
+    vibe_score: Optional[float],
+    sentiment: Optional[str],
+    sign: int = 1,
+    count_review: bool = True
+):
+    """
+    Count one review towards a pending daily rollup update.
+
+    Args:
+        deltas: Dict of (business_id, day) -> {counter: change}, updated in place
+        business_id: ID of the business
+        created_at: When the review was created; picks the day
+        vibe_score: The review's vibe score, None while it is pending
+        sentiment: The review's sentiment label
+        sign: 1 when the review is added or scored, -1 when it is deleted
+        count_review: False when an existing review is only being scored
+    """
+    row = deltas.setdefault((business_id, created_at.date()), dict.fromkeys(_COUNTERS, 0))
+    if count_review:
+        row["review_count"] += sign
+    if vibe_score is not None:
+        row["scored_reviews"] += sign
+        row["vibe_score_sum"] += sign * vibe_score
+    if sentiment == "POSITIVE":
+        row["positive_reviews"] += sign
+    elif sentiment == "NEGATIVE":
+        row["negative_reviews"] += sign
+
+
+def update_daily_vibe(deltas: dict, db: Session):
+    """
+    Apply daily rollup changes with one upsert, without committing.
+    Days left without reviews are removed.
+
+    Args:
+        deltas: Dict of (business_id, day) -> {counter: change}
+        db: Database session
+    """
+    rows = [
+        {"business_id": business_id, "day": day, **changes}
+        for (business_id, day), changes in deltas.items() if any(changes.values())
+    ]
+    if not rows:
+        return
+
+    stmt = sqlite_insert(BusinessDailyVibe)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["business_id", "day"],
+            set_={name: getattr(BusinessDailyVibe, name) + stmt.excluded[name] for name in _COUNTERS}
+        ),
+        rows
+    )
+
+    shrunk = {row["business_id"] for row in rows if row["review_count"] < 0}
+    if shrunk:
+        db.execute(
+            delete(BusinessDailyVibe)
+            .where(BusinessDailyVibe.business_id.in_(shrunk), BusinessDailyVibe.review_count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def rebuild_daily_vibe(business_ids: Iterable[int], db: Session):
+    """
+    Recompute the daily rollups of some businesses from their reviews, without committing.
+    Used by the backfill and after offline rescoring, not on the request path.
+
+    Args:
+        business_ids: IDs of the businesses to rebuild
+        db: Database session
+    """
+    business_ids = list(business_ids)
+    db.execute(
+        delete(BusinessDailyVibe)
+        .where(BusinessDailyVibe.business_id.in_(business_ids))
+        .execution_options(synchronize_session=False)
+    )
+    day = func.date(Review.created_at)
+    db.execute(
+        insert(BusinessDailyVibe).from_select(
+            ["business_id", "day", *_COUNTERS],
+            select(
+                Review.business_id,
+                day,
+                func.count(Review.id),
+                func.count(Review.vibe_score),
+                func.coalesce(func.sum(Review.vibe_score), 0.0),
+                func.sum(case((Review.sentiment == "POSITIVE", 1), else_=0)),
+                func.sum(case((Review.sentiment == "NEGATIVE", 1), else_=0))
+            )
+            .where(Review.business_id.in_(business_ids))
+            .group_by(Review.business_id, day)
+        )
+    )
+
+
+def period_start(day: date, granularity: str) -> date:
+    """
+    First day of the day, week (Monday) or month that contains a day.
+    """
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "month":
+        return day.replace(day=1)
+    return day
+
+
+def business_trend(db: Session, business_id: int, start: date, end: date, granularity: str) -> List[dict]:
+    """
+    Vibe of a business per day, week or month between two days (inclusive).
+    Periods without reviews are left out.
+
+    Args:
+        db: Database session
+        business_id: ID of the business
+        start: First day
+        end: Last day
+        granularity: "day", "week" or "month"
+
+    Returns:
+        One dict per period, in order, shaped like TrendPoint
+    """
+    rows = db.execute(
+        select(BusinessDailyVibe)
+        .where(
+            BusinessDailyVibe.business_id == business_id,
+            BusinessDailyVibe.day >= start,
+            BusinessDailyVibe.day <= end
+        )
+        .order_by(BusinessDailyVibe.day)
+    ).scalars()
+
+    trend = []
+    for period, days in groupby(rows, key=lambda row: period_start(row.day, granularity)):
+        totals = dict.fromkeys(_COUNTERS, 0)
+        for row in days:
+            for name in _COUNTERS:
+                totals[name] += getattr(row, name)
+        scored = totals["scored_reviews"]
+        trend.append({
+            "period_start": period,
+            "review_count": totals["review_count"],
+            "scored_reviews": scored,
+            "positive_reviews": totals["positive_reviews"],
+            "negative_reviews": totals["negative_reviews"],
+            "vibe_score": round(totals["vibe_score_sum"] / scored, 2) if scored else None
+        })
+    return trend
@@ -1,13 +1,31 @@
+from collections import Counter
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import Session
-from app.models import Business, Review
+from typing import List, Optional
+from app.models import Business, BusinessKeywordCount, Review, PENDING_SENTIMENT
 from app.sentiment_analyzer import get_sentiment_analyzer
-import re
+from app.batching import get_sentiment_batcher
+from app.sentiment_cache import get_sentiment_cache
+from app.inference_sidecar import get_sidecar_client
+from app.keywords import (
+    extract_keywords_batch, split_keywords, add_document_frequency_deltas, update_document_frequencies,
+    ANALYSIS_ERROR_KEYWORDS
+)
+from app.response_cache import mark_businesses_changed, mark_categories_changed
+from app.leaderboard import weighted_vibe_score
+from app.metrics import observe_stage, timed_stage
+from app.trends import add_daily_vibe_deltas, update_daily_vibe
+from app.config import (
+    SENTIMENT_BATCHING, SENTIMENT_CACHE_ENABLED, MIN_REVIEW_LENGTH, SCORING_MODE, INFERENCE_MODE
+)
 
 
+@timed_stage("keywords")
 def extract_keywords(text: str, max_keywords: int = 5) -> str:
     """
     Extract important keywords from review text.
-    Simple implementation using word frequency and filtering.
+    See app/keywords.py for the engine and the batch API.
     
     Args:
         text: The review text
@@ -16,40 +34,86 @@ def extract_keywords(text: str, max_keywords: int = 5) -> str:
     Returns:
         Comma-separated string of keywords
     """
-    # Convert to lowercase and remove special characters
-    text = text.lower()
-    text = re.sub(r'[^\w\s]', '', text)
-    
-    # Common words to ignore (stop words)
-    stop_words = {
-        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your',
-        'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she',
-        'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their',
-        'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that',
-        'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
-        'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an',
-        'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of',
-        'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through',
-        'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down',
-        'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then',
-        'once', 'very', 'can', 'will', 'just', 'should', 'now'
+    return extract_keywords_batch([text], max_keywords)[0]
+
+
+def _build_sentiment_result(review_text: str, result: dict, review_keywords: str = None) -> dict:
+    """
+    Transform a raw classifier result into the VibeCheck sentiment fields.
+    """
+    # Extract keywords from the review, unless the caller already did in a batch
+    if review_keywords is None:
+        review_keywords = extract_keywords(review_text)
+    
+    return {
+        "vibe_score": vibe_score_from_result(result),
+        "sentiment": result['label'],
+        "keywords": review_keywords
     }
+
+
+def vibe_score_from_result(result: dict) -> float:
+    """
+    Transform a raw classifier result into a vibe score (0-100).
+    """
+    label = result['label']  # "POSITIVE" or "NEGATIVE"
+    confidence = result['score']  # 0.0 to 1.0
     
-    # Split into words and filter
-    words = [word for word in text.split() if word not in stop_words and len(word) > 3]
+    # Transform confidence score to vibe score (0-100)
+    if label == "POSITIVE":
+        vibe_score = confidence * 100
+    else:  # NEGATIVE
+        vibe_score = (1 - confidence) * 100
     
-    # Count word frequency
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+    return round(vibe_score, 2)
+
+
+def _fallback_sentiment_result() -> dict:
+    """
+    Neutral values used when sentiment analysis fails.
+    """
+    return {
+        "vibe_score": 50.0,
+        "sentiment": "NEUTRAL",
+        "keywords": ANALYSIS_ERROR_KEYWORDS
+    }
+
+
+def pending_sentiment_result() -> dict:
+    """
+    Placeholder values for a review left to the background scoring workers.
+    """
+    return {
+        "vibe_score": None,
+        "sentiment": PENDING_SENTIMENT,
+        "keywords": None
+    }
+
+
+@timed_stage("inference")
+def classify_texts(texts: List[str]) -> List[dict]:
+    """
+    Run texts through the sentiment model, on the shared sidecar when configured
+    and reachable, otherwise in this process.
     
-    # Sort by frequency and get top keywords
-    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-    keywords = [word for word, freq in sorted_words[:max_keywords]]
+    Args:
+        texts: The texts to classify
+        
+    Returns:
+        One raw {'label', 'score'} classifier result per text
+    """
+    if INFERENCE_MODE == "sidecar":
+        results = get_sidecar_client().analyze_many(texts)
+        if results is not None:
+            return results
     
-    return ", ".join(keywords) if keywords else "general feedback"
+    # Share a batch with concurrent requests when enabled
+    if len(texts) == 1 and SENTIMENT_BATCHING:
+        return [get_sentiment_batcher().analyze(texts[0])]
+    return get_sentiment_analyzer().analyze_sentiment(texts)
 
 
+@timed_stage("sentiment")
 def analyze_review_sentiment(review_text: str) -> dict:
     """
     Analyze review sentiment using DS team's sentiment analyzer.
@@ -65,38 +129,68 @@ def analyze_review_sentiment(review_text: str) -> dict:
         - keywords (str): Comma-separated keywords
     """
     try:
-        # Get sentiment analyzer instance
-        analyzer = get_sentiment_analyzer()
+        cache = get_sentiment_cache() if SENTIMENT_CACHE_ENABLED else None
+        result = cache.get(review_text) if cache else None
         
-        # Analyze the review
-        result = analyzer.analyze_sentiment(review_text)[0]
+        if result is None:
+            result = classify_texts([review_text])[0]
+            if cache:
+                cache.put(review_text, result)
         
-        label = result['label']  # "POSITIVE" or "NEGATIVE"
-        confidence = result['score']  # 0.0 to 1.0
+        return _build_sentiment_result(review_text, result)
+    
+    except Exception as e:
+        print(f"Error in sentiment analysis: {str(e)}")
+        # Return neutral values if analysis fails
+        return _fallback_sentiment_result()
+
+
+@timed_stage("sentiment_batch")
+def analyze_reviews_sentiment(review_texts: List[str], stored: bool = False, fallback: bool = True) -> List[dict]:
+    """
+    Analyze several reviews with one batched call to the sentiment analyzer.
+    
+    Args:
+        review_texts: The review contents to analyze
+        stored: Whether the reviews are already stored (see extract_keywords_batch)
+        fallback: Return neutral results if analysis fails. With False the error
+                  is raised, so callers that can retry later do not store them.
         
-        # Transform confidence score to vibe score (0-100)
-        if label == "POSITIVE":
-            vibe_score = confidence * 100
-        else:  # NEGATIVE
-            vibe_score = (1 - confidence) * 100
+    Returns:
+        One dictionary per review, in the same format as analyze_review_sentiment
+    """
+    if not review_texts:
+        return []
+    
+    try:
+        cache = get_sentiment_cache() if SENTIMENT_CACHE_ENABLED else None
+        results = cache.get_many(review_texts) if cache else [None] * len(review_texts)
         
-        # Extract keywords from the review
-        keywords = extract_keywords(review_text)
+        # Score each distinct uncached text once
+        misses = list(dict.fromkeys(
+            text for text, result in zip(review_texts, results) if result is None
+        ))
+        if misses:
+            scored = dict(zip(misses, classify_texts(misses)))
+            if cache:
+                cache.put_many(misses, [scored[text] for text in misses])
+            results = [
+                result if result is not None else scored[text]
+                for text, result in zip(review_texts, results)
+            ]
         
-        return {
-            "vibe_score": round(vibe_score, 2),
-            "sentiment": label,
-            "keywords": keywords
-        }
+        with observe_stage("keywords"):
+            review_keywords = extract_keywords_batch(review_texts, stored=stored)
+        return [
+            _build_sentiment_result(text, result, keywords)
+            for text, result, keywords in zip(review_texts, results, review_keywords)
+        ]
     
     except Exception as e:
-        print(f"Error in sentiment analysis: {str(e)}")
-        # Return neutral values if analysis fails
-        return {
-            "vibe_score": 50.0,
-            "sentiment": "NEUTRAL",
-            "keywords": "error in analysis"
-        }
+        if not fallback:
+            raise
+        print(f"Error in batch sentiment analysis: {str(e)}")
+        return [_fallback_sentiment_result() for _ in review_texts]
 
 
 def calculate_vibe_score(business_id: int, db: Session) -> float:
@@ -126,17 +220,300 @@ def calculate_vibe_score(business_id: int, db: Session) -> float:
     return round(avg_score, 2)
 
 
-def update_business_vibe_score(business_id: int, db: Session):
+@timed_stage("aggregate_update")
+def update_business_vibe_score(
+    business_id: int,
+    db: Session,
+    score_delta: float = 0.0,
+    scored_delta: int = 0,
+    review_delta: int = 0
+):
     """
-    Update the aggregated Vibe Score and total review count for a business.
+    Apply a change to the running vibe aggregates of a business.
+    
+    The running score sum, scored review count and total review count are
+    adjusted with a single UPDATE, which also recomputes the mean and the
+    weighted score that leaderboards rank by, so the cost does not depend on
+    how many reviews the business has. The caller is responsible for committing
+    the session, so the change lands in the same transaction as the review
+    write; cached responses for the business and its category's leaderboards
+    are invalidated on commit.
     
     Args:
         business_id: ID of the business
         db: Database session
+        score_delta: Change in the sum of review vibe scores
+        scored_delta: Change in the number of reviews that have a vibe score
+        review_delta: Change in the total number of reviews
     """
-    business = db.query(Business).filter(Business.id == business_id).first()
+    new_sum = Business.vibe_score_sum + score_delta
+    new_count = Business.scored_reviews + scored_delta
+    category = db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(
+            vibe_score_sum=new_sum,
+            scored_reviews=new_count,
+            total_reviews=Business.total_reviews + review_delta,
+            aggregated_vibe_score=case(
+                (new_count > 0, func.round(new_sum / new_count, 2)),
+                else_=0.0
+            ),
+            weighted_score=case(
+                (new_count > 0, func.round(weighted_vibe_score(new_sum, new_count), 2)),
+                else_=None
+            )
+        )
+        .returning(Business.category)
+        .execution_options(synchronize_session="fetch")
+    ).scalar_one_or_none()
+    mark_businesses_changed(db, [business_id])
+    if category is not None:
+        mark_categories_changed(db, [category])
+
+
+def apply_review_score_change(
+    business_id: int,
+    db: Session,
+    old_score: Optional[float] = None,
+    new_score: Optional[float] = None,
+    review_delta: int = 0
+):
+    """
+    Update business aggregates for a single review being added, rescored or deleted.
+    
+    Args:
+        business_id: ID of the business
+        db: Database session
+        old_score: Previous vibe score of the review (None if new or unscored)
+        new_score: New vibe score of the review (None if deleted or unscored)
+        review_delta: 1 for an insert, -1 for a delete, 0 for a rescore
+    """
+    score_delta = (new_score or 0.0) - (old_score or 0.0)
+    scored_delta = (new_score is not None) - (old_score is not None)
+    update_business_vibe_score(business_id, db, score_delta, scored_delta, review_delta)
+
+
+def recalculate_business_vibe_score(business_id: int, db: Session):
+    """
+    Rebuild the vibe aggregates of a business from its reviews with a full scan.
+    Used to repair drift and after offline rescoring, not on the request path.
+    
+    Args:
+        business_id: ID of the business
+        db: Database session
+    """
+    score_sum, scored, total = db.execute(
+        select(
+            func.coalesce(func.sum(Review.vibe_score), 0.0),
+            func.count(Review.vibe_score),
+            func.count(Review.id)
+        ).where(Review.business_id == business_id)
+    ).one()
+    
+    category = db.execute(
+        update(Business)
+        .where(Business.id == business_id)
+        .values(
+            vibe_score_sum=score_sum,
+            scored_reviews=scored,
+            total_reviews=total,
+            aggregated_vibe_score=round(score_sum / scored, 2) if scored else 0.0,
+            weighted_score=round(weighted_vibe_score(score_sum, scored), 2) if scored else None
+        )
+        .returning(Business.category)
+        .execution_options(synchronize_session="fetch")
+    ).scalar_one_or_none()
+    mark_businesses_changed(db, [business_id])
+    if category is not None:
+        mark_categories_changed(db, [category])
+
+
+def add_keyword_deltas(deltas: Counter, business_id: int, keywords: Optional[str], sign: int = 1):
+    """
+    Count the keywords of one review towards a pending keyword count update.
+    
+    Args:
+        deltas: Counter of (business_id, keyword) -> change, updated in place
+        business_id: ID of the business
+        keywords: The review's stored keywords string
+        sign: 1 when the review is added or scored, -1 when it is deleted
+    """
+    for keyword in split_keywords(keywords):
+        deltas[(business_id, keyword)] += sign
+
+
+@timed_stage("keyword_counts")
+def update_keyword_counts(deltas: Counter, db: Session):
+    """
+    Apply keyword count changes with one upsert, without committing.
+    
+    The caller commits, so the counts land in the same transaction as the
+    review writes they describe. Keywords whose count drops to zero are removed.
+    
+    Args:
+        deltas: Counter of (business_id, keyword) -> change
+        db: Database session
+    """
+    rows = [
+        {"business_id": business_id, "keyword": keyword, "count": delta}
+        for (business_id, keyword), delta in deltas.items() if delta
+    ]
+    if not rows:
+        return
+    
+    stmt = sqlite_insert(BusinessKeywordCount)
+    db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["business_id", "keyword"],
+            set_={"count": BusinessKeywordCount.count + stmt.excluded["count"]}
+        ),
+        rows
+    )
+    
+    shrunk = {row["business_id"] for row in rows if row["count"] < 0}
+    if shrunk:
+        db.execute(
+            delete(BusinessKeywordCount)
+            .where(BusinessKeywordCount.business_id.in_(shrunk), BusinessKeywordCount.count <= 0)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def add_review(
+    business_id: int,
+    user_id: int,
+    content: str,
+    sentiment_result: dict,
+    db: Session
+) -> Review:
+    """
+    Insert a review and apply it to the business aggregates, without committing.
+    
+    Args:
+        business_id: ID of the business
+        user_id: ID of the author
+        content: Review text
+        sentiment_result: Output of analyze_review_sentiment or pending_sentiment_result
+        db: Database session
+        
+    Returns:
+        The new (flushed) review
+    """
+    new_review = Review(
+        user_id=user_id,
+        business_id=business_id,
+        content=content,
+        vibe_score=sentiment_result.get("vibe_score"),
+        sentiment=sentiment_result.get("sentiment"),
+        keywords=sentiment_result.get("keywords")
+    )
+    
+    db.add(new_review)
+    db.flush()
+    
+    # Update the aggregates, keyword counts, document frequencies and daily rollup in the same transaction
+    apply_review_score_change(business_id, db, new_score=new_review.vibe_score, review_delta=1)
+    keyword_deltas = Counter()
+    add_keyword_deltas(keyword_deltas, business_id, new_review.keywords)
+    update_keyword_counts(keyword_deltas, db)
+    document_deltas = Counter()
+    add_document_frequency_deltas(document_deltas, content)
+    update_document_frequencies(document_deltas, db)
+    daily_deltas = {}
+    add_daily_vibe_deltas(daily_deltas, business_id, new_review.created_at, new_review.vibe_score,
+                          new_review.sentiment)
+    update_daily_vibe(daily_deltas, db)
+    return new_review
+
+
+def create_reviews_bulk(items: List[dict], db: Session, read_db: Optional[Session] = None) -> List[dict]:
+    """
+    Validate, score and insert many reviews in a single transaction.
+    
+    Businesses are checked with one query, all valid texts are scored with one
+    batched analyzer call, rows are written with one bulk insert, and every
+    touched business aggregate is recomputed exactly once. In async scoring
+    mode the reviews are stored as pending instead of being scored.
+    
+    Args:
+        items: Dictionaries with business_id, user_id and content; user_id
+               comes from a verified access token, so it is not looked up
+        db: Database session used for the writes
+        read_db: Session used for validation, so the writer is only held for
+                 the insert itself (defaults to db)
+        
+    Returns:
+        One result per item, in order, with index, success, and either the
+        created review or an error message
+    """
+    read_db = read_db or db
+    business_ids = {item["business_id"] for item in items}
+    known_businesses = set(read_db.scalars(select(Business.id).where(Business.id.in_(business_ids))))
+    
+    results = [{"index": index, "success": False} for index in range(len(items))]
+    valid = []
+    for index, item in enumerate(items):
+        if item["business_id"] not in known_businesses:
+            results[index]["error"] = "Business not found"
+        elif len(item["content"]) < MIN_REVIEW_LENGTH:
+            results[index]["error"] = f"Review content must be at least {MIN_REVIEW_LENGTH} characters"
+        else:
+            valid.append(index)
+    
+    if not valid:
+        return results
+    
+    if SCORING_MODE == "async":
+        sentiment_results = [pending_sentiment_result() for _ in valid]
+    else:
+        sentiment_results = analyze_reviews_sentiment([items[index]["content"] for index in valid])
+    rows = [
+        {
+            "user_id": items[index]["user_id"],
+            "business_id": items[index]["business_id"],
+            "content": items[index]["content"],
+            "vibe_score": sentiment_result.get("vibe_score"),
+            "sentiment": sentiment_result.get("sentiment"),
+            "keywords": sentiment_result.get("keywords"),
+        }
+        for index, sentiment_result in zip(valid, sentiment_results)
+    ]
+    
+    try:
+        created = db.execute(
+            insert(Review).returning(Review.id, Review.created_at, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        # One aggregate update per touched business
+        deltas = {}
+        keyword_deltas = Counter()
+        document_deltas = Counter()
+        daily_deltas = {}
+        for row, (_, created_at) in zip(rows, created):
+            add_keyword_deltas(keyword_deltas, row["business_id"], row["keywords"])
+            add_document_frequency_deltas(document_deltas, row["content"])
+            add_daily_vibe_deltas(daily_deltas, row["business_id"], created_at, row["vibe_score"], row["sentiment"])
+            score_delta, scored_delta, review_delta = deltas.get(row["business_id"], (0.0, 0, 0))
+            if row["vibe_score"] is not None:
+                score_delta += row["vibe_score"]
+                scored_delta += 1
+            deltas[row["business_id"]] = (score_delta, scored_delta, review_delta + 1)
+        for business_id, (score_delta, scored_delta, review_delta) in deltas.items():
+            update_business_vibe_score(business_id, db, score_delta, scored_delta, review_delta)
+        update_keyword_counts(keyword_deltas, db)
+        update_document_frequencies(document_deltas, db)
+        update_daily_vibe(daily_deltas, db)
+        with observe_stage("commit"):
+            db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    
+    # Build the responses from the returned keys rather than reloading each row
+    for index, row, (review_id, created_at) in zip(valid, rows, created):
+        results[index]["success"] = True
+        results[index]["review"] = {**row, "id": review_id, "created_at": created_at}
     
-    if business:
-        business.aggregated_vibe_score = calculate_vibe_score(business_id, db)
-        business.total_reviews = db.query(Review).filter(Review.business_id == business_id).count()
-        db.commit()
+    return results
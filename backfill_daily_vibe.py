@@ -0,0 +1,78 @@
+"""
+Daily Vibe Rollup Backfill for VibeCheck Business
+Rebuilds the business_daily_vibe table from the reviews. Run it once after the
+migration that adds the table, or at any time to repair drift.
+
+Usage:
+    python backfill_daily_vibe.py [--chunk-size 100]
+
+Businesses are rebuilt in id-ordered chunks, one transaction per chunk, so
+review writes only wait for the chunk being rebuilt. Each chunk is grouped by
+day from the (business_id, created_at) review index.
+"""
+
+import argparse
+import sys
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import Business, BusinessDailyVibe
+from app.trends import rebuild_daily_vibe
+
+
+def backfill_daily_vibe(chunk_size: int) -> bool:
+    """
+    Rebuild the daily rollups of all businesses in chunks.
+
+    Returns:
+        True if every chunk was rebuilt
+    """
+    db: Session = SessionLocal()
+    start = time.perf_counter()
+
+    try:
+        last_id = 0
+        businesses = 0
+        while True:
+            chunk = db.scalars(
+                select(Business.id).where(Business.id > last_id).order_by(Business.id).limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+
+            rebuild_daily_vibe(chunk, db)
+            db.commit()
+
+            last_id = chunk[-1]
+            businesses += len(chunk)
+            print(f"  rebuilt {businesses} businesses (up to id {last_id})")
+
+        days = db.scalar(select(func.count()).select_from(BusinessDailyVibe))
+        print(f"✓ Rebuilt {days} daily rollups for {businesses} businesses "
+              f"in {time.perf_counter() - start:.1f}s.")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error occurred: {str(e)}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-business daily vibe rollups from the reviews")
+    parser.add_argument("--chunk-size", type=int, default=100, help="Businesses rebuilt per transaction")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Daily Vibe Rollup Backfill")
+    print("=" * 60)
+    print()
+    ok = backfill_daily_vibe(args.chunk_size)
+    print()
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,93 @@
+"""
+Document Frequency Backfill for VibeCheck Business
+Rebuilds the keyword_document_frequencies table that tfidf keyword mode scores
+against, from the content of every review. Run it with KEYWORD_MODE=tfidf
+after switching to that mode, or at any time to repair drift.
+
+Usage:
+    KEYWORD_MODE=tfidf python backfill_document_frequencies.py [--chunk-size 5000]
+
+The rebuild runs in a single transaction, so concurrent review writes wait for
+it and are never counted twice or lost. Keywords already stored on reviews are
+not re-extracted.
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import KEYWORD_MODE
+from app.database import SessionLocal
+from app.keywords import add_document_frequency_deltas, update_document_frequencies
+from app.models import KeywordDocumentFrequency, Review
+
+
+def backfill_document_frequencies(chunk_size: int) -> bool:
+    """
+    Recount the words of all reviews in id-ordered chunks.
+
+    Returns:
+        True if the document frequencies were rebuilt
+    """
+    if KEYWORD_MODE != "tfidf":
+        print(f"✗ KEYWORD_MODE is '{KEYWORD_MODE}'; document frequencies are only kept in tfidf mode.")
+        return False
+
+    db: Session = SessionLocal()
+    start = time.perf_counter()
+
+    try:
+        db.execute(delete(KeywordDocumentFrequency))
+
+        last_id = 0
+        reviews = 0
+        while True:
+            chunk = db.execute(
+                select(Review.id, Review.content)
+                .where(Review.id > last_id)
+                .order_by(Review.id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+
+            deltas = Counter()
+            for row in chunk:
+                add_document_frequency_deltas(deltas, row.content)
+            update_document_frequencies(deltas, db)
+
+            last_id = chunk[-1].id
+            reviews += len(chunk)
+            print(f"  counted {reviews} reviews (up to id {last_id})")
+
+        db.commit()
+        words = db.scalar(select(func.count()).select_from(KeywordDocumentFrequency))
+        print(f"✓ Rebuilt the document frequencies of {words - 1 if reviews else 0} words from {reviews} reviews "
+              f"in {time.perf_counter() - start:.1f}s.")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error occurred: {str(e)}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild keyword document frequencies from the reviews")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Reviews read per query")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Document Frequency Backfill")
+    print("=" * 60)
+    print()
+    ok = backfill_document_frequencies(args.chunk_size)
+    print()
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,87 @@
+"""
+Keyword Count Backfill for VibeCheck Business
+Rebuilds the business_keyword_counts table from the keywords stored on every
+review. Run it once after the migration that adds the table, or at any time
+to repair drift.
+
+Usage:
+    python backfill_keyword_counts.py [--chunk-size 5000]
+
+The rebuild runs in a single transaction, so concurrent review writes wait for
+it and are never counted twice or lost.
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter
+
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.models import BusinessKeywordCount, Review
+from app.utils import add_keyword_deltas, update_keyword_counts
+
+
+def backfill_keyword_counts(chunk_size: int) -> bool:
+    """
+    Recount the keywords of all reviews in id-ordered chunks.
+
+    Returns:
+        True if the counts were rebuilt
+    """
+    db: Session = SessionLocal()
+    start = time.perf_counter()
+
+    try:
+        db.execute(delete(BusinessKeywordCount))
+
+        last_id = 0
+        reviews = 0
+        while True:
+            chunk = db.execute(
+                select(Review.id, Review.business_id, Review.keywords)
+                .where(Review.id > last_id)
+                .order_by(Review.id)
+                .limit(chunk_size)
+            ).all()
+            if not chunk:
+                break
+
+            deltas = Counter()
+            for row in chunk:
+                add_keyword_deltas(deltas, row.business_id, row.keywords)
+            update_keyword_counts(deltas, db)
+
+            last_id = chunk[-1].id
+            reviews += len(chunk)
+            print(f"  counted {reviews} reviews (up to id {last_id})")
+
+        db.commit()
+        keywords = db.scalar(select(func.count()).select_from(BusinessKeywordCount))
+        print(f"✓ Rebuilt {keywords} keyword counts from {reviews} reviews "
+              f"in {time.perf_counter() - start:.1f}s.")
+        return True
+
+    except Exception as e:
+        print(f"\n✗ Error occurred: {str(e)}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild per-business keyword counts from the reviews")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="Reviews read per query")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Keyword Count Backfill")
+    print("=" * 60)
+    print()
+    ok = backfill_keyword_counts(args.chunk_size)
+    print()
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,140 @@
+"""
+Inference Backend Benchmark
+Checks each inference backend's accuracy against the fp32 PyTorch pipeline and
+compares single-review latency and batched throughput. Backends whose libraries
+or artifacts are missing are reported and skipped.
+
+Usage:
+    python -m benchmarks.bench_backends [--backends pytorch quantized onnx]
+        [--runs 50] [--batch-size 16] [--max-score-diff 0.05]
+
+Build the artifacts first with: python download_model.py --backend all
+Exits with status 1 if a backend disagrees with pytorch on any label or its
+scores drift further than --max-score-diff.
+"""
+
+import argparse
+import sys
+import time
+
+from app.inference_backends import BACKENDS, create_backend
+
+# Short labelled reviews covering clear, mixed and negated sentiment
+SAMPLES = [
+    ("Great coffee and friendly staff, will come back!", "POSITIVE"),
+    ("The pastries were fresh and the service was quick.", "POSITIVE"),
+    ("Absolutely loved the atmosphere, best brunch in town.", "POSITIVE"),
+    ("Not bad at all, the burger was juicy and well priced.", "POSITIVE"),
+    ("Friendly trainers and spotless equipment.", "POSITIVE"),
+    ("The food was cold and the waiter was rude.", "NEGATIVE"),
+    ("Waited forty minutes for a lukewarm pizza.", "NEGATIVE"),
+    ("Dirty tables and the worst coffee I have ever had.", "NEGATIVE"),
+    ("I would not recommend this place to anyone.", "NEGATIVE"),
+    ("Overpriced, slow and disappointing from start to finish.", "NEGATIVE"),
+    ("Nice decor, but the noodles were bland and overcooked.", "NEGATIVE"),
+    ("A bit pricey, but the steak was worth every penny.", "POSITIVE"),
+]
+
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def measure(classifier, texts, runs: int, batch_size: int) -> dict:
+    """
+    Time single-text calls and batched calls.
+
+    Returns:
+        p50/p95 single-review latency in ms and batched reviews/s
+    """
+    classifier(texts[0])  # warm up
+
+    latencies = []
+    for i in range(runs):
+        start = time.perf_counter()
+        classifier(texts[i % len(texts)])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    batch = (texts * (batch_size * runs // len(texts) + 1))[:batch_size * runs]
+    start = time.perf_counter()
+    classifier(batch, batch_size=batch_size, truncation=True)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "throughput": len(batch) / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare inference backends")
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=["pytorch", "quantized", "onnx"])
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-score-diff", type=float, default=0.05)
+    args = parser.parse_args()
+
+    texts = [text for text, _ in SAMPLES]
+    expected = [label for _, label in SAMPLES]
+
+    print("=" * 60)
+    print("VibeCheck Business - Inference Backend Benchmark")
+    print("=" * 60)
+    print()
+
+    classifiers = {}
+    reference = None
+    try:
+        classifiers["pytorch"] = create_backend("pytorch")
+        reference = classifiers["pytorch"](texts, batch_size=len(texts), truncation=True)
+    except Exception as e:
+        print(f"pytorch reference unavailable ({e}), comparing against labels only")
+        print()
+
+    ok = True
+    rows = []
+    for name in args.backends:
+        try:
+            classifier = classifiers.get(name) or create_backend(name)
+        except Exception as e:
+            print(f"- {name}: skipped ({e})")
+            continue
+
+        results = classifier(texts, batch_size=len(texts), truncation=True)
+        accuracy = sum(r["label"] == label for r, label in zip(results, expected)) / len(SAMPLES)
+
+        agreement = max_diff = None
+        if reference is not None:
+            agreement = sum(r["label"] == ref["label"] for r, ref in zip(results, reference)) / len(SAMPLES)
+            max_diff = max(
+                abs(r["score"] - ref["score"]) if r["label"] == ref["label"] else abs(r["score"] + ref["score"] - 1)
+                for r, ref in zip(results, reference)
+            )
+            if name != "stub" and (agreement < 1.0 or max_diff > args.max_score_diff):
+                ok = False
+
+        rows.append((name, accuracy, agreement, max_diff, measure(classifier, texts, args.runs, args.batch_size)))
+
+    print()
+    print(f"{'backend':<10} {'acc':>6} {'agree':>6} {'maxdiff':>8} {'p50 ms':>8} {'p95 ms':>8} {'reviews/s':>10}")
+    for name, accuracy, agreement, max_diff, timing in rows:
+        agree = f"{agreement:.0%}" if agreement is not None else "-"
+        diff = f"{max_diff:.4f}" if max_diff is not None else "-"
+        print(f"{name:<10} {accuracy:>6.0%} {agree:>6} {diff:>8} "
+              f"{timing['p50_ms']:>8.2f} {timing['p95_ms']:>8.2f} {timing['throughput']:>10.1f}")
+
+    print()
+    if reference is None:
+        print("- Parity not checked: the pytorch reference could not be loaded.")
+    elif ok:
+        print("✓ All backends match the pytorch reference.")
+    else:
+        print(f"✗ A backend disagrees with pytorch or drifts more than {args.max_score_diff} in score.")
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
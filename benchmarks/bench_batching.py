@@ -0,0 +1,71 @@
+"""
+Micro-batching Benchmark
+Measures sentiment throughput with and without the batching scheduler, using the
+stub classifier so no model download is needed.
+
+Usage:
+    python -m benchmarks.bench_batching [--callers 32] [--requests 20]
+        [--batch-size 16] [--max-wait-ms 10] [--latency-ms 20] [--per-item-ms 1]
+"""
+
+import argparse
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.batching import SentimentBatcher
+from app.sentiment_analyzer import SentimentAnalyzer, StubClassifier
+
+
+def run_callers(score, callers: int, requests: int) -> float:
+    """
+    Run `callers` threads that each score `requests` reviews, one at a time.
+
+    Returns:
+        Elapsed wall time in seconds
+    """
+    def caller(index):
+        for i in range(requests):
+            score(f"Review {index}-{i}: great coffee but the service was slow.")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=callers) as pool:
+        list(pool.map(caller, range(callers)))
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sentiment micro-batching")
+    parser.add_argument("--callers", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--per-item-ms", type=float, default=1.0)
+    args = parser.parse_args()
+
+    analyzer = SentimentAnalyzer(StubClassifier(args.latency_ms, args.per_item_ms))
+    total = args.callers * args.requests
+
+    # Unbatched: one forward pass per review, serialized on the shared model
+    model_lock = threading.Lock()
+
+    def score_unbatched(text):
+        with model_lock:
+            return analyzer.analyze_sentiment(text)[0]
+
+    unbatched = run_callers(score_unbatched, args.callers, args.requests)
+
+    batcher = SentimentBatcher(analyzer, args.batch_size, args.max_wait_ms)
+    batched = run_callers(batcher.analyze, args.callers, args.requests)
+    batcher.close()
+
+    print(f"Reviews scored:     {total} ({args.callers} callers x {args.requests})")
+    print(f"Unbatched:          {total / unbatched:10.1f} reviews/s ({unbatched:.2f}s)")
+    print(f"Batched:            {total / batched:10.1f} reviews/s ({batched:.2f}s)")
+    print(f"Average batch size: {batcher.items_scored / max(batcher.batches_run, 1):.1f}")
+    print(f"Speedup:            {unbatched / batched:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Keyword Extraction Benchmark
+Times the original per-call keyword extraction against the keyword engine
+(single calls, the batch API and the TF-IDF mode) on a synthetic corpus, and
+checks that the default mode returns exactly the original keywords.
+
+Usage:
+    python -m benchmarks.bench_keywords [--reviews 1000000] [--batch-size 1000] [--seed 42]
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+# TF-IDF mode reads document frequencies from the database; point it at an empty scratch one
+_scratch_dir = tempfile.mkdtemp(prefix="vibecheck-keywords-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch_dir}/keywords.db"
+
+from app.database import engine
+from app.keywords import extract_keywords, extract_keywords_batch
+from app.models import Base
+
+WORDS = (
+    "coffee service staff friendly great terrible slow waiter pizza pasta burger fries "
+    "clean dirty price expensive cheap atmosphere music loud quiet parking location view "
+    "room breakfast buffet pool trainer equipment haircut stylist delivery order fresh "
+    "cold warm spicy sweet portion dessert wine cocktail table booking manager"
+).split()
+FILLER = "the and was very with this that they it for but at of to a in is".split()
+
+
+def original_extract_keywords(text: str, max_keywords: int = 5) -> str:
+    """
+    The implementation this engine replaced, kept as the baseline.
+    """
+    text = text.lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    stop_words = {
+        'i', 'me', 'my', 'myself', 'we', 'our', 'ours', 'ourselves', 'you', 'your',
+        'yours', 'yourself', 'yourselves', 'he', 'him', 'his', 'himself', 'she',
+        'her', 'hers', 'herself', 'it', 'its', 'itself', 'they', 'them', 'their',
+        'theirs', 'themselves', 'what', 'which', 'who', 'whom', 'this', 'that',
+        'these', 'those', 'am', 'is', 'are', 'was', 'were', 'be', 'been', 'being',
+        'have', 'has', 'had', 'having', 'do', 'does', 'did', 'doing', 'a', 'an',
+        'the', 'and', 'but', 'if', 'or', 'because', 'as', 'until', 'while', 'of',
+        'at', 'by', 'for', 'with', 'about', 'against', 'between', 'into', 'through',
+        'during', 'before', 'after', 'above', 'below', 'to', 'from', 'up', 'down',
+        'in', 'out', 'on', 'off', 'over', 'under', 'again', 'further', 'then',
+        'once', 'very', 'can', 'will', 'just', 'should', 'now'
+    }
+    words = [word for word in text.split() if word not in stop_words and len(word) > 3]
+    word_freq = {}
+    for word in words:
+        word_freq[word] = word_freq.get(word, 0) + 1
+    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
+    keywords = [word for word, freq in sorted_words[:max_keywords]]
+    return ", ".join(keywords) if keywords else "general feedback"
+
+
+def make_corpus(count: int, seed: int) -> list:
+    """
+    Deterministic reviews of 8-60 words mixing keyword candidates, stop words and punctuation.
+    """
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = [rng.choice(WORDS) if rng.random() < 0.6 else rng.choice(FILLER)
+                 for _ in range(rng.randint(8, 60))]
+        corpus.append(" ".join(words).capitalize() + rng.choice([".", "!", "!!", "?"]))
+    return corpus
+
+
+def timed(label: str, func, count: int) -> float:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:>8.2f}s  {count / elapsed:>12,.0f} reviews/s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark keyword extraction")
+    parser.add_argument("--reviews", type=int, default=1_000_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Keyword Extraction Benchmark")
+    print("=" * 60)
+    print()
+    print(f"Generating {args.reviews:,} reviews...")
+    corpus = make_corpus(args.reviews, args.seed)
+    Base.metadata.create_all(bind=engine)
+    print()
+
+    def run_batched(mode):
+        results = []
+        for start in range(0, len(corpus), args.batch_size):
+            results.extend(extract_keywords_batch(corpus[start:start + args.batch_size], mode=mode))
+        return results
+
+    expected, baseline = timed("original", lambda: [original_extract_keywords(t) for t in corpus], len(corpus))
+    single, _ = timed("engine, single calls", lambda: [extract_keywords(t, mode="frequency") for t in corpus],
+                      len(corpus))
+    batched, elapsed = timed("engine, batch API", lambda: run_batched("frequency"), len(corpus))
+    timed("engine, tfidf batches", lambda: run_batched("tfidf"), len(corpus))
+
+    print()
+    print(f"Batch API speedup over original: {baseline / elapsed:.2f}x")
+    identical = single == expected and batched == expected
+    print("✓ Default mode output identical to the original." if identical
+          else "✗ Default mode output differs from the original!")
+    print("=" * 60)
+    sys.exit(0 if identical else 1)
+
+
+if __name__ == "__main__":
+    main()
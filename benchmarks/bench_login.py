@@ -0,0 +1,150 @@
+"""
+Login Throughput Benchmark
+Hammers POST /login from many concurrent clients while a few readers poll
+GET /businesses/{id}. The run is repeated with Argon2 hashed inline on the
+request threads (the old behaviour) and on the bounded password hashing pool.
+It reports login throughput, 503 rejections and reader latency.
+
+Each mode runs in a fresh subprocess with its own scratch database, because
+the hashing settings are read from the environment at import.
+
+Usage:
+    python -m benchmarks.bench_login [--clients 64] [--readers 4] [--duration 10]
+        [--users 16] [--workers 4] [--queue-limit 16]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PASSWORD = "benchmark-password"
+
+
+def percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def run_mode(args) -> dict:
+    """
+    Run one mode in this process. The environment is already configured.
+    """
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    results = {"logins": 0, "rejected": 0, "failed": 0, "read_ms": []}
+    lock = threading.Lock()
+    stop = threading.Event()
+
+    with TestClient(app) as client:
+        usernames = [f"bench{i}" for i in range(args.users)]
+        for username in usernames:
+            client.post("/register", json={"username": username, "email": f"{username}@vibecheck.io",
+                                           "password": PASSWORD})
+
+        def login_client(index):
+            username = usernames[index % len(usernames)]
+            while not stop.is_set():
+                code = client.post("/login", json={"username": username, "password": PASSWORD}).status_code
+                with lock:
+                    if code == 200:
+                        results["logins"] += 1
+                    elif code == 503:
+                        results["rejected"] += 1
+                    else:
+                        results["failed"] += 1
+                if code == 503:
+                    # A well-behaved client backs off as told by Retry-After
+                    time.sleep(0.05)
+
+        def reader():
+            while not stop.is_set():
+                start = time.perf_counter()
+                client.get("/businesses/1")
+                elapsed = (time.perf_counter() - start) * 1000
+                with lock:
+                    results["read_ms"].append(elapsed)
+                time.sleep(0.01)
+
+        threads = [threading.Thread(target=login_client, args=(i,)) for i in range(args.clients)]
+        threads += [threading.Thread(target=reader) for _ in range(args.readers)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(args.duration)
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+    read_ms = results.pop("read_ms")
+    results.update(
+        logins_per_second=results["logins"] / elapsed,
+        reads=len(read_ms),
+        read_p50_ms=statistics.median(read_ms) if read_ms else 0.0,
+        read_p95_ms=percentile(read_ms, 0.95)
+    )
+    return results
+
+
+def spawn_mode(label: str, env: dict, args) -> dict:
+    """
+    Run one mode in a subprocess with a scratch database and return its results.
+    """
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, DATABASE_URL=f"sqlite:///{Path(scratch) / 'bench.db'}",
+                   SENTIMENT_STUB="True", **env)
+        argv = [sys.executable, "-m", "benchmarks.bench_login", "--child",
+                "--clients", str(args.clients), "--readers", str(args.readers),
+                "--duration", str(args.duration), "--users", str(args.users)]
+        print(f"Running {label}...")
+        output = subprocess.run(argv, env=env, check=True, capture_output=True, text=True).stdout
+        return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark login throughput under concurrency")
+    parser.add_argument("--clients", type=int, default=64, help="Concurrent login clients")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent business readers")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+    parser.add_argument("--users", type=int, default=16)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2, help="Hashing processes")
+    parser.add_argument("--queue-limit", type=int, default=None, help="Default: 4 per worker")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.queue_limit is None:
+        args.queue_limit = 4 * args.workers
+
+    if args.child:
+        print(json.dumps(run_mode(args)))
+        return
+
+    print("=" * 60)
+    print("VibeCheck Business - Login Throughput Benchmark")
+    print("=" * 60)
+    print()
+    modes = {
+        "inline": {"PASSWORD_HASH_WORKERS": "0", "PASSWORD_HASH_QUEUE_LIMIT": "1000000"},
+        "pool": {"PASSWORD_HASH_WORKERS": str(args.workers), "PASSWORD_HASH_QUEUE_LIMIT": str(args.queue_limit)},
+    }
+    results = {label: spawn_mode(label, env, args) for label, env in modes.items()}
+
+    print()
+    print(f"{'mode':<8} {'logins/s':>10} {'503s':>8} {'errors':>8} {'reads':>8} {'read p50':>10} {'read p95':>10}")
+    for label, result in results.items():
+        print(f"{label:<8} {result['logins_per_second']:>10.1f} {result['rejected']:>8} {result['failed']:>8} "
+              f"{result['reads']:>8} {result['read_p50_ms']:>8.1f}ms {result['read_p95_ms']:>8.1f}ms")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
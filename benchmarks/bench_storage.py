@@ -0,0 +1,128 @@
+"""
+Storage Profile Benchmark
+Runs a mixed read/write workload against a scratch SQLite database with the
+default and the tuned storage profiles and reports throughput for each.
+
+Usage:
+    python -m benchmarks.bench_storage [--readers 8] [--writers 4] [--seconds 5]
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_engines
+from app.models import Base, Business, Review, User
+from app.utils import apply_review_score_change
+
+
+def seed(session_factory, businesses: int = 50, reviews: int = 5000):
+    db = session_factory()
+    try:
+        user = User(username="bench", email="bench@example.com", hashed_password="x")
+        db.add(user)
+        db.add_all([
+            Business(name=f"Business {i}", category="Cafe", location="Somewhere")
+            for i in range(businesses)
+        ])
+        db.flush()
+        db.add_all([
+            Review(user_id=user.id, business_id=1 + i % businesses,
+                   content=f"Seed review {i} with good coffee", vibe_score=75.0, sentiment="POSITIVE")
+            for i in range(reviews)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def run_profile(profile: str, readers: int, writers: int, seconds: float) -> dict:
+    """
+    Run the mixed workload for one storage profile.
+
+    Returns:
+        Counts of completed reads, writes and write errors
+    """
+    path = os.path.join(tempfile.mkdtemp(prefix="vibecheck-storage-"), "bench.db")
+    writer, reader = create_engines(f"sqlite:///{path}", profile)
+    Base.metadata.create_all(bind=writer)
+    WriteSession = sessionmaker(bind=writer, autoflush=False)
+    ReadSession = sessionmaker(bind=reader, autoflush=False)
+    seed(WriteSession)
+
+    counts = {"reads": 0, "writes": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def read_loop(index):
+        done = 0
+        while time.perf_counter() < deadline:
+            db = ReadSession()
+            try:
+                business_id = 1 + (done + index) % 50
+                db.execute(
+                    select(Review).where(Review.business_id == business_id).limit(50)
+                ).all()
+                db.scalar(select(func.count(Review.id)).where(Review.business_id == business_id))
+                done += 1
+            finally:
+                db.close()
+        with lock:
+            counts["reads"] += done
+
+    def write_loop(index):
+        done = errors = 0
+        while time.perf_counter() < deadline:
+            db = WriteSession()
+            try:
+                business_id = 1 + (done + index) % 50
+                db.add(Review(user_id=1, business_id=business_id,
+                              content="Benchmark review, friendly staff", vibe_score=80.0, sentiment="POSITIVE"))
+                apply_review_score_change(business_id, db, new_score=80.0, review_delta=1)
+                db.commit()
+                done += 1
+            except Exception:
+                db.rollback()
+                errors += 1
+            finally:
+                db.close()
+        with lock:
+            counts["writes"] += done
+            counts["errors"] += errors
+
+    threads = [threading.Thread(target=read_loop, args=(i,)) for i in range(readers)]
+    threads += [threading.Thread(target=write_loop, args=(i,)) for i in range(writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    writer.dispose()
+    reader.dispose()
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark SQLite storage profiles")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds:.0f}s per profile")
+    for profile in ("default", "tuned"):
+        counts = run_profile(profile, args.readers, args.writers, args.seconds)
+        print(
+            f"{profile:>8}: {counts['reads'] / args.seconds:9.1f} reads/s "
+            f"{counts['writes'] / args.seconds:9.1f} writes/s "
+            f"({counts['errors']} write errors)"
+        )
+
+
+if __name__ == "__main__":
+    main()
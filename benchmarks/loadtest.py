@@ -0,0 +1,366 @@
+"""
+API Load Test
+Replays a weighted mix of API calls (register, login, create review and the
+business and review listings) at a fixed arrival rate and reports latency
+percentiles, throughput and error rates per operation.
+
+Arrivals are open-loop: request i is due at start + i / rate whether or not
+earlier requests have finished, and its latency is measured from that due time.
+A server that falls behind therefore shows up as growing tail latency instead
+of a quietly lower request rate.
+
+The app runs in-process (TestClient) or under a local uvicorn started for the
+run, in both cases with the deterministic stub classifier and a scratch
+database, so no model download or network access is needed. --url points the
+workload at a server that is already running instead. The request plan is
+drawn from --seed, so two runs with the same arguments send the same requests.
+
+Results are written as JSON; pass an earlier result file to --compare to print
+the change per operation, e.g. between two commits.
+
+Usage:
+    python -m benchmarks.loadtest [--rate 50] [--duration 30] [--concurrency 64]
+        [--mix create_review=4,get_business=3,list_businesses=2,list_reviews=2,login=1,register=1]
+        [--server inprocess|uvicorn] [--url http://127.0.0.1:8000]
+        [--users 20] [--seed 42] [--stub-latency-ms 0] [--output results.json] [--compare old.json]
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+DEFAULT_MIX = "create_review=4,get_business=3,list_businesses=2,list_reviews=2,login=1,register=1"
+PASSWORD = "loadtest-password"
+RESULTS_DIR = Path(__file__).resolve().parent.parent / "loadtest_results"
+
+POSITIVE = ["great", "friendly", "amazing", "excellent", "love", "fantastic"]
+NEGATIVE = ["terrible", "rude", "slow", "dirty", "awful", "disappointed"]
+FILLER = ["coffee", "staff", "service", "atmosphere", "prices", "music", "seating", "menu", "wait", "parking"]
+
+
+def review_text(rng: random.Random) -> str:
+    """
+    A short or long review with a random lean, so scores and keywords vary.
+    """
+    words = rng.choice([POSITIVE, NEGATIVE])
+    length = rng.choice([8, 12, 20, 60, 150])
+    return " ".join(rng.choice(words) if rng.random() < 0.2 else rng.choice(FILLER) for _ in range(length)) + "."
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        if name.strip() not in OPERATIONS:
+            raise SystemExit(f"Unknown operation '{name.strip()}'; choose from {', '.join(OPERATIONS)}")
+        weights[name.strip()] = float(weight or 1)
+    return weights
+
+
+class Workload:
+    """
+    Users, tokens and businesses shared by the operations of one run.
+    """
+
+    def __init__(self, run_id: str, users: int):
+        self.run_id = run_id
+        self.users = users
+        self.tokens = []
+        self.business_ids = []
+
+    def username(self, index) -> str:
+        return f"load{self.run_id}u{index}"
+
+    def setup(self, client):
+        """
+        Register and log in the pool of users, and look up the businesses.
+        """
+        for index in range(self.users):
+            username = self.username(index)
+            client.post("/register", json={"username": username, "email": f"{username}@vibecheck.io",
+                                           "password": PASSWORD})
+            response = client.post("/login", json={"username": username, "password": PASSWORD})
+            response.raise_for_status()
+            self.tokens.append(response.json()["access_token"])
+
+        response = client.get("/businesses")
+        response.raise_for_status()
+        self.business_ids = [business["id"] for business in response.json()]
+        if not self.business_ids:
+            raise SystemExit("The target has no businesses to review")
+
+
+# Each operation turns a random draw into request arguments at planning time,
+# so the requests only depend on the seed
+OPERATIONS = {
+    "register": lambda rng, w, i: (
+        "POST", "/register",
+        {"json": {"username": w.username(f"r{i}"), "email": f"{w.username(f'r{i}')}@vibecheck.io",
+                  "password": PASSWORD}}
+    ),
+    "login": lambda rng, w, i: (
+        "POST", "/login",
+        {"json": {"username": w.username(rng.randrange(w.users)), "password": PASSWORD}}
+    ),
+    "create_review": lambda rng, w, i: (
+        "POST", f"/businesses/{rng.choice(w.business_ids)}/reviews",
+        {"json": {"content": review_text(rng)},
+         "headers": {"Authorization": f"Bearer {rng.choice(w.tokens)}"}}
+    ),
+    "get_business": lambda rng, w, i: ("GET", f"/businesses/{rng.choice(w.business_ids)}", {}),
+    "list_businesses": lambda rng, w, i: ("GET", "/businesses", {}),
+    "list_reviews": lambda rng, w, i: ("GET", f"/businesses/{rng.choice(w.business_ids)}/reviews", {}),
+}
+
+
+def plan_requests(workload: Workload, weights: dict, total: int, seed: int) -> list:
+    """
+    Draw the (operation, method, path, request kwargs) sequence for a run.
+    """
+    rng = random.Random(seed)
+    names = list(weights)
+    chosen = rng.choices(names, weights=[weights[name] for name in names], k=total)
+    return [(name, *OPERATIONS[name](rng, workload, index)) for index, name in enumerate(chosen)]
+
+
+def percentile(samples: list, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summarize(records: list, elapsed: float) -> dict:
+    """
+    Latency percentiles (ms), throughput and errors of a list of
+    (latency seconds, status code) records.
+    """
+    latencies = [latency * 1000 for latency, _ in records]
+    statuses = Counter(str(code) for _, code in records)
+    errors = sum(1 for _, code in records if code == 0 or code >= 400)
+    return {
+        "requests": len(records),
+        "requests_per_second": round(len(records) / elapsed, 2) if elapsed else 0.0,
+        "errors": errors,
+        "error_rate": round(errors / len(records), 4) if records else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(max(latencies), 2) if latencies else 0.0,
+        "status_codes": dict(sorted(statuses.items()))
+    }
+
+
+def run_load(client, plan: list, rate: float, concurrency: int) -> dict:
+    """
+    Send the planned requests at a fixed arrival rate and collect the results.
+    """
+    records = {name: [] for name, *_ in plan}
+    lock = threading.Lock()
+    lag = []
+
+    def send(due, name, method, path, kwargs):
+        started = time.perf_counter()
+        try:
+            code = client.request(method, path, **kwargs).status_code
+        except Exception:
+            code = 0
+        latency = time.perf_counter() - due
+        with lock:
+            records[name].append((latency, code))
+            lag.append(started - due)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for index, request in enumerate(plan):
+            due = start + index / rate
+            delay = due - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            pool.submit(send, due, *request)
+    elapsed = time.perf_counter() - start
+
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "overall": summarize([record for group in records.values() for record in group], elapsed),
+        "operations": {name: summarize(group, elapsed) for name, group in sorted(records.items())},
+        # Time requests waited for a free client thread; high values mean --concurrency is the bottleneck
+        "max_start_lag_ms": round(max(lag) * 1000, 2) if lag else 0.0
+    }
+
+
+def stub_environment(args, scratch: str) -> dict:
+    return {
+        "DATABASE_URL": f"sqlite:///{Path(scratch) / 'loadtest.db'}",
+        "SENTIMENT_STUB": "True",
+        "SENTIMENT_STUB_LATENCY_MS": str(args.stub_latency_ms),
+    }
+
+
+def run_inprocess(args, run) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        # Settings are read from the environment when the app is imported
+        os.environ.update(stub_environment(args, scratch))
+        from fastapi.testclient import TestClient
+        from app.main import app
+        from app.readiness import get_model_warmup
+
+        with TestClient(app) as client:
+            get_model_warmup().wait()
+            return run(client)
+
+
+def run_uvicorn(args, run) -> dict:
+    with tempfile.TemporaryDirectory() as scratch:
+        env = dict(os.environ, **stub_environment(args, scratch))
+        url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(args.port),
+             "--log-level", "warning"],
+            env=env
+        )
+        try:
+            wait_until_ready(url, server)
+            return run_against(url, args, run)
+        finally:
+            server.terminate()
+            server.wait(timeout=10)
+
+
+def wait_until_ready(url: str, server=None, timeout: float = 60.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server is not None and server.poll() is not None:
+            raise SystemExit("uvicorn exited before becoming ready")
+        try:
+            if httpx.get(f"{url}/readyz", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise SystemExit(f"{url} was not ready after {timeout:.0f}s")
+
+
+def run_against(url: str, args, run) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    with httpx.Client(base_url=url, limits=limits, timeout=args.timeout) as client:
+        return run(client)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=Path(__file__).resolve().parent).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(result: dict, baseline: dict = None):
+    print(f"{'operation':<16} {'requests':>9} {'req/s':>8} {'errors':>7} {'p50':>9} {'p95':>9} {'p99':>9}")
+    rows = [("overall", result["overall"])] + list(result["operations"].items())
+    for name, stats in rows:
+        print(f"{name:<16} {stats['requests']:>9} {stats['requests_per_second']:>8.1f} "
+              f"{stats['error_rate']:>6.1%} {stats['p50_ms']:>7.1f}ms {stats['p95_ms']:>7.1f}ms "
+              f"{stats['p99_ms']:>7.1f}ms")
+        if baseline is None:
+            continue
+        old = baseline["overall"] if name == "overall" else baseline["operations"].get(name)
+        if old:
+            changes = [
+                f"{key[:-3]} {stats[key] / old[key] - 1:+.0%}"
+                for key in ("p50_ms", "p95_ms", "p99_ms") if old[key]
+            ]
+            changes.append(f"errors {stats['error_rate'] - old['error_rate']:+.1%}")
+            print(f"{'':<16} vs {baseline['run']['commit']}: {', '.join(changes)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the API at a fixed arrival rate")
+    parser.add_argument("--rate", type=float, default=50.0, help="Requests started per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Comma-separated operation=weight pairs")
+    parser.add_argument("--server", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--port", type=int, default=8765, help="Port for --server uvicorn")
+    parser.add_argument("--url", default=None, help="Target an already running server instead")
+    parser.add_argument("--users", type=int, default=20, help="Users registered before the run")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--stub-latency-ms", type=float, default=0.0, help="Simulated inference cost")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (seconds)")
+    parser.add_argument("--output", default=None, help=f"Result file (default: {RESULTS_DIR.name}/<time>-<commit>.json)")
+    parser.add_argument("--compare", default=None, help="Earlier result file to compare against")
+    args = parser.parse_args()
+
+    weights = parse_mix(args.mix)
+    total = max(1, int(args.rate * args.duration))
+    commit = git_commit()
+    # Usernames must not collide with an earlier run against the same server
+    workload = Workload(f"{args.seed}x{int(time.time()) % 1000000}" if args.url else str(args.seed), args.users)
+
+    print("=" * 60)
+    print("VibeCheck Business - API Load Test")
+    print("=" * 60)
+    target = args.url or args.server
+    print(f"Target: {target}, {total} requests at {args.rate:g}/s, concurrency {args.concurrency}")
+    print(f"Mix: {args.mix}")
+    print()
+
+    def run(client):
+        workload.setup(client)
+        plan = plan_requests(workload, weights, total, args.seed)
+        return run_load(client, plan, args.rate, args.concurrency)
+
+    if args.url:
+        wait_until_ready(args.url)
+        result = run_against(args.url, args, run)
+    elif args.server == "uvicorn":
+        result = run_uvicorn(args, run)
+    else:
+        result = run_inprocess(args, run)
+
+    result = {
+        "run": {
+            "commit": commit,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "target": target,
+            "rate": args.rate,
+            "duration": args.duration,
+            "concurrency": args.concurrency,
+            "mix": weights,
+            "seed": args.seed,
+            "users": args.users,
+            "stub_latency_ms": args.stub_latency_ms
+        },
+        **result
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+    print(f"Longest wait for a client thread: {result['max_start_lag_ms']:.1f}ms")
+
+    output = Path(args.output) if args.output else (
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{commit}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Results written to {output}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""
+Hot Path Microbenchmarks
+Times the helpers every review write goes through (keyword extraction,
+sentiment analysis, vibe score calculation and aggregate updates) and the
+password helpers, on short and long reviews and on businesses with few and
+very many reviews. Results are compared with benchmarks/baselines.json and the
+run fails when a benchmark is slower than its baseline by more than the
+tolerance.
+
+Baselines are recorded on one machine and checked on another, so every run
+also times a fixed pure-Python calibration loop; a baseline is scaled by how
+much faster or slower that loop is here before it is compared.
+
+Sentiment analysis uses the stub classifier with the cache and micro-batching
+disabled, so it measures the work of one uncached call without the model or
+the batching wait. The vibe score benchmarks run against a scratch SQLite
+database.
+
+Usage:
+    python -m benchmarks.microbench [--filter keywords] [--large-reviews 1000000]
+        [--tolerance 0.25] [--update-baselines]
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BASELINES_PATH = Path(__file__).resolve().parent / "baselines.json"
+DEFAULT_TOLERANCE = 0.25
+SMALL_REVIEWS = 10
+
+SHORT_REVIEW = "Great coffee, friendly staff."
+LONG_REVIEW = " ".join([
+    "We came for brunch on a busy Sunday and waited twenty minutes for a table,",
+    "but the staff were friendly and apologised for the delay. The coffee was excellent,",
+    "the pancakes were fluffy and the portions generous, though the eggs arrived cold",
+    "and the music was far too loud to hold a conversation. Prices are on the high side",
+    "for the area. Parking was a nightmare. Would come back on a weekday."
+] * 4)
+
+
+def calibration_loop():
+    """
+    Fixed CPU-bound work used to compare machines.
+    """
+    values = [(i * 7919) % 10007 for i in range(20000)]
+    return sum(sorted(values)) + len({str(value) for value in values})
+
+
+def time_call(func, min_time: float = 0.2, repeat: int = 5) -> float:
+    """
+    Seconds per call in the fastest of `repeat` rounds of enough calls to last
+    min_time; slower rounds measure interference from the rest of the machine.
+    """
+    func()  # Warm up imports, caches and statement compilation
+    start = time.perf_counter()
+    func()
+    single = time.perf_counter() - start
+    loops = max(1, int(min_time / single)) if single > 0 else 1000
+
+    rounds = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(loops):
+            func()
+        rounds.append((time.perf_counter() - start) / loops)
+    return min(rounds)
+
+
+def seed_business(db, business_id: int, reviews: int, user_id: int, chunk_size: int = 50000):
+    """
+    Give a business `reviews` scored reviews with bulk Core inserts.
+    """
+    from sqlalchemy import insert, update
+    from app.leaderboard import weighted_vibe_score
+    from app.models import Business, Review
+
+    rng = random.Random(business_id)
+    total = 0.0
+    for offset in range(0, reviews, chunk_size):
+        rows = []
+        for _ in range(min(chunk_size, reviews - offset)):
+            score = round(rng.uniform(0, 100), 2)
+            total += score
+            rows.append({"user_id": user_id, "business_id": business_id, "content": SHORT_REVIEW,
+                         "vibe_score": score, "sentiment": "POSITIVE" if score >= 50 else "NEGATIVE",
+                         "keywords": "coffee,staff"})
+        db.execute(insert(Review), rows)
+    db.execute(
+        update(Business).where(Business.id == business_id)
+        .values(vibe_score_sum=total, scored_reviews=reviews, total_reviews=reviews,
+                aggregated_vibe_score=round(total / reviews, 2) if reviews else 0.0,
+                weighted_score=round(weighted_vibe_score(total, reviews), 2) if reviews else None)
+    )
+    db.commit()
+
+
+def build_benchmarks(large_reviews: int) -> dict:
+    """
+    Returns {benchmark name: (callable, timing options)}; sizes are part of the names,
+    so a run with other sizes does not compare against the wrong baseline.
+    """
+    from app.auth import hash_password, verify_password
+    from app.database import SessionLocal, engine
+    from app.models import Base, Business, User
+    from app.utils import analyze_review_sentiment, calculate_vibe_score, extract_keywords, update_business_vibe_score
+
+    Base.metadata.create_all(bind=engine)
+
+    db = SessionLocal()
+    user = User(username="bench", email="bench@vibecheck.io", hashed_password="x")
+    small = Business(name="Small Cafe", category="Cafe", location="Somewhere")
+    large = Business(name="Large Cafe", category="Cafe", location="Elsewhere")
+    db.add_all([user, small, large])
+    db.commit()
+
+    print(f"Seeding {SMALL_REVIEWS} and {large_reviews} reviews...")
+    seed_business(db, small.id, SMALL_REVIEWS, user.id)
+    seed_business(db, large.id, large_reviews, user.id)
+
+    def update_aggregates(business_id):
+        # Zero deltas leave the aggregates unchanged, so every call does the same work. Each
+        # call gets a fresh session and rolls back, like a review write that fails at the end,
+        # so no transaction, bookkeeping or earlier benchmark state carries over between calls.
+        def call():
+            with SessionLocal() as session:
+                update_business_vibe_score(business_id, session, 0.0, 0, 0)
+                session.rollback()
+        return call
+
+    password_hash = hash_password("benchmark-password")
+    slow = {"min_time": 0.0, "repeat": 3}
+    return {
+        "extract_keywords[short]": (lambda: extract_keywords(SHORT_REVIEW), {}),
+        "extract_keywords[long]": (lambda: extract_keywords(LONG_REVIEW), {}),
+        "analyze_review_sentiment[short]": (lambda: analyze_review_sentiment(SHORT_REVIEW), {}),
+        "analyze_review_sentiment[long]": (lambda: analyze_review_sentiment(LONG_REVIEW), {}),
+        f"calculate_vibe_score[{SMALL_REVIEWS} reviews]": (lambda: calculate_vibe_score(small.id, db), {}),
+        f"calculate_vibe_score[{large_reviews} reviews]": (lambda: calculate_vibe_score(large.id, db), slow),
+        f"update_business_vibe_score[{SMALL_REVIEWS} reviews]": (update_aggregates(small.id), {}),
+        f"update_business_vibe_score[{large_reviews} reviews]": (update_aggregates(large.id), {}),
+        "hash_password": (lambda: hash_password("benchmark-password"), slow),
+        "verify_password": (lambda: verify_password("benchmark-password", password_hash), slow),
+    }
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds >= 1:
+        return f"{seconds:.2f}s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f}ms"
+    return f"{seconds * 1e6:.1f}us"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the review write hot path against stored baselines")
+    parser.add_argument("--filter", default=None, help="Only run benchmarks whose name contains this")
+    parser.add_argument("--large-reviews", type=int, default=1000000, help="Reviews of the large business")
+    parser.add_argument("--tolerance", type=float, default=None,
+                        help=f"Allowed slowdown (default: from the baselines file, else {DEFAULT_TOLERANCE})")
+    parser.add_argument("--baselines", default=str(BASELINES_PATH))
+    parser.add_argument("--update-baselines", action="store_true", help="Record this run as the new baselines")
+    args = parser.parse_args()
+
+    scratch = tempfile.TemporaryDirectory()
+    # Settings are read from the environment when the app is imported
+    os.environ.update({
+        "DATABASE_URL": f"sqlite:///{Path(scratch.name) / 'microbench.db'}",
+        "SENTIMENT_STUB": "True",
+        "SENTIMENT_CACHE_ENABLED": "False",
+        "SENTIMENT_BATCHING": "False",
+    })
+
+    baselines_path = Path(args.baselines)
+    baselines = json.loads(baselines_path.read_text()) if baselines_path.exists() else {"benchmarks": {}}
+    tolerance = args.tolerance if args.tolerance is not None else baselines.get("tolerance", DEFAULT_TOLERANCE)
+
+    print("=" * 60)
+    print("VibeCheck Business - Hot Path Microbenchmarks")
+    print("=" * 60)
+    calibration = time_call(calibration_loop)
+    machine_factor = calibration / baselines["calibration_seconds"] if "calibration_seconds" in baselines else 1.0
+    print(f"Calibration loop: {format_seconds(calibration)} ({machine_factor:.2f}x the baseline machine)")
+
+    benchmarks = build_benchmarks(args.large_reviews)
+    if args.filter:
+        benchmarks = {name: case for name, case in benchmarks.items() if args.filter in name}
+
+    print()
+    print(f"{'benchmark':<46} {'time':>10} {'baseline':>10} {'change':>8}")
+    results = {}
+    regressions = []
+    for name, (func, options) in benchmarks.items():
+        seconds = time_call(func, **options)
+        results[name] = seconds
+        baseline = baselines["benchmarks"].get(name)
+        if baseline is None:
+            print(f"{name:<46} {format_seconds(seconds):>10} {'-':>10} {'new':>8}")
+            continue
+        expected = baseline["seconds"] * machine_factor
+        change = seconds / expected - 1
+        # Noisy benchmarks carry their own tolerance, unless one is given on the command line
+        allowed = tolerance if args.tolerance is not None else baseline.get("tolerance", tolerance)
+        flag = ""
+        if change > allowed:
+            regressions.append(name)
+            flag = f"  SLOWER than +{allowed:.0%}"
+        print(f"{name:<46} {format_seconds(seconds):>10} {format_seconds(expected):>10} {change:>+8.0%}{flag}")
+
+    if args.update_baselines:
+        # Stored relative to the baseline machine, so benchmarks not rerun stay comparable
+        recorded = baselines["benchmarks"]
+        for name, seconds in results.items():
+            recorded[name] = {**recorded.get(name, {}), "seconds": round(seconds / machine_factor, 9)}
+        baselines_path.write_text(json.dumps({
+            "tolerance": baselines.get("tolerance", DEFAULT_TOLERANCE),
+            "calibration_seconds": round(baselines.get("calibration_seconds", calibration), 9),
+            "python": platform.python_version(),
+            "benchmarks": dict(sorted(recorded.items()))
+        }, indent=2) + "\n")
+        print(f"\nBaselines written to {baselines_path}")
+
+    print("=" * 60)
+    if regressions and not args.update_baselines:
+        print(f"✗ {len(regressions)} benchmark(s) slower than their baseline: {', '.join(regressions)}")
+        sys.exit(1)
+    print("✓ No regressions beyond the tolerance.")
+
+
+if __name__ == "__main__":
+    main()
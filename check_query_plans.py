@@ -0,0 +1,216 @@
+"""
+Query Plan Regression Check for VibeCheck Business
+Calls every API endpoint against a scratch database, records the SQL each one
+runs, and checks the EXPLAIN QUERY PLAN of every statement. Fails if any query
+falls back to a full table scan or a temporary sort (relevance-ranked search
+is allowed to sort its matches).
+
+Usage:
+    python check_query_plans.py [--verbose]
+
+Exits with status 1 if any query plan regressed. Uses the stub sentiment
+classifier, so no model download is needed.
+"""
+
+import argparse
+import os
+import re
+import sys
+import tempfile
+
+# Point the app at a scratch database before it is imported
+_scratch_dir = tempfile.mkdtemp(prefix="vibecheck-plans-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_scratch_dir}/plans.db"
+os.environ["SENTIMENT_STUB"] = "True"
+os.environ["SCORING_MODE"] = "sync"
+# Also exercise the document frequency reads and writes
+os.environ["KEYWORD_MODE"] = "tfidf"
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.database import SessionLocal, engine, read_engine
+from app.main import app
+from app.models import Review, PENDING_SENTIMENT
+from app.scoring_worker import score_pending_reviews
+
+# "SCAN reviews" is a full table scan; "SCAN reviews USING INDEX ..." walks an
+# index in order and is bounded by the query's LIMIT
+FULL_SCAN = re.compile(r"^SCAN (?!CONSTANT ROW)\S+$")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE")
+
+EXPLAINABLE = ("SELECT", "UPDATE", "DELETE", "WITH")
+
+# Relevance-ranked endpoints must sort their matches; only full scans are checked
+RANKED_ENDPOINTS = {"GET /reviews/search"}
+
+
+class QueryRecorder:
+    """
+    Records the statements executed on the engine while active.
+    """
+
+    def __init__(self):
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith(EXPLAINABLE) and not executemany:
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        self.statements = []
+        for bind in {engine, read_engine}:
+            event.listen(bind, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        for bind in {engine, read_engine}:
+            event.remove(bind, "before_cursor_execute", self._record)
+
+
+def explain(statement: str, parameters) -> list:
+    """
+    Run EXPLAIN QUERY PLAN for a recorded statement.
+
+    Returns:
+        The plan detail lines
+    """
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    return [row[-1] for row in rows]
+
+
+def run_endpoints(client: TestClient):
+    """
+    Yield (name, callable) pairs that exercise each endpoint.
+    """
+    state = {}
+
+    def register():
+        response = client.post("/register", json={
+            "username": "plancheck", "email": "plancheck@example.com", "password": "plancheck-password"
+        })
+        state["user_id"] = response.json()["id"]
+
+    def login():
+        response = client.post("/login", json={"username": "plancheck", "password": "plancheck-password"})
+        state["auth"] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    def create_review():
+        response = client.post(
+            "/businesses/1/reviews",
+            json={"content": "Great coffee and friendly staff, will come back!"},
+            headers=state["auth"]
+        )
+        state["review_id"] = response.json()["id"]
+
+    def bulk_business_reviews():
+        client.post("/businesses/1/reviews:bulk", json={"reviews": [
+            {"content": f"Review number {i} about the great service"}
+            for i in range(5)
+        ]}, headers=state["auth"])
+
+    def bulk_reviews():
+        client.post("/reviews:bulk", json={"reviews": [
+            {"business_id": business_id, "content": "Terrible and slow service"}
+            for business_id in (1, 2, 3)
+        ]}, headers=state["auth"])
+
+    def business_reviews():
+        response = client.get("/businesses/1/reviews", params={"limit": 2})
+        client.get("/businesses/1/reviews", params={"limit": 2, "cursor": response.headers["x-next-cursor"]})
+
+    def search():
+        response = client.get("/reviews/search", params={"q": "service", "limit": 2})
+        client.get("/reviews/search", params={
+            "q": "service", "business_id": 1, "limit": 2, "cursor": response.headers["x-next-cursor"]
+        })
+
+    def list_businesses():
+        response = client.get("/businesses", params={"limit": 2})
+        client.get("/businesses", params={"limit": 2, "cursor": response.headers["x-next-cursor"]})
+
+    def trend():
+        for granularity in ("day", "week", "month"):
+            client.get("/businesses/1/trend", params={"granularity": granularity})
+
+    def scoring_worker():
+        db = SessionLocal()
+        try:
+            db.add(Review(user_id=state["user_id"], business_id=1,
+                          content="Pending review for the workers", sentiment=PENDING_SENTIMENT))
+            db.commit()
+            score_pending_reviews(db)
+        finally:
+            db.close()
+
+    return [
+        ("POST /register", register),
+        ("POST /login", login),
+        ("GET /businesses", list_businesses),
+        ("GET /businesses/{id}", lambda: client.get("/businesses/1")),
+        ("POST /businesses/{id}/reviews", create_review),
+        ("POST /businesses/{id}/reviews:bulk", bulk_business_reviews),
+        ("POST /reviews:bulk", bulk_reviews),
+        ("GET /businesses/{id}/reviews", business_reviews),
+        ("GET /reviews/search", search),
+        ("GET /businesses/{id}/keywords", lambda: client.get("/businesses/1/keywords", params={"top": 5})),
+        ("GET /businesses/{id}/trend", trend),
+        ("GET /leaderboard", lambda: client.get("/leaderboard", params={"category": "Hotel", "limit": 5})),
+        ("GET /reviews/{id}", lambda: client.get(f"/reviews/{state['review_id']}")),
+        ("DELETE /reviews/{id}", lambda: client.delete(f"/reviews/{state['review_id']}", headers=state["auth"])),
+        ("POST /logout", lambda: client.post("/logout", headers=state["auth"])),
+        ("scoring worker", scoring_worker),
+    ]
+
+
+def check_query_plans(verbose: bool) -> bool:
+    """
+    Exercise every endpoint and check the plans of the queries it ran.
+
+    Returns:
+        True if no query plan regressed
+    """
+    failures = 0
+    recorder = QueryRecorder()
+
+    with TestClient(app) as client:
+        for name, call in run_endpoints(client):
+            with recorder:
+                call()
+
+            print(f"{name}: {len(recorder.statements)} queries")
+            for statement, parameters in recorder.statements:
+                plan = explain(statement, parameters)
+                bad = [
+                    line for line in plan
+                    if FULL_SCAN.match(line) or (TEMP_SORT.search(line) and name not in RANKED_ENDPOINTS)
+                ]
+                if bad or verbose:
+                    print(f"  {' '.join(statement.split())}")
+                    for line in plan:
+                        marker = "✗" if line in bad else " "
+                        print(f"    {marker} {line}")
+                failures += len(bad)
+
+    print()
+    if failures:
+        print(f"✗ {failures} query plan regression(s) found.")
+        return False
+    print("✓ No full table scans or temporary sorts.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the query plans of every API endpoint")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not just regressions")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Query Plan Regression Check")
+    print("=" * 60)
+    print()
+    ok = check_query_plans(args.verbose)
+    print()
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
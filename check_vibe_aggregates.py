@@ -0,0 +1,129 @@
+"""
+Vibe Aggregate Consistency Check for VibeCheck Business
+Compares the incrementally maintained business aggregates against a full
+recompute from the reviews table.
+
+Usage:
+    python check_vibe_aggregates.py [--fix]
+
+Exits with status 1 if any business is inconsistent (and --fix was not given).
+"""
+
+import argparse
+import sys
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.database import SessionLocal
+from app.leaderboard import weighted_vibe_score
+from app.models import Business, Review
+from app.utils import recalculate_business_vibe_score
+
+# Allowed floating point drift in the running score sum
+SUM_TOLERANCE = 1e-6
+
+
+def find_inconsistent_businesses(db: Session) -> list:
+    """
+    Compare every business's stored aggregates with a full recompute.
+    
+    Args:
+        db: Database session
+        
+    Returns:
+        List of (business, expected) tuples, where expected holds the recomputed
+        vibe_score_sum, scored_reviews, total_reviews and the scores derived from them
+    """
+    recomputed = {
+        business_id: (score_sum, scored, total)
+        for business_id, score_sum, scored, total in db.execute(
+            select(
+                Review.business_id,
+                func.coalesce(func.sum(Review.vibe_score), 0.0),
+                func.count(Review.vibe_score),
+                func.count(Review.id)
+            ).group_by(Review.business_id)
+        )
+    }
+    
+    mismatches = []
+    for business in db.query(Business).order_by(Business.id):
+        score_sum, scored, total = recomputed.get(business.id, (0.0, 0, 0))
+        expected_score = round(score_sum / scored, 2) if scored else 0.0
+        expected_weighted = round(weighted_vibe_score(score_sum, scored), 2) if scored else None
+        if (
+            abs(business.vibe_score_sum - score_sum) > SUM_TOLERANCE
+            or business.scored_reviews != scored
+            or business.total_reviews != total
+            or abs((business.aggregated_vibe_score or 0.0) - expected_score) > 0.01
+            or (business.weighted_score is None) != (expected_weighted is None)
+            or (expected_weighted is not None and abs(business.weighted_score - expected_weighted) > 0.01)
+        ):
+            mismatches.append((business, {
+                "vibe_score_sum": score_sum,
+                "scored_reviews": scored,
+                "total_reviews": total,
+                "aggregated_vibe_score": expected_score,
+                "weighted_score": expected_weighted,
+            }))
+    return mismatches
+
+
+def check_aggregates(fix: bool) -> bool:
+    """
+    Report inconsistent businesses and optionally repair them.
+    
+    Returns:
+        True if all aggregates are (now) consistent
+    """
+    db: Session = SessionLocal()
+    
+    try:
+        mismatches = find_inconsistent_businesses(db)
+        
+        if not mismatches:
+            print("✓ All business aggregates match a full recompute.")
+            return True
+        
+        print(f"✗ {len(mismatches)} business(es) have inconsistent aggregates:")
+        for business, expected in mismatches:
+            print(
+                f"  {business.id}. {business.name}: "
+                f"sum={business.vibe_score_sum:.4f} (expected {expected['vibe_score_sum']:.4f}), "
+                f"scored={business.scored_reviews} (expected {expected['scored_reviews']}), "
+                f"total={business.total_reviews} (expected {expected['total_reviews']}), "
+                f"score={business.aggregated_vibe_score} (expected {expected['aggregated_vibe_score']}), "
+                f"weighted={business.weighted_score} (expected {expected['weighted_score']})"
+            )
+        
+        if not fix:
+            return False
+        
+        for business, _ in mismatches:
+            recalculate_business_vibe_score(business.id, db)
+        db.commit()
+        print(f"✓ Repaired {len(mismatches)} business(es).")
+        return True
+        
+    except Exception as e:
+        print(f"\n✗ Error occurred: {str(e)}")
+        db.rollback()
+        return False
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check incremental vibe aggregates against a full recompute")
+    parser.add_argument("--fix", action="store_true", help="Rebuild inconsistent aggregates")
+    args = parser.parse_args()
+    
+    print("=" * 60)
+    print("VibeCheck Business - Vibe Aggregate Consistency Check")
+    print("=" * 60)
+    print()
+    consistent = check_aggregates(args.fix)
+    print()
+    print("=" * 60)
+    sys.exit(0 if consistent else 1)
@@ -3,9 +3,15 @@ Model Download Script
 Run this script BEFORE starting the server to download the sentiment analysis model.
 
 Usage:
-    python download_model.py
+    python download_model.py [--backend pytorch|quantized|onnx|all]
+
+With --backend quantized or onnx the script also builds the artifact that
+SENTIMENT_BACKEND needs under MODEL_ARTIFACT_DIR (int8 weights, or an ONNX
+graph for onnxruntime).
 """
 
+import argparse
+
 print("=" * 70)
 print("VibeCheck Business - Model Download Script")
 print("=" * 70)
@@ -17,14 +23,74 @@ print()
 
 import sys
 
+
+def export_quantized(model_name):
+    """
+    Save the int8 dynamically quantized model and its tokenizer.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from app.inference_backends import quantize_model, quantized_artifact_dir
+
+    output_dir = quantized_artifact_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    model = quantize_model(AutoModelForSequenceClassification.from_pretrained(model_name))
+    torch.save(model, output_dir / "model.pt")
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    print(f"✓ Quantized model saved to {output_dir}")
+
+
+def export_onnx(model_name):
+    """
+    Export the model to ONNX with dynamic batch and sequence axes, plus the
+    tokenizer and config the onnx backend loads next to it.
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+    from app.inference_backends import onnx_artifact_dir
+
+    output_dir = onnx_artifact_dir()
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+
+    sample = tokenizer(["This is a great product!"], return_tensors="pt")
+    dynamic_axes = {"batch": 0, "sequence": 1}
+    torch.onnx.export(
+        model,
+        (sample["input_ids"], sample["attention_mask"]),
+        str(output_dir / "model.onnx"),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["logits"],
+        dynamic_axes={
+            "input_ids": dynamic_axes,
+            "attention_mask": dynamic_axes,
+            "logits": {0: "batch"},
+        },
+        opset_version=17,
+    )
+    tokenizer.save_pretrained(output_dir)
+    model.config.save_pretrained(output_dir)
+    print(f"✓ ONNX model exported to {output_dir}")
+
+
+parser = argparse.ArgumentParser(description="Download the sentiment model and build backend artifacts")
+parser.add_argument("--backend", choices=["pytorch", "quantized", "onnx", "all"], default="pytorch",
+                    help="Inference backend to prepare (default: pytorch)")
+args = parser.parse_args()
+
 try:
     from transformers import pipeline
+    from app.config import SENTIMENT_MODEL
     
     print("Starting download...")
     print()
     
     # This will download the model
-    classifier = pipeline("sentiment-analysis")
+    classifier = pipeline("sentiment-analysis", model=SENTIMENT_MODEL)
     
     print()
     print("✓ Model downloaded successfully!")
@@ -35,6 +101,16 @@ try:
     result = classifier("This is a great product!")
     print(f"Test result: {result}")
     print()
+
+    if args.backend in ("quantized", "all"):
+        print("Quantizing the model to int8...")
+        export_quantized(SENTIMENT_MODEL)
+        print()
+
+    if args.backend in ("onnx", "all"):
+        print("Exporting the model to ONNX...")
+        export_onnx(SENTIMENT_MODEL)
+        print()
     
     print("=" * 70)
     print("✓ Setup complete! You can now run: uvicorn app.main:app --reload")
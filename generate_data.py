@@ -0,0 +1,324 @@
+"""
+Synthetic Data Generator for VibeCheck Business
+Fills the database with a large, deterministic data set for load and scaling
+tests: millions of users, thousands of businesses and tens of millions of
+reviews. Everything is derived from --seed except the timestamps, which are
+spread over the --days before the run.
+
+Rows are written with Core executemany inserts in large batches, one
+transaction per batch, over a single connection with durability pragmas
+relaxed (synchronous=OFF, a bigger page cache, in-memory temp storage).
+The secondary review indexes and the full-text triggers are dropped for the
+load and rebuilt once at the end, which is much faster than maintaining them
+row by row.
+
+Review counts are skewed like real traffic: businesses are ranked and the
+k-th gets a share proportional to 1 / k^skew, so a few businesses collect
+huge review counts and most have few. Review texts come from a pool of
+generated texts that is scored once with the deterministic stub classifier,
+so no model is needed. Passwords are hashed with Argon2 only a handful of
+times up front and the hashes are reused; every user can log in with
+--password.
+
+Business aggregates (with the leaderboard weighted scores), keyword counts,
+document frequencies (in tfidf keyword mode) and daily rollups are written with
+the data, so the result is consistent (check_vibe_aggregates.py passes on it).
+
+Usage:
+    python generate_data.py [--users 1000000] [--businesses 5000] [--reviews 20000000]
+        [--seed 42] [--skew 1.0] [--batch-size 50000] [--days 365] [--password vibecheck123]
+"""
+
+import argparse
+import random
+import sys
+import time
+from bisect import bisect_left
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from sqlalchemy import bindparam, func, insert, select, update
+
+from app.auth import hash_password
+from app.database import engine
+from app.inference_backends import StubClassifier
+from app.keywords import (
+    extract_keywords_batch, split_keywords, add_document_frequency_deltas, update_document_frequencies
+)
+from app.leaderboard import weighted_vibe_score
+from app.models import Base, Business, Review, User, REVIEWS_FTS_TABLE, REVIEWS_FTS_DDL
+from app.trends import rebuild_daily_vibe
+from app.utils import update_keyword_counts, vibe_score_from_result
+
+CATEGORIES = [
+    "Hotel", "Restaurant", "Auto Repair", "Fitness", "Electronics Store", "Fashion Retail",
+    "Pet Services", "Bakery", "Cafe", "Bookstore", "Grocery Store", "Online Store"
+]
+NAME_WORDS = [
+    "Golden", "Sunrise", "Blue", "Urban", "Royal", "Green", "Silver", "Happy", "Corner", "Harbor",
+    "Maple", "Summit", "Velvet", "Lucky", "Rustic", "Bright", "Ocean", "Cedar", "Crystal", "Humble"
+]
+CITIES = [
+    "New York, NY", "Los Angeles, CA", "Chicago, IL", "Austin, TX", "Seattle, WA", "Miami, FL",
+    "Denver, CO", "Boston, MA", "Atlanta, GA", "Portland, OR", "Nashville, TN", "San Diego, CA"
+]
+STREETS = ["Main St", "Oak Avenue", "Elm Street", "Park Place", "Market Street", "River Road", "Hill Lane"]
+
+ASPECTS = ["coffee", "service", "staff", "prices", "atmosphere", "music", "food", "parking",
+           "location", "cleanliness", "selection", "delivery", "rooms", "breakfast", "waiting times"]
+POSITIVE = ["great", "friendly", "amazing", "excellent", "fantastic", "the best", "lovely", "good"]
+NEGATIVE = ["terrible", "rude", "slow", "dirty", "awful", "the worst", "disappointing", "bad"]
+OPENERS = ["Visited last weekend.", "Came here with friends.", "Second time here.", "Quick stop on my way home.",
+           "Booked this for a birthday.", "Found it by chance.", ""]
+CLOSERS = ["Would come back.", "Not coming back.", "Recommended.", "Mixed feelings overall.", ""]
+
+# Review indexes rebuilt after the load; the primary key stays
+REVIEW_INDEXES = [index for index in Review.__table__.indexes if index.name != "ix_reviews_id"]
+FTS_TRIGGERS = ("reviews_fts_insert", "reviews_fts_delete", "reviews_fts_update")
+
+
+def generate_texts(rng: random.Random, count: int) -> list:
+    """
+    Build `count` distinct review texts of varying length and sentiment.
+    """
+    texts = set()
+    while len(texts) < count:
+        lean = rng.random()
+        sentences = []
+        for _ in range(rng.choice([1, 1, 2, 3, 5, 8])):
+            words = POSITIVE if rng.random() < lean else NEGATIVE
+            sentences.append(f"The {rng.choice(ASPECTS)} was {rng.choice(words)}.")
+        texts.add(" ".join(part for part in [rng.choice(OPENERS), *sentences, rng.choice(CLOSERS)] if part)
+                  + f" ({len(texts)})")
+    return sorted(texts)
+
+
+def score_texts(texts: list) -> list:
+    """
+    Score texts with the stub classifier: (vibe_score, sentiment, keywords) per text.
+    """
+    results = StubClassifier()(texts)
+    keywords = extract_keywords_batch(texts)
+    return [(vibe_score_from_result(result), result["label"], keyword_string)
+            for result, keyword_string in zip(results, keywords)]
+
+
+def next_id(conn, model) -> int:
+    return (conn.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def insert_in_batches(conn, table, rows, total: int, batch_size: int, label: str):
+    """
+    Insert rows from an iterator with one executemany and commit per batch.
+    """
+    start = time.perf_counter()
+    done = 0
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            conn.execute(insert(table), batch)
+            conn.commit()
+            done += len(batch)
+            batch = []
+            rate = done / (time.perf_counter() - start)
+            print(f"  {label}: {done}/{total} ({rate:,.0f} rows/s)", end="\r")
+    if batch:
+        conn.execute(insert(table), batch)
+        conn.commit()
+        done += len(batch)
+    elapsed = time.perf_counter() - start
+    print(f"  {label}: {done}/{total} in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f} rows/s)")
+
+
+def relax_pragmas(conn) -> dict:
+    """
+    Trade durability for load speed on this connection and return the settings to restore.
+    """
+    original = {
+        "synchronous": conn.exec_driver_sql("PRAGMA synchronous").scalar(),
+        "journal_mode": conn.exec_driver_sql("PRAGMA journal_mode").scalar(),
+    }
+    conn.exec_driver_sql("PRAGMA synchronous=OFF")
+    conn.exec_driver_sql("PRAGMA cache_size=-262144")
+    conn.exec_driver_sql("PRAGMA temp_store=MEMORY")
+    # Leaving WAL needs every other connection closed, so WAL databases keep it
+    if original["journal_mode"] != "wal":
+        conn.exec_driver_sql("PRAGMA journal_mode=MEMORY")
+    return original
+
+
+def restore_pragmas(conn, original: dict):
+    conn.exec_driver_sql(f"PRAGMA journal_mode={original['journal_mode']}")
+    conn.exec_driver_sql(f"PRAGMA synchronous={original['synchronous']}")
+
+
+def generate(args) -> bool:
+    rng = random.Random(args.seed)
+    Base.metadata.create_all(bind=engine)
+
+    with engine.connect() as conn:
+        prefix = f"gen{args.seed}_"
+        if conn.scalar(select(User.id).where(User.username == f"{prefix}0")):
+            print(f"✗ Data for seed {args.seed} already exists; use another --seed or a fresh database.")
+            return False
+
+        original_pragmas = relax_pragmas(conn)
+        conn.commit()
+        start = time.perf_counter()
+        now = datetime.utcnow().replace(microsecond=0)
+        span_seconds = args.days * 86400
+
+        try:
+            # Users, sharing a few precomputed Argon2 hashes of the same password
+            print(f"Hashing {args.distinct_hashes} passwords...")
+            hashes = [hash_password(args.password) for _ in range(args.distinct_hashes)]
+            first_user = next_id(conn, User)
+            insert_in_batches(conn, User.__table__, (
+                {"id": first_user + i, "username": f"{prefix}{i}", "email": f"{prefix}{i}@vibecheck.io",
+                 "hashed_password": hashes[i % len(hashes)],
+                 "created_at": now - timedelta(seconds=rng.randrange(span_seconds))}
+                for i in range(args.users)
+            ), args.users, args.batch_size, "users")
+
+            # Businesses
+            first_business = next_id(conn, Business)
+            insert_in_batches(conn, Business.__table__, (
+                {"id": first_business + i,
+                 "name": f"{rng.choice(NAME_WORDS)} {rng.choice(NAME_WORDS)} {rng.choice(CATEGORIES)} {i}",
+                 "category": rng.choice(CATEGORIES),
+                 "location": f"{rng.randrange(1, 9999)} {rng.choice(STREETS)}, {rng.choice(CITIES)}",
+                 "aggregated_vibe_score": 0.0, "total_reviews": 0, "vibe_score_sum": 0.0, "scored_reviews": 0,
+                 "created_at": now - timedelta(seconds=span_seconds + rng.randrange(span_seconds))}
+                for i in range(args.businesses)
+            ), args.businesses, args.batch_size, "businesses")
+
+            # Review texts, scored once
+            print(f"Scoring {args.distinct_texts} review texts with the stub classifier...")
+            texts = generate_texts(rng, args.distinct_texts)
+            scored = score_texts(texts)
+            text_keywords = [split_keywords(keywords) for _, _, keywords in scored]
+
+            # Zipf-like popularity over a shuffled ranking of the businesses
+            ranking = list(range(args.businesses))
+            rng.shuffle(ranking)
+            cum_weights = list(accumulate(1 / (rank + 1) ** args.skew for rank in range(args.businesses)))
+
+            totals = [0] * args.businesses
+            score_sums = [0.0] * args.businesses
+            keyword_deltas = Counter()
+            text_uses = Counter()
+
+            def reviews():
+                # The per-row loop dominates the load, so it sticks to local names and rng.random()
+                first_review = next_id(conn, Review)
+                random_fraction = rng.random
+                total_weight = cum_weights[-1]
+                text_count = len(texts)
+                for offset in range(0, args.reviews, args.batch_size):
+                    size = min(args.batch_size, args.reviews - offset)
+                    picks = Counter()
+                    for i in range(size):
+                        business = ranking[bisect_left(cum_weights, random_fraction() * total_weight)]
+                        text = int(random_fraction() * text_count)
+                        vibe_score, sentiment, keywords = scored[text]
+                        totals[business] += 1
+                        score_sums[business] += vibe_score
+                        picks[(business, text)] += 1
+                        yield {
+                            "id": first_review + offset + i,
+                            "user_id": first_user + int(random_fraction() * args.users),
+                            "business_id": first_business + business,
+                            "content": texts[text],
+                            "vibe_score": vibe_score,
+                            "sentiment": sentiment,
+                            "keywords": keywords,
+                            "created_at": now - timedelta(seconds=int(random_fraction() * span_seconds))
+                        }
+                    for (business, text), count in picks.items():
+                        text_uses[text] += count
+                        for keyword in text_keywords[text]:
+                            keyword_deltas[(first_business + business, keyword)] += count
+
+            # Indexes and full-text triggers are rebuilt once instead of per row
+            for trigger in FTS_TRIGGERS:
+                conn.exec_driver_sql(f"DROP TRIGGER IF EXISTS {trigger}")
+            for index in REVIEW_INDEXES:
+                index.drop(conn, checkfirst=True)
+            conn.commit()
+            try:
+                insert_in_batches(conn, Review.__table__, reviews(), args.reviews, args.batch_size, "reviews")
+            finally:
+                print("Rebuilding review indexes and the full-text index...")
+                rebuild = time.perf_counter()
+                for index in REVIEW_INDEXES:
+                    index.create(conn, checkfirst=True)
+                for statement in REVIEWS_FTS_DDL:
+                    conn.exec_driver_sql(statement)
+                conn.exec_driver_sql(f"INSERT INTO {REVIEWS_FTS_TABLE}({REVIEWS_FTS_TABLE}) VALUES ('rebuild')")
+                conn.commit()
+                print(f"  rebuilt in {time.perf_counter() - rebuild:.1f}s")
+
+            # Aggregates and keyword counts of the generated businesses
+            conn.execute(
+                update(Business)
+                .where(Business.id == bindparam("business_id"))
+                .values(total_reviews=bindparam("total"), scored_reviews=bindparam("total"),
+                        vibe_score_sum=bindparam("score_sum"), aggregated_vibe_score=bindparam("score"),
+                        weighted_score=bindparam("weighted")),
+                [
+                    {"business_id": first_business + business, "total": totals[business],
+                     "score_sum": score_sums[business],
+                     "score": round(score_sums[business] / totals[business], 2) if totals[business] else 0.0,
+                     "weighted": round(weighted_vibe_score(score_sums[business], totals[business]), 2)
+                     if totals[business] else None}
+                    for business in range(args.businesses)
+                ]
+            )
+            update_keyword_counts(keyword_deltas, conn)
+            document_deltas = Counter()
+            for text, count in text_uses.items():
+                add_document_frequency_deltas(document_deltas, texts[text], sign=count)
+            update_document_frequencies(document_deltas, conn)
+            conn.commit()
+
+            # Daily rollups, grouped from the rebuilt review index a few businesses at a time
+            print("Rolling up reviews per business and day...")
+            for offset in range(0, args.businesses, 100):
+                rebuild_daily_vibe(range(first_business + offset,
+                                         first_business + min(offset + 100, args.businesses)), conn)
+                conn.commit()
+        finally:
+            restore_pragmas(conn, original_pragmas)
+
+    busiest = sorted(totals, reverse=True)[:5]
+    print(f"\n✓ Generated {args.users} users, {args.businesses} businesses and {args.reviews} reviews "
+          f"in {time.perf_counter() - start:.1f}s.")
+    print(f"  Busiest businesses: {', '.join(str(count) for count in busiest)} reviews; "
+          f"{sum(1 for count in totals if count < 10)} businesses have fewer than 10.")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large deterministic data set")
+    parser.add_argument("--users", type=int, default=1000000)
+    parser.add_argument("--businesses", type=int, default=5000)
+    parser.add_argument("--reviews", type=int, default=20000000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of review counts per business")
+    parser.add_argument("--batch-size", type=int, default=50000, help="Rows per insert and commit")
+    parser.add_argument("--days", type=int, default=365, help="Reviews are spread over this many days")
+    parser.add_argument("--distinct-texts", type=int, default=20000, help="Size of the review text pool")
+    parser.add_argument("--distinct-hashes", type=int, default=8, help="Argon2 hashes computed and reused")
+    parser.add_argument("--password", default="vibecheck123", help="Password of every generated user")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Synthetic Data Generator")
+    print("=" * 60)
+    print()
+    ok = generate(args)
+    print()
+    print("=" * 60)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,55 @@
+"""
+Inference Sidecar Server for VibeCheck Business
+Loads the sentiment model once and scores texts for every uvicorn worker over a
+Unix domain socket, batching requests across all of them.
+
+Usage:
+    python inference_server.py [--socket PATH] [--batch-size 16] [--max-wait-ms 10]
+
+Start it before the web workers and run them with INFERENCE_MODE=sidecar. The
+server and the workers must share the model settings (SENTIMENT_BACKEND,
+SENTIMENT_MODEL, SENTIMENT_STUB); workers refuse a sidecar that reports a
+different model id and fall back to local inference.
+"""
+
+import argparse
+
+from app.batching import SentimentBatcher
+from app.config import INFERENCE_SOCKET, SENTIMENT_BATCH_SIZE, SENTIMENT_BATCH_MAX_WAIT_MS
+from app.inference_sidecar import InferenceServer
+from app.sentiment_analyzer import get_model_id, get_sentiment_analyzer
+
+
+def serve(socket_path: str, batch_size: int, max_wait_ms: float):
+    """
+    Load the model and serve scoring requests until interrupted.
+    """
+    # Load before binding, so a reachable socket always means a ready model
+    analyzer = get_sentiment_analyzer()
+    batcher = SentimentBatcher(analyzer, batch_size, max_wait_ms)
+
+    server = InferenceServer(socket_path, batcher, get_model_id())
+    print(f"✓ Serving {get_model_id()} on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print()
+        print("Shutting down...")
+    finally:
+        server.server_close()
+        batcher.close()
+        print(f"Scored {batcher.items_scored} texts in {batcher.batches_run} batches.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the shared sentiment inference sidecar")
+    parser.add_argument("--socket", default=INFERENCE_SOCKET, help="Unix socket path")
+    parser.add_argument("--batch-size", type=int, default=SENTIMENT_BATCH_SIZE)
+    parser.add_argument("--max-wait-ms", type=float, default=SENTIMENT_BATCH_MAX_WAIT_MS)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Inference Sidecar")
+    print("=" * 60)
+    print()
+    serve(args.socket, args.batch_size, args.max_wait_ms)
@@ -0,0 +1,32 @@
+"""add review access path indexes
+
+Revision ID: 3f8b26d1c4ea
+Revises: e2a4c7b9f015
+Create Date: 2026-10-17 12:40:17.336841
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f8b26d1c4ea'
+down_revision: Union[str, Sequence[str], None] = 'e2a4c7b9f015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_reviews_business_created_at_id', 'reviews', ['business_id', 'created_at', 'id'], unique=False)
+    op.create_index('ix_reviews_user_created_at', 'reviews', ['user_id', 'created_at'], unique=False)
+    op.create_index('ix_businesses_created_at_id', 'businesses', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_businesses_created_at_id', table_name='businesses')
+    op.drop_index('ix_reviews_user_created_at', table_name='reviews')
+    op.drop_index('ix_reviews_business_created_at_id', table_name='reviews')
@@ -0,0 +1,54 @@
+"""add incremental vibe aggregates
+
+Revision ID: 7c3e91a4d2f6
+Revises: 42a29e0e508a
+Create Date: 2026-10-17 09:12:05.418230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3e91a4d2f6'
+down_revision: Union[str, Sequence[str], None] = '42a29e0e508a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('businesses', sa.Column('vibe_score_sum', sa.Float(), server_default='0', nullable=False))
+    op.add_column('businesses', sa.Column('scored_reviews', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill the running aggregates from existing reviews
+    op.execute("""
+        UPDATE businesses SET
+            vibe_score_sum = (
+                SELECT COALESCE(SUM(vibe_score), 0) FROM reviews
+                WHERE reviews.business_id = businesses.id
+            ),
+            scored_reviews = (
+                SELECT COUNT(vibe_score) FROM reviews
+                WHERE reviews.business_id = businesses.id
+            ),
+            total_reviews = (
+                SELECT COUNT(*) FROM reviews
+                WHERE reviews.business_id = businesses.id
+            )
+    """)
+    op.execute("""
+        UPDATE businesses SET aggregated_vibe_score = CASE
+            WHEN scored_reviews > 0 THEN ROUND(vibe_score_sum / scored_reviews, 2)
+            ELSE 0.0
+        END
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('businesses') as batch_op:
+        batch_op.drop_column('scored_reviews')
+        batch_op.drop_column('vibe_score_sum')
@@ -0,0 +1,38 @@
+"""add business keyword counts
+
+Revision ID: 9d41c6e7a2b8
+Revises: 3f8b26d1c4ea
+Create Date: 2026-10-17 14:05:52.618204
+
+Existing reviews are counted by running: python backfill_keyword_counts.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41c6e7a2b8'
+down_revision: Union[str, Sequence[str], None] = '3f8b26d1c4ea'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('business_keyword_counts',
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('keyword', sa.String(length=100), nullable=False),
+    sa.Column('count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.PrimaryKeyConstraint('business_id', 'keyword')
+    )
+    op.create_index('ix_business_keyword_counts_business_count', 'business_keyword_counts',
+                    ['business_id', sa.text('count DESC'), 'keyword'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_business_keyword_counts_business_count', table_name='business_keyword_counts')
+    op.drop_table('business_keyword_counts')
@@ -0,0 +1,39 @@
+"""add business daily vibe rollups
+
+Revision ID: a6e1d3f8b2c4
+Revises: c7f2e5a1d9b3
+Create Date: 2026-10-17 16:20:41.730912
+
+Existing reviews are rolled up by running: python backfill_daily_vibe.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6e1d3f8b2c4'
+down_revision: Union[str, Sequence[str], None] = 'c7f2e5a1d9b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('business_daily_vibe',
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('day', sa.Date(), nullable=False),
+    sa.Column('review_count', sa.Integer(), nullable=False),
+    sa.Column('scored_reviews', sa.Integer(), nullable=False),
+    sa.Column('vibe_score_sum', sa.Float(), nullable=False),
+    sa.Column('positive_reviews', sa.Integer(), nullable=False),
+    sa.Column('negative_reviews', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ),
+    sa.PrimaryKeyConstraint('business_id', 'day')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('business_daily_vibe')
@@ -0,0 +1,35 @@
+"""add sentiment cache table
+
+Revision ID: b5d0e8f31a97
+Revises: 7c3e91a4d2f6
+Create Date: 2026-10-17 10:03:41.552317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d0e8f31a97'
+down_revision: Union[str, Sequence[str], None] = '7c3e91a4d2f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sentiment_cache',
+    sa.Column('text_hash', sa.String(length=64), nullable=False),
+    sa.Column('model_id', sa.String(length=200), nullable=False),
+    sa.Column('label', sa.String(length=50), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('text_hash', 'model_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('sentiment_cache')
@@ -0,0 +1,29 @@
+"""add review scoring attempts
+
+Revision ID: b8e5d2c7f4a1
+Revises: f1c9a4e7b3d2
+Create Date: 2026-10-17 21:14:06.382519
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e5d2c7f4a1'
+down_revision: Union[str, Sequence[str], None] = 'f1c9a4e7b3d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reviews', sa.Column('scoring_attempts', sa.Integer(), server_default='0', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('reviews') as batch_op:
+        batch_op.drop_column('scoring_attempts')
@@ -0,0 +1,64 @@
+"""add review full-text search
+
+Revision ID: c7f2e5a1d9b3
+Revises: 9d41c6e7a2b8
+Create Date: 2026-10-17 14:48:09.205716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f2e5a1d9b3'
+down_revision: Union[str, Sequence[str], None] = '9d41c6e7a2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Reviews indexed per INSERT, so building the index never runs one huge statement
+BUILD_CHUNK_SIZE = 10000
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE reviews_fts USING fts5("
+        "content, content='reviews', content_rowid='id', tokenize='porter unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+        "INSERT INTO reviews_fts(rowid, content) VALUES (new.id, new.content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+        "INSERT INTO reviews_fts(reviews_fts, rowid, content) VALUES ('delete', old.id, old.content); END"
+    )
+    op.execute(
+        "CREATE TRIGGER reviews_fts_update AFTER UPDATE OF content ON reviews BEGIN "
+        "INSERT INTO reviews_fts(reviews_fts, rowid, content) VALUES ('delete', old.id, old.content); "
+        "INSERT INTO reviews_fts(rowid, content) VALUES (new.id, new.content); END"
+    )
+
+    # Index the existing reviews in id ranges; rows written from here on go through the triggers
+    bind = op.get_bind()
+    max_id = bind.scalar(sa.text("SELECT MAX(id) FROM reviews")) or 0
+    for low in range(0, max_id, BUILD_CHUNK_SIZE):
+        bind.execute(
+            sa.text(
+                "INSERT INTO reviews_fts(rowid, content) "
+                "SELECT id, content FROM reviews WHERE id > :low AND id <= :high ORDER BY id"
+            ),
+            {"low": low, "high": low + BUILD_CHUNK_SIZE}
+        )
+        print(f"  indexed reviews up to id {min(low + BUILD_CHUNK_SIZE, max_id)} of {max_id}")
+    op.execute("INSERT INTO reviews_fts(reviews_fts) VALUES ('optimize')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS reviews_fts_update")
+    op.execute("DROP TRIGGER IF EXISTS reviews_fts_delete")
+    op.execute("DROP TRIGGER IF EXISTS reviews_fts_insert")
+    op.execute("DROP TABLE IF EXISTS reviews_fts")
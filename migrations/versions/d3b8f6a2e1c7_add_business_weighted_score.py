@@ -0,0 +1,43 @@
+"""add business weighted score
+
+Revision ID: d3b8f6a2e1c7
+Revises: a6e1d3f8b2c4
+Create Date: 2026-10-17 18:05:12.264817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.config import LEADERBOARD_PRIOR_MEAN, LEADERBOARD_PRIOR_REVIEWS
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3b8f6a2e1c7'
+down_revision: Union[str, Sequence[str], None] = 'a6e1d3f8b2c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('businesses', sa.Column('weighted_score', sa.Float(), nullable=True))
+
+    # Backfill from the running aggregates with the configured prior
+    op.execute(sa.text("""
+        UPDATE businesses SET weighted_score = ROUND(
+            (:prior_reviews * :prior_mean + vibe_score_sum) / (:prior_reviews + scored_reviews), 2
+        )
+        WHERE scored_reviews > 0
+    """).bindparams(prior_reviews=LEADERBOARD_PRIOR_REVIEWS, prior_mean=LEADERBOARD_PRIOR_MEAN))
+
+    op.create_index('ix_businesses_category_weighted_score', 'businesses',
+                    ['category', sa.text('weighted_score DESC')], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_businesses_category_weighted_score', table_name='businesses')
+    with op.batch_alter_table('businesses') as batch_op:
+        batch_op.drop_column('weighted_score')
@@ -0,0 +1,32 @@
+"""add review scoring queue
+
+Revision ID: e2a4c7b9f015
+Revises: b5d0e8f31a97
+Create Date: 2026-10-17 11:26:58.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c7b9f015'
+down_revision: Union[str, Sequence[str], None] = 'b5d0e8f31a97'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('reviews', sa.Column('claimed_at', sa.DateTime(), nullable=True))
+    op.create_index('ix_reviews_pending', 'reviews', ['id'], unique=False,
+                    sqlite_where=sa.text("sentiment = 'PENDING'"))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_reviews_pending', table_name='reviews')
+    with op.batch_alter_table('reviews') as batch_op:
+        batch_op.drop_column('claimed_at')
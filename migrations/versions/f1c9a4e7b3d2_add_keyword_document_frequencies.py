@@ -0,0 +1,34 @@
+"""add keyword document frequencies
+
+Revision ID: f1c9a4e7b3d2
+Revises: d3b8f6a2e1c7
+Create Date: 2026-10-17 19:42:37.518094
+
+In tfidf keyword mode, existing reviews are counted by running:
+python backfill_document_frequencies.py
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1c9a4e7b3d2'
+down_revision: Union[str, Sequence[str], None] = 'd3b8f6a2e1c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('keyword_document_frequencies',
+    sa.Column('word', sa.String(length=100), nullable=False),
+    sa.Column('docs', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('word')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('keyword_document_frequencies')
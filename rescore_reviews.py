@@ -0,0 +1,225 @@
+"""
+Offline Review Rescoring for VibeCheck Business
+Rescores every review with the currently configured model, for example after
+changing SENTIMENT_MODEL or SENTIMENT_BACKEND.
+
+Reviews are read in id-ordered chunks, and each chunk is sorted into length
+buckets so every forward pass pads to similar lengths. Buckets are scored on a
+pool of worker processes, each with its own copy of the model. Results are
+written back with one batched UPDATE per chunk. After each chunk a checkpoint
+is saved, so an interrupted run resumes where it stopped. When all chunks are
+done, the aggregates and daily rollups of every affected business are
+recomputed.
+
+Usage:
+    python rescore_reviews.py [--workers 4] [--chunk-size 2048] [--batch-size 32]
+        [--threads-per-worker 1] [--checkpoint PATH] [--restart]
+
+Pending reviews are left to the scoring workers, and reviews they marked failed
+are skipped. Only vibe_score and sentiment
+are rewritten; keywords do not depend on the model.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from sqlalchemy import bindparam, select, update
+
+from app.config import BASE_DIR
+from app.database import SessionLocal, read_engine
+from app.models import Review, PENDING_SENTIMENT, FAILED_SENTIMENT
+from app.sentiment_analyzer import get_model_id, get_sentiment_analyzer
+from app.trends import rebuild_daily_vibe
+from app.utils import recalculate_business_vibe_score, vibe_score_from_result
+
+DEFAULT_CHECKPOINT = BASE_DIR / ".rescore_checkpoint.json"
+
+_reviews = Review.__table__
+
+# Batched write-back, guarded so reviews deleted or reset to pending meanwhile are skipped
+_RESCORE_UPDATE = (
+    update(_reviews)
+    .where(_reviews.c.id == bindparam("review_id"),
+           _reviews.c.sentiment.not_in((PENDING_SENTIMENT, FAILED_SENTIMENT)))
+    .values(vibe_score=bindparam("new_vibe_score"), sentiment=bindparam("new_sentiment"))
+)
+
+
+def init_worker(threads: int):
+    """
+    Load the model once per worker process.
+    """
+    try:
+        import torch
+        # Several processes share the CPU, so keep each one from spawning a thread per core
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+    get_sentiment_analyzer()
+
+
+def score_bucket(bucket: list) -> list:
+    """
+    Score one bucket of (id, content) pairs of similar length.
+
+    Returns:
+        Parameter dictionaries for the write-back UPDATE
+    """
+    results = get_sentiment_analyzer().analyze_sentiment([content for _, content in bucket])
+    return [
+        {"review_id": review_id, "new_vibe_score": vibe_score_from_result(result), "new_sentiment": result["label"]}
+        for (review_id, _), result in zip(bucket, results)
+    ]
+
+
+def iter_chunks(after_id: int, chunk_size: int):
+    """
+    Yield chunks of (id, business_id, content) rows in id order, starting after after_id.
+    """
+    while True:
+        with read_engine.connect() as conn:
+            chunk = conn.execute(
+                select(Review.id, Review.business_id, Review.content)
+                .where(Review.id > after_id, Review.sentiment.not_in((PENDING_SENTIMENT, FAILED_SENTIMENT)))
+                .order_by(Review.id)
+                .limit(chunk_size)
+            ).all()
+        if not chunk:
+            return
+        yield chunk
+        after_id = chunk[-1].id
+
+
+def length_buckets(chunk: list, batch_size: int) -> list:
+    """
+    Split a chunk into batches of similar text length.
+    """
+    by_length = sorted(((row.id, row.content) for row in chunk), key=lambda item: len(item[1]))
+    return [by_length[start:start + batch_size] for start in range(0, len(by_length), batch_size)]
+
+
+def load_checkpoint(path: Path, model_id: str) -> dict:
+    """
+    Load the checkpoint of an interrupted run of the same model, or start fresh.
+    """
+    fresh = {"model_id": model_id, "last_id": 0, "rescored": 0, "business_ids": []}
+    if not path.exists():
+        return fresh
+
+    checkpoint = json.loads(path.read_text())
+    if checkpoint.get("model_id") != model_id:
+        print(f"Ignoring checkpoint for model {checkpoint.get('model_id')}, starting over.")
+        return fresh
+
+    print(f"Resuming after review {checkpoint['last_id']} ({checkpoint['rescored']} already rescored).")
+    return checkpoint
+
+
+def save_checkpoint(path: Path, checkpoint: dict):
+    # Write then rename, so a crash never leaves a half-written checkpoint
+    tmp_path = path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(checkpoint))
+    os.replace(tmp_path, path)
+
+
+def rescore(workers: int, chunk_size: int, batch_size: int, threads: int, checkpoint_path: Path, restart: bool) -> int:
+    """
+    Rescore all reviews and recompute the affected business aggregates and daily rollups.
+
+    Returns:
+        Number of reviews rescored in this run
+    """
+    model_id = get_model_id()
+    if restart and checkpoint_path.exists():
+        checkpoint_path.unlink()
+    checkpoint = load_checkpoint(checkpoint_path, model_id)
+    business_ids = set(checkpoint["business_ids"])
+
+    print(f"Rescoring with {model_id} on {workers} worker process(es)...")
+    db = SessionLocal()
+    start = time.perf_counter()
+    rescored = 0
+
+    def write_chunk(chunk, futures):
+        nonlocal rescored
+        params = [row for future in futures for row in future.result()]
+        db.execute(_RESCORE_UPDATE, params)
+        db.commit()
+
+        rescored += len(params)
+        business_ids.update(row.business_id for row in chunk)
+        checkpoint.update(
+            last_id=chunk[-1].id,
+            rescored=checkpoint["rescored"] + len(params),
+            business_ids=sorted(business_ids)
+        )
+        save_checkpoint(checkpoint_path, checkpoint)
+
+        elapsed = time.perf_counter() - start
+        print(f"  up to review {chunk[-1].id}: {rescored} rescored, {rescored / elapsed:.1f} reviews/s")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(threads,)) as pool:
+            # Keep the next chunk scoring while the previous one is written back
+            in_flight = deque()
+            for chunk in iter_chunks(checkpoint["last_id"], chunk_size):
+                in_flight.append((chunk, [pool.submit(score_bucket, bucket)
+                                          for bucket in length_buckets(chunk, batch_size)]))
+                if len(in_flight) > 1:
+                    write_chunk(*in_flight.popleft())
+            while in_flight:
+                write_chunk(*in_flight.popleft())
+
+        elapsed = time.perf_counter() - start
+        print(f"✓ Rescored {rescored} reviews in {elapsed:.1f}s "
+              f"({rescored / elapsed if elapsed else 0:.1f} reviews/s)")
+
+        print(f"Recomputing aggregates and daily rollups for {len(business_ids)} business(es)...")
+        for business_id in sorted(business_ids):
+            recalculate_business_vibe_score(business_id, db)
+            rebuild_daily_vibe([business_id], db)
+        db.commit()
+        print("✓ Business aggregates and daily rollups updated.")
+
+        checkpoint_path.unlink(missing_ok=True)
+        return rescored
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rescore all reviews with the configured model")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Worker processes, each loads its own model")
+    parser.add_argument("--chunk-size", type=int, default=2048, help="Reviews read and written per chunk")
+    parser.add_argument("--batch-size", type=int, default=32, help="Reviews per forward pass")
+    parser.add_argument("--threads-per-worker", type=int, default=1, help="Torch threads per worker process")
+    parser.add_argument("--checkpoint", type=Path, default=DEFAULT_CHECKPOINT, help="Checkpoint file")
+    parser.add_argument("--restart", action="store_true", help="Ignore any checkpoint and start over")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("VibeCheck Business - Review Rescoring")
+    print("=" * 60)
+    print()
+    try:
+        rescore(args.workers, args.chunk_size, args.batch_size, args.threads_per_worker,
+                args.checkpoint, args.restart)
+    except KeyboardInterrupt:
+        print()
+        print(f"Interrupted. Run again to resume from {args.checkpoint}.")
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n✗ Error occurred: {str(e)}")
+        sys.exit(1)
+    print()
+    print("=" * 60)